@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""Adaptive (AIMD) limit on concurrent Claude sessions.
+
+xdist ``-n`` fixes how many tests *can* run at once; this controller decides
+how many Claude sessions actually *do*. The limit starts at the requested
+parallelism, is halved when the CLI reports rate limiting or overload
+(429/529) and grows back additively while sessions complete quickly and
+without errors, so a run settles just below the point where the API starts
+pushing back. A worker runs one session at a time, so the limit is capped
+at the starting value: it only ever drops below the requested parallelism,
+and additive increase recovers it after a decrease. It never raises
+concurrency above the requested value.
+
+State lives in a small JSON file shared by every xdist worker of a run
+(``ROUTING_CONCURRENCY_STATE``) and is updated under an exclusive file lock.
+When the variable is unset the limiter is a no-op.
+"""
+
+import json
+import os
+import random
+import re
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+try:
+    import fcntl
+
+    FCNTL_AVAILABLE = True
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    FCNTL_AVAILABLE = False
+
+try:
+    from otel_metrics import record_rate_limited, update_concurrency
+except ImportError:
+    record_rate_limited = None
+    update_concurrency = None
+
+# Shared state file for one run (set by conftest, inherited by workers)
+CONCURRENCY_STATE_ENV_VAR = "ROUTING_CONCURRENCY_STATE"
+
+# Multiplicative decrease factor applied on a rate-limit signal
+DECREASE_FACTOR = 0.5
+
+# Ignore further rate-limit signals this long after a decrease; sessions
+# already in flight report the same congestion event
+DECREASE_COOLDOWN_S = 10.0
+
+# A session slower than this multiple of the baseline latency holds the limit
+LATENCY_DEGRADED_FACTOR = 2.0
+
+# Smoothing for the latency moving average
+LATENCY_EWMA_ALPHA = 0.2
+
+# How often a waiting session re-checks for a free slot
+SLOT_POLL_INTERVAL_S = 0.25
+
+# Give up waiting for a slot after this long (a leaked slot fails the test
+# instead of hanging the run)
+SLOT_WAIT_TIMEOUT_S = 1800.0
+
+# Retries for a rate-limited session, with exponential backoff
+MAX_RATE_LIMIT_RETRIES = 3
+RETRY_BACKOFF_BASE_S = 2.0
+
+RATE_LIMIT_PATTERN = re.compile(
+    r"\b(429|529)\b|rate[\s_-]?limit|overloaded|too many requests", re.IGNORECASE
+)
+
+# Explicit API error lines on stderr: an "API Error: 429/529" status line or
+# an error payload of type rate_limit_error/overloaded_error. Free-form
+# --debug output is not matched (it mentions rate limits and status codes
+# in successful sessions too)
+API_ERROR_PATTERN = re.compile(
+    r"^\s*(?:Error:\s*)?API Error:?\s*(429|529)\b"
+    r"|\"type\"\s*:\s*\"(rate_limit_error|overloaded_error)\"",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+@dataclass
+class ConcurrencyState:
+    """Shared AIMD state for one run."""
+
+    limit: float
+    peak_limit: float = 0.0
+    min_limit: int = 1
+    max_limit: int = 1
+    in_flight: dict[str, int] = field(default_factory=dict)  # slot token -> pid
+    latency_ewma_ms: float | None = None
+    latency_baseline_ms: float | None = None
+    last_decrease_at: float = 0.0
+    completed: int = 0
+    rate_limited: int = 0
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ConcurrencyState":
+        """Create from dictionary."""
+        return cls(**data)
+
+
+def is_rate_limited(stdout: str, stderr: str, returncode: int) -> bool:
+    """
+    Check whether a Claude CLI session failed due to rate limiting/overload.
+
+    Successful sessions are never classified as rate limited, whatever
+    their response text or debug log says. For failed sessions only the
+    CLI's error result and explicit API error lines on stderr are checked.
+    """
+    try:
+        output = json.loads(stdout) if stdout else {}
+    except json.JSONDecodeError:
+        output = {}
+
+    if returncode == 0 and not output.get("is_error"):
+        return False
+    if RATE_LIMIT_PATTERN.search(str(output.get("result", stdout or ""))):
+        return True
+    return bool(API_ERROR_PATTERN.search(stderr or ""))
+
+
+def init_state_file(path: str | Path, max_limit: int, initial: int | None = None):
+    """
+    Create the shared state file for a run.
+
+    Args:
+        path: State file location
+        max_limit: Upper bound on concurrent sessions (e.g. xdist workers)
+        initial: Starting limit (defaults to max_limit)
+    """
+    max_limit = max(1, max_limit)
+    limit = float(max(1, min(initial or max_limit, max_limit)))
+    state = ConcurrencyState(limit=limit, peak_limit=limit, max_limit=max_limit)
+    Path(path).write_text(json.dumps(state.to_dict()))
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class AdaptiveLimiter:
+    """Process-side handle on the shared AIMD state."""
+
+    def __init__(self, state_file: str | Path | None = None):
+        """Initialize limiter.
+
+        Args:
+            state_file: Shared state file. If None, uses
+                ``ROUTING_CONCURRENCY_STATE``; without either, slots are
+                granted immediately.
+        """
+        state_file = state_file or os.environ.get(CONCURRENCY_STATE_ENV_VAR)
+        self.state_file = Path(state_file) if state_file else None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether a shared state file is configured."""
+        return self.state_file is not None and self.state_file.exists()
+
+    @contextmanager
+    def _locked_state(self):
+        """Load state under an exclusive lock and write it back on exit."""
+        with open(self.state_file.with_suffix(".lock"), "w") as lock_file:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            state = ConcurrencyState.from_dict(json.loads(self.state_file.read_text()))
+            yield state
+            tmp_file = self.state_file.with_suffix(".tmp")
+            tmp_file.write_text(json.dumps(state.to_dict()))
+            os.replace(tmp_file, self.state_file)
+
+    def _publish(self, state: ConcurrencyState) -> None:
+        if update_concurrency:
+            update_concurrency(int(state.limit), len(state.in_flight))
+
+    def _try_acquire(self, token: str) -> bool:
+        with self._locked_state() as state:
+            # Drop slots held by processes that died mid-session
+            state.in_flight = {
+                t: pid for t, pid in state.in_flight.items() if _pid_alive(pid)
+            }
+            if len(state.in_flight) >= int(state.limit):
+                return False
+            state.in_flight[token] = os.getpid()
+            self._publish(state)
+            return True
+
+    def acquire(self, timeout: float = SLOT_WAIT_TIMEOUT_S) -> str | None:
+        """
+        Block until a session slot is free and return its token.
+
+        Args:
+            timeout: Maximum seconds to wait for a slot
+
+        Raises:
+            TimeoutError: If no slot is freed within the timeout
+        """
+        if not self.enabled:
+            return None
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + timeout
+        while not self._try_acquire(token):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(
+                    f"No concurrent session slot free after {timeout:.0f}s "
+                    f"({self.state_file})"
+                )
+            time.sleep(SLOT_POLL_INTERVAL_S * (1 + random.random()))
+        return token
+
+    def release(
+        self,
+        token: str | None,
+        latency_ms: float,
+        rate_limited: bool = False,
+        error: bool = False,
+    ) -> None:
+        """
+        Release a slot and adjust the limit from the session's outcome.
+
+        Args:
+            token: Token returned by acquire()
+            latency_ms: Wall time of the session
+            rate_limited: Session hit a 429/overload response
+            error: Session failed for another reason (holds the limit)
+        """
+        if token is None or not self.enabled:
+            return
+
+        with self._locked_state() as state:
+            state.in_flight.pop(token, None)
+            state.completed += 1
+            now = time.time()
+
+            if rate_limited:
+                state.rate_limited += 1
+                if now - state.last_decrease_at >= DECREASE_COOLDOWN_S:
+                    state.limit = max(
+                        float(state.min_limit), state.limit * DECREASE_FACTOR
+                    )
+                    state.last_decrease_at = now
+            elif not error:
+                if state.latency_ewma_ms is None:
+                    state.latency_ewma_ms = latency_ms
+                else:
+                    state.latency_ewma_ms += LATENCY_EWMA_ALPHA * (
+                        latency_ms - state.latency_ewma_ms
+                    )
+                if state.latency_baseline_ms is None:
+                    state.latency_baseline_ms = state.latency_ewma_ms
+                else:
+                    state.latency_baseline_ms = min(
+                        state.latency_baseline_ms, state.latency_ewma_ms
+                    )
+
+                # Additive increase: about +1 per full round of sessions
+                healthy = (
+                    state.latency_ewma_ms
+                    <= state.latency_baseline_ms * LATENCY_DEGRADED_FACTOR
+                )
+                if healthy:
+                    state.limit = min(
+                        float(state.max_limit), state.limit + 1 / state.limit
+                    )
+                    state.peak_limit = max(state.peak_limit, state.limit)
+
+            self._publish(state)
+
+        if rate_limited and record_rate_limited:
+            record_rate_limited()
+
+    def snapshot(self) -> ConcurrencyState | None:
+        """Read the current shared state (None if disabled)."""
+        if not self.enabled:
+            return None
+        return ConcurrencyState.from_dict(json.loads(self.state_file.read_text()))
+
+
+def retry_backoff_s(attempt: int) -> float:
+    """Backoff before retry ``attempt`` (1-based), with jitter."""
+    return RETRY_BACKOFF_BASE_S * (2 ** (attempt - 1)) * (1 + random.random())
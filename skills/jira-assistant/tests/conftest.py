@@ -1,8 +1,11 @@
 """Pytest configuration for routing tests."""
 
 import os
+import shutil
 import sys
+import tempfile
 import time
+import uuid
 from pathlib import Path
 
 import pytest
@@ -18,7 +21,9 @@ try:
         OTEL_AVAILABLE,
         end_suite_span,
         end_worker_span,
+        flush_records,
         init_telemetry,
+        record_skill_scores,
         record_test_result,
         record_test_session_summary,
         set_suite_context_from_traceparent,
@@ -33,6 +38,8 @@ except ImportError:
     init_telemetry = None
     record_test_result = None
     record_test_session_summary = None
+    record_skill_scores = None
+    flush_records = None
     start_suite_span = None
     end_suite_span = None
     set_suite_context_from_traceparent = None
@@ -40,9 +47,111 @@ except ImportError:
     end_worker_span = None
     otel_shutdown = None
 
+from concurrency import (  # noqa: E402
+    CONCURRENCY_STATE_ENV_VAR,
+    AdaptiveLimiter,
+    init_state_file,
+)
+from confusion_matrix import DEFAULT_MATRIX_FILE, ConfusionMatrix  # noqa: E402
+from cost_estimator import CostEstimator, format_estimate  # noqa: E402
+from golden_dedupe import DEFAULT_THRESHOLD, redundant_case_ids  # noqa: E402
+from otlp_spool import OTLP_FILE_DIR_ENV_VAR  # noqa: E402
+from payload_policy import (  # noqa: E402
+    DEFAULT_PASS_SAMPLE_RATE,
+    DEFAULT_SLOW_MS,
+    OFFLOAD_BYTES_ENV_VAR,
+    SAMPLE_ENV_VAR,
+    SLOW_MS_ENV_VAR,
+)
+from results_store import CaseRecord, ResultsStore, default_db_path  # noqa: E402
+from session_cache import SESSION_CACHE_ENV_VAR, get_stats  # noqa: E402
+from smoke_selector import load_smoke_ids  # noqa: E402
+
 # Environment variable for xdist trace context propagation
 TRACEPARENT_ENV_VAR = "PYTEST_OTEL_TRACEPARENT"
 
+# Environment variable carrying the run ID (shared by xdist workers)
+RUN_ID_ENV_VAR = "ROUTING_RUN_ID"
+
+# Environment variable carrying --model to test modules (see get_test_model)
+MODEL_ENV_VAR = "ROUTING_TEST_MODEL"
+
+# Spend limit shared by every run whose ID starts with the budget scope
+# (e.g. all models of a matrix run); the scope defaults to this run's ID
+BUDGET_ENV_VAR = "ROUTING_BUDGET_USD"
+BUDGET_SCOPE_ENV_VAR = "ROUTING_BUDGET_SCOPE"
+
+# Key used to ship each xdist worker's cost tracker to the controller
+COST_TRACKER_KEY = "routing_cost_tracker"
+
+# Key used to ship each xdist worker's routing confusion matrix
+CONFUSION_KEY = "routing_confusion_matrix"
+
+# Numeric cost tracker fields that are summed when merging worker trackers
+_COST_TRACKER_SUM_FIELDS = (
+    "total_cost_usd",
+    "total_duration_ms",
+    "passed",
+    "failed",
+    "skipped",
+    "sessions_executed",
+    "sessions_coalesced",
+)
+
+
+def _is_xdist_worker(config) -> bool:
+    """Check if this process is an xdist worker (rather than controller/solo)."""
+    return hasattr(config, "workeroutput")
+
+
+def _xdist_worker_count(config) -> int:
+    """Get the number of xdist workers requested with -n (0 if none)."""
+    try:
+        num_workers = config.getoption("numprocesses", 0) or 0
+        if num_workers == "auto":
+            return os.cpu_count() or 1
+        return int(num_workers)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _run_state_dir(config) -> Path:
+    """Get (creating on first use) this run's temp dir for shared state."""
+    if not getattr(config, "_run_state_dir", None):
+        config._run_state_dir = tempfile.mkdtemp(prefix="routing-run-")
+    return Path(config._run_state_dir)
+
+
+def new_cost_tracker() -> dict:
+    """Create an empty cost tracker for this process."""
+    return {
+        "total_cost_usd": 0.0,
+        "total_duration_ms": 0,
+        "passed": 0,
+        "failed": 0,
+        "skipped": 0,
+        "sessions_executed": 0,
+        "sessions_coalesced": 0,
+        "start_time": time.time(),
+        "workers": 0,
+    }
+
+
+def merge_cost_tracker(target: dict, other: dict) -> dict:
+    """
+    Fold another process's cost tracker into ``target``.
+
+    Used by the xdist controller to build suite-wide totals from the
+    trackers each worker ships back via ``workeroutput``.
+    """
+    for key in _COST_TRACKER_SUM_FIELDS:
+        target[key] += other.get(key, 0)
+    target["start_time"] = min(
+        target["start_time"], other.get("start_time", target["start_time"])
+    )
+    target["workers"] += 1
+    return target
+
 
 def pytest_addoption(parser):
     """Add custom command line options."""
@@ -55,8 +164,16 @@ def pytest_addoption(parser):
     parser.addoption(
         "--otlp-endpoint",
         action="store",
-        default="http://localhost:4318",
-        help="OTLP HTTP endpoint (default: http://localhost:4318)",
+        default=None,
+        help="OTLP HTTP endpoint (default: $OTLP_HTTP_ENDPOINT or http://localhost:4318)",
+    )
+    parser.addoption(
+        "--otlp-file",
+        action="store",
+        default=None,
+        metavar="DIR",
+        help="Spool telemetry to OTLP-JSON files in DIR instead of exporting "
+        "over HTTP (upload later with otlp_spool.py)",
     )
     parser.addoption(
         "--model",
@@ -64,6 +181,81 @@ def pytest_addoption(parser):
         default=None,
         help="Claude model to use (e.g., 'haiku' for fast iteration, 'sonnet' for production)",
     )
+    parser.addoption(
+        "--no-coalesce",
+        action="store_true",
+        default=False,
+        help="Run every Claude session, even for identical requests in this run",
+    )
+    parser.addoption(
+        "--max-concurrency",
+        action="store",
+        type=int,
+        default=None,
+        help="Upper bound on concurrent Claude sessions (default: xdist workers)",
+    )
+    parser.addoption(
+        "--no-adaptive-concurrency",
+        action="store_true",
+        default=False,
+        help="Do not adapt concurrent Claude sessions to rate limiting",
+    )
+    parser.addoption(
+        "--budget-usd",
+        action="store",
+        type=float,
+        default=None,
+        help=f"Skip remaining cases once API spend reaches this (or ${BUDGET_ENV_VAR})",
+    )
+    parser.addoption(
+        "--estimate-only",
+        action="store_true",
+        default=False,
+        help="Predict cost and duration of the selected cases from history, then exit",
+    )
+    parser.addoption(
+        "--dedupe",
+        action="store_true",
+        default=False,
+        help="Run one representative per cluster of near-duplicate golden inputs",
+    )
+    parser.addoption(
+        "--dedupe-threshold",
+        action="store",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Input similarity for --dedupe clusters (default: {DEFAULT_THRESHOLD})",
+    )
+    parser.addoption(
+        "--payload-sample",
+        action="store",
+        type=float,
+        default=None,
+        help="Fraction of passing cases whose spans keep full prompt/response "
+        f"payloads (default: {DEFAULT_PASS_SAMPLE_RATE})",
+    )
+    parser.addoption(
+        "--payload-slow-ms",
+        action="store",
+        type=float,
+        default=None,
+        help=f"Passing cases this slow keep full payloads (default: {DEFAULT_SLOW_MS})",
+    )
+    parser.addoption(
+        "--payload-offload-bytes",
+        action="store",
+        type=int,
+        default=None,
+        help="Write payloads larger than this to the artifact store and keep "
+        "only a reference on the span",
+    )
+    parser.addoption(
+        "--confusion-file",
+        action="store",
+        default=str(DEFAULT_MATRIX_FILE),
+        help="Where to write the suite's routing confusion matrix JSON "
+        f"(default: {DEFAULT_MATRIX_FILE.name}; empty to skip)",
+    )
 
 
 def pytest_configure(config):
@@ -81,12 +273,78 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "workflow: Multi-skill workflow tests")
     config.addinivalue_line("markers", "edge: Edge case tests")
     config.addinivalue_line("markers", "slow: Slow tests (each test calls Claude API)")
+    config.addinivalue_line(
+        "markers", "smoke: Covering smoke subset (see smoke_selector.py)"
+    )
+    config._smoke_ids = load_smoke_ids()
+
+    # Per-process cost tracker (workers ship theirs to the controller at exit)
+    config._cost_tracker = new_cost_tracker()
+    config._confusion = ConfusionMatrix()
+
+    # Estimate-only runs collect in this process and never start workers;
+    # -n still sets the parallelism the estimate assumes
+    config._estimate = None
+    if config.getoption("--estimate-only") and not _is_xdist_worker(config):
+        workers = max(1, _xdist_worker_count(config))
+        config._estimate_parallel = min(
+            workers, config.getoption("--max-concurrency") or workers
+        )
+        config.option.dist = "no"
+
+    # Run ID set by the controller before workers spawn, so they inherit it
+    config._run_id = os.environ.setdefault(RUN_ID_ENV_VAR, uuid.uuid4().hex[:12])
+
+    # Run-scoped state lives in a temp dir created by the controller; xdist
+    # workers inherit its locations through the environment
+    config._run_state_dir = None
+
+    # Session cache so identical requests run once
+    if config.getoption("--no-coalesce"):
+        os.environ.pop(SESSION_CACHE_ENV_VAR, None)
+    elif not os.environ.get(SESSION_CACHE_ENV_VAR):
+        os.environ[SESSION_CACHE_ENV_VAR] = str(_run_state_dir(config) / "sessions")
+
+    # AIMD limit on concurrent Claude sessions, capped at the worker count
+    if config.getoption("--no-adaptive-concurrency"):
+        os.environ.pop(CONCURRENCY_STATE_ENV_VAR, None)
+    elif not os.environ.get(CONCURRENCY_STATE_ENV_VAR):
+        state_file = _run_state_dir(config) / "concurrency.json"
+        max_sessions = config.getoption("--max-concurrency") or max(
+            1, _xdist_worker_count(config)
+        )
+        init_state_file(state_file, max_sessions)
+        os.environ[CONCURRENCY_STATE_ENV_VAR] = str(state_file)
+
+    # Local results store (history for progress ETA and reporting)
+    db_path = default_db_path()
+    config._results_store = ResultsStore(db_path) if db_path else None
+
+    # Spend limit, tracked through the results store so it holds across
+    # workers and concurrent runs sharing a budget scope
+    budget = config.getoption("--budget-usd") or os.environ.get(BUDGET_ENV_VAR)
+    config._budget_usd = float(budget) if budget else None
+    config._budget_scope = os.environ.get(BUDGET_SCOPE_ENV_VAR) or config._run_id
+    if config._budget_usd and not config._results_store:
+        print("Warning: budget ignored because the results store is disabled")
+
+    # Span payload policy (read by otel_metrics; workers inherit it)
+    for option, env_var in (
+        ("--payload-sample", SAMPLE_ENV_VAR),
+        ("--payload-slow-ms", SLOW_MS_ENV_VAR),
+        ("--payload-offload-bytes", OFFLOAD_BYTES_ENV_VAR),
+    ):
+        if config.getoption(option) is not None:
+            os.environ[env_var] = str(config.getoption(option))
 
     # Initialize OpenTelemetry if requested
     if config.getoption("--otel") and OTEL_AVAILABLE:
-        import os
-
-        os.environ["OTLP_HTTP_ENDPOINT"] = config.getoption("--otlp-endpoint")
+        if config.getoption("--otlp-endpoint"):
+            os.environ["OTLP_HTTP_ENDPOINT"] = config.getoption("--otlp-endpoint")
+        if config.getoption("--otlp-file"):
+            os.environ[OTLP_FILE_DIR_ENV_VAR] = str(
+                Path(config.getoption("--otlp-file")).resolve()
+            )
         if init_telemetry():
             config._otel_enabled = True
         else:
@@ -124,10 +382,7 @@ def pytest_sessionstart(session):
             model = config.getoption("--model") or "unknown"
 
             # Detect xdist worker count
-            try:
-                num_workers = int(config.getoption("numprocesses", 0) or 0)
-            except (TypeError, ValueError):
-                num_workers = 0
+            num_workers = _xdist_worker_count(config)
 
             traceparent = start_suite_span(
                 suite_name="routing_test_suite",
@@ -146,12 +401,29 @@ def pytest_sessionstart(session):
 
 
 def pytest_sessionfinish(session, exitstatus):
-    """End worker and suite spans at session finish."""
+    """Ship worker cost totals to the controller and end worker/suite spans."""
     config = session.config
+    cost_tracker = config._cost_tracker
+
+    # Sessions this process ran or shared (zero on an xdist controller)
+    for key, count in get_stats().to_dict().items():
+        cost_tracker[key] += count
+
+    # xdist workers: hand this worker's tracker to the controller, which
+    # merges it in pytest_testnodedown before its own sessionfinish runs
+    if _is_xdist_worker(config):
+        config.workeroutput[COST_TRACKER_KEY] = dict(cost_tracker)
+        config.workeroutput[CONFUSION_KEY] = config._confusion.to_dict()
+    else:
+        _export_confusion_matrix(config)
 
     if not getattr(config, "_otel_enabled", False):
         return
 
+    # Record queued test results before their worker and suite spans end
+    if flush_records:
+        flush_records()
+
     # Get counts from terminal reporter if available
     reporter = config.pluginmanager.get_plugin("terminalreporter")
     if reporter:
@@ -160,13 +432,9 @@ def pytest_sessionfinish(session, exitstatus):
         skipped = len(reporter.stats.get("skipped", []))
     else:
         # Fall back to cost_tracker counts
-        cost_tracker = getattr(config, "_cost_tracker", None)
-        if cost_tracker:
-            passed = cost_tracker.get("passed", 0)
-            failed = cost_tracker.get("failed", 0)
-            skipped = cost_tracker.get("skipped", 0)
-        else:
-            passed = failed = skipped = 0
+        passed = cost_tracker.get("passed", 0)
+        failed = cost_tracker.get("failed", 0)
+        skipped = cost_tracker.get("skipped", 0)
 
     # Check if we're an xdist worker
     worker_id = os.environ.get("PYTEST_XDIST_WORKER")
@@ -181,30 +449,184 @@ def pytest_sessionfinish(session, exitstatus):
     if end_worker_span:
         end_worker_span(passed=passed, failed=failed, skipped=skipped)
 
-    if end_suite_span:
-        # Get cost from cost_tracker if available
-        cost_tracker = getattr(config, "_cost_tracker", None)
-        total_cost = cost_tracker.get("total_cost_usd", 0.0) if cost_tracker else 0.0
+    # Session summary from the (now suite-wide) cost tracker
+    if record_test_session_summary:
+        elapsed_ms = int((time.time() - cost_tracker["start_time"]) * 1000)
+        record_test_session_summary(
+            passed=cost_tracker["passed"],
+            failed=cost_tracker["failed"],
+            skipped=cost_tracker["skipped"],
+            total_duration_ms=elapsed_ms,
+            total_cost_usd=cost_tracker["total_cost_usd"],
+        )
 
+    if end_suite_span:
         end_suite_span(
             passed=passed,
             failed=failed,
             skipped=skipped,
-            total_cost_usd=total_cost,
+            total_cost_usd=cost_tracker["total_cost_usd"],
+            total_api_duration_ms=cost_tracker["total_duration_ms"],
+        )
+
+
+def _export_confusion_matrix(config):
+    """
+    Write the suite's confusion matrix and set the per-skill score gauges.
+
+    Runs on the controller (or a solo run) after every worker's matrix has
+    been merged, and before the suite span ends and telemetry shuts down.
+    """
+    matrix = config._confusion
+    if not matrix.total:
+        return
+
+    model = config.getoption("--model") or "unknown"
+    path = config.getoption("--confusion-file")
+    if path:
+        try:
+            matrix.write_json(Path(path), run_id=config._run_id, model=model)
+        except OSError as e:
+            print(f"Warning: could not write confusion matrix to {path}: {e}")
+
+    if getattr(config, "_otel_enabled", False) and record_skill_scores:
+        record_skill_scores(
+            {label: score.to_dict() for label, score in matrix.skill_scores().items()},
+            model=model,
+        )
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Merge a finished xdist worker's cost tracker and confusion matrix."""
+    workeroutput = getattr(node, "workeroutput", {})
+    worker_tracker = workeroutput.get(COST_TRACKER_KEY)
+    if worker_tracker:
+        merge_cost_tracker(node.config._cost_tracker, worker_tracker)
+    worker_matrix = workeroutput.get(CONFUSION_KEY)
+    if worker_matrix:
+        node.config._confusion.merge(ConfusionMatrix.from_dict(worker_matrix))
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Print suite-wide API cost (aggregated across xdist workers)."""
+    if _is_xdist_worker(config):
+        return
+
+    if config.getoption("--estimate-only"):
+        terminalreporter.write_sep("=", "routing cost estimate")
+        if config._estimate:
+            terminalreporter.write_line(format_estimate(config._estimate))
+            terminalreporter.write_line(
+                f"  (model {config.getoption('--model') or 'default'}, "
+                f"{config._estimate_parallel} worker(s))"
+            )
+        else:
+            terminalreporter.write_line(
+                "No runnable cases selected (or store disabled)"
+            )
+        return
+
+    tracker = config._cost_tracker
+    if not (tracker["passed"] or tracker["failed"]):
+        return
+
+    terminalreporter.write_sep("=", "routing API cost")
+    terminalreporter.write_line(f"Total API cost: ${tracker['total_cost_usd']:.4f}")
+    terminalreporter.write_line(
+        f"Total API time: {tracker['total_duration_ms'] / 1000:.1f}s"
+    )
+    executed = tracker["sessions_executed"]
+    coalesced = tracker["sessions_coalesced"]
+    if coalesced:
+        requests = executed + coalesced
+        terminalreporter.write_line(
+            f"Sessions: {executed} run for {requests} requests "
+            f"({coalesced / requests:.0%} deduplicated)"
+        )
+    concurrency = AdaptiveLimiter().snapshot()
+    if concurrency:
+        terminalreporter.write_line(
+            f"Concurrent sessions: limit {int(concurrency.limit)} "
+            f"(peak {int(concurrency.peak_limit)}, max {concurrency.max_limit}), "
+            f"{concurrency.rate_limited} rate-limited"
+        )
+    if tracker["workers"]:
+        terminalreporter.write_line(f"Aggregated from {tracker['workers']} workers")
+    confusion_file = config.getoption("--confusion-file")
+    if confusion_file and config._confusion.total:
+        terminalreporter.write_line(
+            f"Confusion matrix: {confusion_file} (python confusion_matrix.py)"
         )
 
 
 def pytest_unconfigure(config):
-    """Shutdown telemetry on exit."""
+    """Shutdown telemetry and remove the run's shared state on exit."""
     if getattr(config, "_otel_enabled", False) and otel_shutdown:
         otel_shutdown()
 
+    # Only the process that created the state dir removes it
+    run_state_dir = getattr(config, "_run_state_dir", None)
+    if run_state_dir:
+        shutil.rmtree(run_state_dir, ignore_errors=True)
+        for env_var in (SESSION_CACHE_ENV_VAR, CONCURRENCY_STATE_ENV_VAR):
+            if os.environ.get(env_var, "").startswith(run_state_dir):
+                os.environ.pop(env_var, None)
+
+
+def pytest_itemcollected(item):
+    """Mark routing tests as slow, and smoke when in the saved smoke subset.
 
+    Markers must be on the items before -m deselects them, which happens in
+    pytest's own pytest_collection_modifyitems. The trylast hook below runs
+    after that, so markers added there are invisible to -m slow / -m smoke.
+    """
+    if "test_routing" not in item.nodeid:
+        return
+    item.add_marker(pytest.mark.slow)
+
+    params = getattr(getattr(item, "callspec", None), "params", {})
+    test_case = params.get("test_case") or {}
+    if test_case.get("id") in item.config._smoke_ids:
+        item.add_marker(pytest.mark.smoke)
+
+
+@pytest.hookimpl(trylast=True)
 def pytest_collection_modifyitems(config, items):
-    """Mark all routing tests as slow by default."""
-    for item in items:
-        if "test_routing" in item.nodeid:
-            item.add_marker(pytest.mark.slow)
+    """Apply --dedupe and --estimate-only to the final selection."""
+
+    def test_case_of(item) -> dict:
+        params = getattr(getattr(item, "callspec", None), "params", {})
+        return params.get("test_case") or {}
+
+    # trylast: runs after -k/-m deselection, so this is the final selection.
+    # Workers dedupe too, so every process collects the same items.
+    if config.getoption("--dedupe"):
+        cases = [test_case_of(item) for item in items]
+        redundant = redundant_case_ids(
+            [c for c in cases if c and not c.get("skip")],
+            threshold=config.getoption("--dedupe-threshold"),
+        )
+        if redundant:
+            removed = [i for i in items if test_case_of(i).get("id") in redundant]
+            items[:] = [i for i in items if test_case_of(i).get("id") not in redundant]
+            config.hook.pytest_deselected(items=removed)
+
+    if config.getoption("--estimate-only") and not _is_xdist_worker(config):
+        test_ids = []
+        for item in items:
+            test_case = test_case_of(item)
+            if test_case.get("id") and not test_case.get("skip"):
+                test_ids.append(test_case["id"])
+
+        if test_ids and config._results_store:
+            config._estimate = CostEstimator(config._results_store).estimate(
+                test_ids,
+                model=config.getoption("--model") or "default",
+                parallel=config._estimate_parallel,
+            )
+        config.hook.pytest_deselected(items=list(items))
+        items[:] = []
 
 
 @pytest.fixture(scope="session")
@@ -226,47 +648,43 @@ _test_config = {}
 @pytest.fixture(scope="session", autouse=True)
 def _store_test_config(request):
     """Store test config for module-level access."""
-    _test_config["model"] = request.config.getoption("--model")
+    model = request.config.getoption("--model")
+    _test_config["model"] = model
+    # With --import-mode=importlib, `from conftest import ...` in a test
+    # module loads a separate copy of this file, so also publish via env
+    if model:
+        os.environ[MODEL_ENV_VAR] = model
     yield
     _test_config.clear()
+    os.environ.pop(MODEL_ENV_VAR, None)
 
 
 def get_test_model() -> str | None:
     """Get the configured model for tests. Called from test_routing.py."""
-    return _test_config.get("model")
+    return _test_config.get("model") or os.environ.get(MODEL_ENV_VAR)
 
 
-@pytest.fixture(scope="session")
-def cost_tracker(request):
-    """Track cumulative cost across test session."""
-    tracker = {
-        "total_cost_usd": 0.0,
-        "total_duration_ms": 0,
-        "passed": 0,
-        "failed": 0,
-        "skipped": 0,
-        "start_time": time.time(),
-    }
+@pytest.fixture(autouse=True)
+def _enforce_budget(request):
+    """Skip a case once recorded spend reaches the configured budget."""
+    config = request.config
+    if not (config._budget_usd and config._results_store):
+        return
 
-    # Store in config for pytest_sessionfinish access
-    request.config._cost_tracker = tracker
+    spent = config._results_store.total_cost(config._budget_scope)
+    if spent >= config._budget_usd:
+        pytest.skip(f"Budget ${config._budget_usd:.2f} exhausted (${spent:.2f} spent)")
 
-    yield tracker
 
-    # Print summary
-    print(f"\n\nTotal API cost: ${tracker['total_cost_usd']:.4f}")
-    print(f"Total API time: {tracker['total_duration_ms'] / 1000:.1f}s")
+@pytest.fixture(scope="session")
+def cost_tracker(request):
+    """
+    Track cumulative cost across test session.
 
-    # Record session summary to OpenTelemetry (legacy - suite span now handles this)
-    if getattr(request.config, "_otel_enabled", False) and record_test_session_summary:
-        elapsed_ms = int((time.time() - tracker["start_time"]) * 1000)
-        record_test_session_summary(
-            passed=tracker["passed"],
-            failed=tracker["failed"],
-            skipped=tracker["skipped"],
-            total_duration_ms=elapsed_ms,
-            total_cost_usd=tracker["total_cost_usd"],
-        )
+    The tracker lives on the pytest config so pytest_sessionfinish can ship
+    it to the xdist controller; totals are printed in the terminal summary.
+    """
+    return request.config._cost_tracker
 
 
 @pytest.fixture(scope="function")
@@ -290,6 +708,8 @@ def record_otel(request, otel_enabled, cost_tracker):
     """
     # Get model from pytest config for OTel recording
     configured_model = request.config.getoption("--model") or "unknown"
+    results_store = getattr(request.config, "_results_store", None)
+    started_at = time.time()
 
     def _record(
         test_id: str,
@@ -302,6 +722,8 @@ def record_otel(request, otel_enabled, cost_tracker):
         cost_usd: float,
         asked_clarification: bool = False,
         session_id: str = "",
+        retry_count: int = 0,
+        coalesced: bool = False,
         tokens_input: int = 0,
         tokens_output: int = 0,
         response_text: str = "",
@@ -310,6 +732,7 @@ def record_otel(request, otel_enabled, cost_tracker):
         tool_use_total: int | None = None,
         error_type: str | None = None,
         error_message: str | None = None,
+        latency=None,
     ):
         # Update cost tracker
         cost_tracker["total_cost_usd"] += cost_usd
@@ -318,6 +741,9 @@ def record_otel(request, otel_enabled, cost_tracker):
             cost_tracker["passed"] += 1
         else:
             cost_tracker["failed"] += 1
+        request.config._confusion.add(
+            expected_skill, actual_skill, asked_clarification, passed=passed
+        )
 
         # Auto-classify error type if not provided
         classified_error_type = error_type
@@ -340,6 +766,33 @@ def record_otel(request, otel_enabled, cost_tracker):
                 classified_error_type = "assertion_failed"
                 classified_error_message = "Test assertion failed"
 
+        if results_store:
+            finished_at = time.time()
+            try:
+                results_store.record_case(
+                    CaseRecord(
+                        run_id=request.config._run_id,
+                        test_id=test_id,
+                        passed=passed,
+                        category=category,
+                        model=request.config.getoption("--model") or "default",
+                        expected_skill=expected_skill or "none",
+                        actual_skill=actual_skill or "none",
+                        asked_clarification=asked_clarification,
+                        duration_ms=duration_ms,
+                        wall_ms=int((finished_at - started_at) * 1000),
+                        cost_usd=cost_usd,
+                        coalesced=coalesced,
+                        worker_id=os.environ.get("PYTEST_XDIST_WORKER", "main"),
+                        started_at=started_at,
+                        finished_at=finished_at,
+                    )
+                )
+            except Exception as e:
+                print(
+                    f"Warning: could not record result to {results_store.db_path}: {e}"
+                )
+
         # Record to OpenTelemetry if enabled
         if otel_enabled and record_test_result:
             record_test_result(
@@ -356,12 +809,14 @@ def record_otel(request, otel_enabled, cost_tracker):
                 model=configured_model,
                 tokens_input=tokens_input,
                 tokens_output=tokens_output,
+                retry_count=retry_count,
                 response_text=response_text,
                 tool_use_accuracy=tool_use_accuracy,
                 tool_use_matched=tool_use_matched,
                 tool_use_total=tool_use_total,
                 error_type=classified_error_type,
                 error_message=classified_error_message,
+                latency=latency.to_dict() if latency else None,
             )
 
     return _record
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""Routing confusion matrix (expected skill x actual outcome).
+
+The conftest adds every recorded routing case to an in-memory matrix, xdist
+workers ship theirs to the controller, and the controller writes the merged
+matrix as JSON and exports per-skill precision, recall and F1 once per
+suite. Dashboards read those gauges instead of reconstructing them from
+per-test counter series.
+
+Besides skills, rows and columns include two outcomes:
+
+- ``asked``: Claude asked for clarification (the expected outcome of
+  disambiguation cases and ``ask_for_input`` edge cases)
+- ``none``: no skill was loaded
+
+A row is a case's first expected skill. Cases also accept alternate skills,
+other steps of a workflow or a clarifying question, so a passing case is
+counted on the diagonal whatever it routed to; only failures are off it.
+Precision and recall therefore agree with the suite's pass/fail results.
+
+Usage:
+    python confusion_matrix.py                        # Last run's matrix
+    python confusion_matrix.py path/to/confusion.json
+"""
+
+import argparse
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+ASKED = "asked"
+NONE = "none"
+
+# Expected values recorded by tests whose correct outcome is a question
+_ASK_EXPECTATIONS = {ASKED, "disambiguation", "ask_for_input"}
+
+DEFAULT_MATRIX_FILE = Path(__file__).parent / ".routing_confusion.json"
+
+
+def expected_label(expected: str | None) -> str:
+    """Matrix row for a test's expected skill or action."""
+    if not expected or expected == NONE:
+        return NONE
+    return ASKED if expected in _ASK_EXPECTATIONS else expected
+
+
+def actual_label(actual: str | None, asked_clarification: bool = False) -> str:
+    """Matrix column for what Claude did (asking wins over a loaded skill)."""
+    if asked_clarification or actual == ASKED:
+        return ASKED
+    return actual or NONE
+
+
+@dataclass
+class SkillScore:
+    """Precision, recall and F1 for one label (None when undefined)."""
+
+    label: str
+    support: int  # Cases expecting this label
+    predicted: int  # Cases routed to this label
+    correct: int
+    precision: float | None
+    recall: float | None
+    f1: float | None
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "label": self.label,
+            "support": self.support,
+            "predicted": self.predicted,
+            "correct": self.correct,
+            "precision": self.precision,
+            "recall": self.recall,
+            "f1": self.f1,
+        }
+
+
+@dataclass
+class ConfusionMatrix:
+    """Case counts keyed by expected label, then actual label."""
+
+    counts: dict[str, dict[str, int]] = field(default_factory=dict)
+
+    def add(
+        self,
+        expected: str | None,
+        actual: str | None,
+        asked_clarification: bool = False,
+        passed: bool = False,
+    ):
+        """
+        Count one routing case.
+
+        Args:
+            expected: Expected skill or action (the row)
+            actual: Skill loaded, if any
+            asked_clarification: Whether Claude asked a question
+            passed: The case passed, so its outcome was an accepted one and
+                it is counted as the expected label
+        """
+        label = expected_label(expected)
+        row = self.counts.setdefault(label, {})
+        column = label if passed else actual_label(actual, asked_clarification)
+        row[column] = row.get(column, 0) + 1
+
+    def merge(self, other: "ConfusionMatrix") -> "ConfusionMatrix":
+        """Fold another process's matrix into this one."""
+        for expected, row in other.counts.items():
+            target = self.counts.setdefault(expected, {})
+            for actual, count in row.items():
+                target[actual] = target.get(actual, 0) + count
+        return self
+
+    @property
+    def total(self) -> int:
+        """Number of cases counted."""
+        return sum(sum(row.values()) for row in self.counts.values())
+
+    def labels(self) -> list[str]:
+        """Every row and column label, skills first, then asked and none."""
+        seen = set(self.counts)
+        for row in self.counts.values():
+            seen.update(row)
+        outcomes = [label for label in (ASKED, NONE) if label in seen]
+        return sorted(seen - {ASKED, NONE}) + outcomes
+
+    def skill_scores(self) -> dict[str, SkillScore]:
+        """Per-label precision, recall and F1, one-vs-rest."""
+        predicted: dict[str, int] = {}
+        for row in self.counts.values():
+            for actual, count in row.items():
+                predicted[actual] = predicted.get(actual, 0) + count
+
+        scores = {}
+        for label in self.labels():
+            row = self.counts.get(label, {})
+            correct = row.get(label, 0)
+            support = sum(row.values())
+            routed = predicted.get(label, 0)
+            precision = correct / routed if routed else None
+            recall = correct / support if support else None
+            if precision is None or recall is None:
+                f1 = None
+            elif precision + recall:
+                f1 = 2 * precision * recall / (precision + recall)
+            else:
+                f1 = 0.0
+            scores[label] = SkillScore(
+                label=label,
+                support=support,
+                predicted=routed,
+                correct=correct,
+                precision=precision,
+                recall=recall,
+                f1=f1,
+            )
+        return scores
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary (the JSON artifact)."""
+        return {
+            "labels": self.labels(),
+            "total": self.total,
+            "counts": {expected: dict(row) for expected, row in self.counts.items()},
+            "scores": {
+                label: score.to_dict() for label, score in self.skill_scores().items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ConfusionMatrix":
+        """Rebuild a matrix from ``to_dict`` output (only counts are read)."""
+        return cls(
+            counts={
+                expected: {actual: int(n) for actual, n in row.items()}
+                for expected, row in data.get("counts", {}).items()
+            }
+        )
+
+    def write_json(self, path: Path, **metadata) -> Path:
+        """
+        Write the matrix and scores as JSON (atomically).
+
+        Args:
+            path: Output file
+            **metadata: Extra top-level fields, e.g. run_id and model
+
+        Returns:
+            The written path
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({**metadata, **self.to_dict()}, indent=2))
+        os.replace(tmp, path)
+        return path
+
+
+def _format_score(value: float | None) -> str:
+    return "-" if value is None else f"{value:.2f}"
+
+
+def format_matrix(matrix: ConfusionMatrix) -> str:
+    """Render the matrix and per-label scores as plain text."""
+    labels = matrix.labels()
+    width = max([len(label) for label in labels] + [len("expected")])
+    lines = [
+        "expected".ljust(width)
+        + "  "
+        + "  ".join(f"{i:>4}" for i in range(len(labels)))
+    ]
+    for label in labels:
+        row = matrix.counts.get(label, {})
+        cells = "  ".join(f"{row.get(actual, 0) or '.':>4}" for actual in labels)
+        lines.append(f"{label.ljust(width)}  {cells}")
+    lines.append("")
+    lines.append(
+        f"{'':{width}}  {'#':>4}  {'prec':>5}  {'rec':>5}  {'f1':>5}  {'support':>7}"
+    )
+    for i, (label, score) in enumerate(matrix.skill_scores().items()):
+        lines.append(
+            f"{label.ljust(width)}  {i:>4}  {_format_score(score.precision):>5}  "
+            f"{_format_score(score.recall):>5}  {_format_score(score.f1):>5}  "
+            f"{score.support:>7}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Show a routing confusion matrix written by the test suite",
+    )
+    parser.add_argument(
+        "path",
+        nargs="?",
+        default=str(DEFAULT_MATRIX_FILE),
+        help=f"Matrix JSON file (default: {DEFAULT_MATRIX_FILE.name})",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the matrix as JSON",
+    )
+    args = parser.parse_args()
+
+    path = Path(args.path)
+    if not path.exists():
+        print(f"No confusion matrix at {path}", file=sys.stderr)
+        sys.exit(1)
+
+    data = json.loads(path.read_text())
+    matrix = ConfusionMatrix.from_dict(data)
+    if args.json:
+        print(json.dumps(matrix.to_dict(), indent=2))
+    else:
+        header = ", ".join(
+            f"{key} {data[key]}" for key in ("run_id", "model") if data.get(key)
+        )
+        if header:
+            print(header)
+        print(format_matrix(matrix))
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""Pre-run cost and duration estimates from historical case results.
+
+Each case's cost and wall time are drawn from its own recent history in the
+results store (per model). Cases without history borrow from other cases in
+the same category, then from every case run with that model, and finally
+from the same lookups across all models. Bootstrapping whole runs from
+those draws gives p50/p90 totals; the makespan of each simulated run is the
+schedule length of its case durations on the chosen number of workers
+(longest case first, onto the least-loaded worker, as xdist's load
+scheduling roughly does).
+
+A plan is a sequence of runs (e.g. a remediation pass: suite, per-test
+checks, final validation); totals are simulated jointly across its runs.
+"""
+
+import heapq
+import random
+from dataclasses import asdict, dataclass
+
+from golden_set import load_golden_cases
+from progress_reporter import DEFAULT_CASE_DURATION_MS, format_duration
+from results_store import ResultsStore
+
+# Bootstrap iterations per estimate
+BOOTSTRAP_SAMPLES = 1000
+
+# Historical results considered per case
+HISTORY_PER_CASE = 20
+
+
+@dataclass
+class PlannedRun:
+    """One pytest run in a plan."""
+
+    test_ids: list[str]
+    model: str = "default"
+    parallel: int = 1
+
+
+@dataclass
+class CostEstimate:
+    """Predicted cost and makespan of a plan."""
+
+    cases: int
+    cases_with_history: int
+    cost_p50_usd: float
+    cost_p90_usd: float
+    makespan_p50_s: float
+    makespan_p90_s: float
+    runs: int = 1
+    cost_known: bool = True
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return asdict(self)
+
+
+def lpt_makespan(durations: list[float], workers: int) -> float:
+    """Makespan of durations scheduled longest-first onto ``workers`` workers."""
+    if not durations:
+        return 0.0
+    loads = [0.0] * max(1, workers)
+    for duration in sorted(durations, reverse=True):
+        heapq.heapreplace(loads, loads[0] + duration)
+    return max(loads)
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def format_estimate(estimate: CostEstimate) -> str:
+    """Render an estimate as a short summary."""
+    cost = (
+        f"${estimate.cost_p50_usd:.2f} (p90 ${estimate.cost_p90_usd:.2f})"
+        if estimate.cost_known
+        else "unknown (no cost history)"
+    )
+    runs = f" over {estimate.runs} runs" if estimate.runs > 1 else ""
+    return (
+        f"Estimate: {estimate.cases} cases{runs}, "
+        f"{estimate.cases_with_history} with history\n"
+        f"  Cost:     {cost}\n"
+        f"  Duration: {format_duration(estimate.makespan_p50_s)} "
+        f"(p90 {format_duration(estimate.makespan_p90_s)})"
+    )
+
+
+class CostEstimator:
+    """Bootstraps run cost and makespan from the results store."""
+
+    def __init__(
+        self,
+        store: ResultsStore | None = None,
+        samples: int = BOOTSTRAP_SAMPLES,
+        seed: int | None = 0,
+    ):
+        """Initialize estimator.
+
+        Args:
+            store: Results store with case history. If None, uses the default.
+            samples: Bootstrap iterations
+            seed: Random seed (fixed by default so estimates are repeatable)
+        """
+        self.store = store or ResultsStore()
+        self.samples = samples
+        self.rng = random.Random(seed)
+        self.categories = {
+            case_id: case.get("category", "")
+            for case_id, case in load_golden_cases().items()
+        }
+        self._history: dict[str, dict[str, list[tuple[float, float]]]] = {}
+
+    def _model_history(self, model: str) -> dict[str, list[tuple[float, float]]]:
+        """(cost_usd, wall_s) samples per test ID for a model ("*" = any)."""
+        if model not in self._history:
+            records = self.store.case_history(
+                model=None if model == "*" else model,
+                limit_per_case=HISTORY_PER_CASE,
+            )
+            self._history[model] = {
+                test_id: [
+                    (r.cost_usd, r.wall_ms / 1000)
+                    for r in rows
+                    if r.wall_ms and not r.coalesced
+                ]
+                for test_id, rows in records.items()
+            }
+        return self._history[model]
+
+    def _case_samples(self, test_id: str, model: str) -> tuple[list, bool]:
+        """Samples for a case and whether they are the case's own history."""
+        category = self.categories.get(test_id)
+        for scope in (model, "*"):
+            history = self._model_history(scope)
+            if history.get(test_id):
+                return history[test_id], scope == model
+
+            same_category = [
+                s
+                for other, samples in history.items()
+                if category and self.categories.get(other) == category
+                for s in samples
+            ]
+            if same_category:
+                return same_category, False
+
+            pooled = [s for samples in history.values() for s in samples]
+            if pooled:
+                return pooled, False
+
+        # No history at all: duration fallback, cost unknown
+        return [(None, DEFAULT_CASE_DURATION_MS / 1000)], False
+
+    def estimate_plan(self, plan: list[PlannedRun]) -> CostEstimate:
+        """
+        Estimate a sequence of runs.
+
+        Args:
+            plan: Runs executed one after another
+
+        Returns:
+            CostEstimate with p50/p90 cost and total makespan
+        """
+        case_samples = []
+        cases = with_history = 0
+        cost_known = True
+        for run in plan:
+            run_samples = []
+            for test_id in run.test_ids:
+                samples, own = self._case_samples(test_id, run.model)
+                cases += 1
+                with_history += own
+                cost_known &= samples[0][0] is not None
+                run_samples.append(samples)
+            case_samples.append((run, run_samples))
+
+        costs, makespans = [], []
+        for _ in range(self.samples):
+            total_cost = total_time = 0.0
+            for run, run_samples in case_samples:
+                draws = [self.rng.choice(samples) for samples in run_samples]
+                total_cost += sum(cost or 0.0 for cost, _ in draws)
+                total_time += lpt_makespan([wall for _, wall in draws], run.parallel)
+            costs.append(total_cost)
+            makespans.append(total_time)
+
+        return CostEstimate(
+            cases=cases,
+            cases_with_history=with_history,
+            cost_p50_usd=_percentile(costs, 50),
+            cost_p90_usd=_percentile(costs, 90),
+            makespan_p50_s=_percentile(makespans, 50),
+            makespan_p90_s=_percentile(makespans, 90),
+            runs=len(plan),
+            cost_known=cost_known,
+        )
+
+    def estimate(
+        self,
+        test_ids: list[str],
+        model: str = "default",
+        parallel: int = 1,
+    ) -> CostEstimate:
+        """
+        Estimate a single run.
+
+        Args:
+            test_ids: Cases the run will execute
+            model: Model the run will use ("default" when --model is not set)
+            parallel: Number of xdist workers
+
+        Returns:
+            CostEstimate with p50/p90 cost and makespan
+        """
+        return self.estimate_plan([PlannedRun(test_ids, model, parallel)])
+
+    def runnable_test_ids(self) -> list[str]:
+        """Golden case IDs that are not marked skip."""
+        return sorted(self.categories)
+
+    def recently_failing(self, model: str) -> list[str]:
+        """Cases whose most recent result with a model was a failure."""
+        history = self.store.case_history(model=model, limit_per_case=1)
+        return sorted(
+            test_id
+            for test_id, records in history.items()
+            if records and not records[0].passed and test_id in self.categories
+        )
@@ -13,8 +13,9 @@
 #   ./fast_test.sh --id TC012,TC015          # Test specific test IDs
 #   ./fast_test.sh --fast                    # Use haiku model (faster)
 #   ./fast_test.sh --parallel 4              # Run 4 tests in parallel
-#   ./fast_test.sh --smoke                   # Run 5 key tests only (~1.5 min)
+#   ./fast_test.sh --smoke                   # Run the covering smoke subset
 #   ./fast_test.sh --failed                  # Re-run only failed tests
+#   ./fast_test.sh --watch --fast            # Re-run impacted tests on SKILL.md save
 
 set -e
 
@@ -27,6 +28,8 @@ MODEL_ARGS=""
 FILTER=""
 EXTRA_ARGS="-v"
 RERUN_FAILED=""
+WATCH=""
+PARALLEL_N=1
 
 # Skill to test ID mapping (function-based for compatibility)
 get_skill_tests() {
@@ -49,9 +52,6 @@ get_skill_tests() {
     esac
 }
 
-# Smoke test - one representative from each major skill
-SMOKE_TESTS="TC001 or TC005 or TC009 or TC012 or TC019"
-
 print_usage() {
     echo "Fast Iteration Test Runner"
     echo ""
@@ -62,12 +62,13 @@ print_usage() {
     echo "                             agile, collaborate, relationships, time, bulk,"
     echo "                             dev, fields, ops, admin, jsm"
     echo "  --id TC###[,TC###...]      Test specific test ID(s)"
-    echo "  --smoke                    Run 5 smoke tests (~1.5 min with --fast)"
+    echo "  --smoke                    Run the smoke subset (smoke_selector.py)"
     echo "  --failed                   Re-run only previously failed tests"
     echo "  --fast                     Use haiku model (faster, may differ slightly)"
     echo "  --production               Use default model (slower, matches production)"
     echo "  --parallel N               Run N tests in parallel (default: sequential)"
     echo "  --all                      Run all tests"
+    echo "  --watch                    Watch SKILL.md files and re-run impacted tests"
     echo "  -h, --help                 Show this help"
     echo ""
     echo "Examples:"
@@ -124,7 +125,7 @@ while [[ $# -gt 0 ]]; do
             shift
             ;;
         --smoke)
-            FILTER="-k \"$SMOKE_TESTS\""
+            FILTER="-m smoke"
             shift
             ;;
         --failed)
@@ -142,12 +143,17 @@ while [[ $# -gt 0 ]]; do
         --parallel)
             shift
             PARALLEL="-n $1"
+            PARALLEL_N="$1"
             shift
             ;;
         --all)
             FILTER=""
             shift
             ;;
+        --watch)
+            WATCH="1"
+            shift
+            ;;
         -h|--help)
             print_usage
             exit 0
@@ -160,6 +166,11 @@ while [[ $# -gt 0 ]]; do
     esac
 done
 
+# Watch mode: routing_watch.py picks the tests from each change
+if [[ -n "$WATCH" ]]; then
+    exec python3 routing_watch.py $MODEL_ARGS --parallel "$PARALLEL_N"
+fi
+
 # Build command
 CMD="pytest test_routing.py $EXTRA_ARGS $FILTER $MODEL_ARGS $PARALLEL $RERUN_FAILED"
 
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""Near-duplicate detection for golden test inputs.
+
+Paraphrased cases that expect the same outcome each cost a live Claude
+session without adding coverage. Cases are grouped by an outcome signature
+(category, expected/not skill, disambiguation options, workflow, context,
+expected commands); within a group, inputs are compared by MinHash over
+character trigrams and words, with issue keys, numbers and emails
+normalized. Locality-sensitive hashing on MinHash bands keeps comparisons
+near-linear, so thousands of cases index in a fraction of a second.
+
+``pytest --dedupe`` runs one representative (the first in golden order) per
+cluster of near-duplicates.
+
+Usage:
+    python golden_dedupe.py                  # List clusters
+    python golden_dedupe.py --threshold 0.6  # Looser matching
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+# Add tests directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from golden_set import load_golden_cases
+
+# MinHash lanes, split into LSH bands of BAND_ROWS lanes; candidates share
+# at least one band (~50% similarity to be likely candidates)
+NUM_LANES = 64
+BAND_ROWS = 4
+
+# Estimated Jaccard similarity needed to count as a near-duplicate
+DEFAULT_THRESHOLD = 0.7
+
+# Larger than any shingle hash; also the per-step offset of borrowed values
+_EMPTY = 2**64
+
+_NORMALIZE_PATTERNS = [
+    (re.compile(r"\S+@\S+\.\w+"), " email "),
+    (re.compile(r"\b[a-z][a-z0-9]*-\d+\b"), " key "),
+    (re.compile(r"\d+(\.\d+)?"), " n "),
+    (re.compile(r"[^a-z\s]"), " "),
+    (re.compile(r"\s+"), " "),
+]
+
+
+@dataclass
+class DuplicateCluster:
+    """Golden cases whose inputs are near-duplicates with the same outcome."""
+
+    representative: str
+    members: list[str]  # All case IDs in golden order, representative first
+    signature: str
+
+    @property
+    def redundant(self) -> list[str]:
+        """Members that --dedupe does not run."""
+        return self.members[1:]
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return asdict(self)
+
+
+def normalize_input(text: str) -> str:
+    """Lowercase and replace issue keys, numbers and emails with placeholders."""
+    text = text.lower()
+    for pattern, replacement in _NORMALIZE_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+
+def shingles(normalized: str) -> set[str]:
+    """Character trigrams and words of a normalized input."""
+    padded = f" {normalized} "
+    grams = {padded[i : i + 3] for i in range(len(padded) - 2)}
+    grams.update(f"w:{word}" for word in normalized.split())
+    return grams
+
+
+def outcome_signature(case: dict) -> str:
+    """Everything about a case's expected outcome, as a comparable string."""
+    return json.dumps(
+        {
+            "category": case.get("category"),
+            "expected_skill": case.get("expected_skill"),
+            "not_skill": case.get("not_skill"),
+            "options": sorted(case.get("disambiguation_options") or []),
+            "alternates": sorted(case.get("alternate_skills") or []),
+            "workflow": [s.get("skill") for s in case.get("workflow") or []],
+            "context": case.get("context"),
+            "confirmation": case.get("requires_confirmation"),
+            "commands": case.get("expected_commands"),
+        },
+        sort_keys=True,
+        default=str,
+    )
+
+
+class _MinHasher:
+    """One-permutation MinHash with rotation densification.
+
+    Each shingle is hashed once (and cached); the low bits pick its lane and
+    a lane keeps its smallest hash. Empty lanes borrow the hash of the next
+    non-empty lane to the right, offset by distance. Every value therefore
+    identifies its lane, so signatures can be compared as sets.
+    """
+
+    def __init__(self):
+        self._hashes: dict[str, int] = {}
+
+    def _hash(self, shingle: str) -> int:
+        value = self._hashes.get(shingle)
+        if value is None:
+            digest = hashlib.blake2b(shingle.encode(), digest_size=8).digest()
+            value = self._hashes[shingle] = int.from_bytes(digest, "little")
+        return value
+
+    def signature(self, grams: set[str]) -> tuple[int, ...]:
+        lanes = [_EMPTY] * NUM_LANES
+        for value in map(self._hash, grams):
+            lane = value % NUM_LANES
+            if value < lanes[lane]:
+                lanes[lane] = value
+        dense = lanes[:]
+        for lane, value in enumerate(lanes):
+            if value == _EMPTY:
+                distance = 1
+                while lanes[(lane + distance) % NUM_LANES] == _EMPTY:
+                    distance += 1
+                borrowed = lanes[(lane + distance) % NUM_LANES]
+                dense[lane] = borrowed + distance * _EMPTY
+        return tuple(dense)
+
+
+def find_duplicate_clusters(
+    cases: list[dict],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[DuplicateCluster]:
+    """
+    Group near-duplicate cases that expect the same outcome.
+
+    Args:
+        cases: Golden cases, in golden order
+        threshold: Minimum estimated Jaccard similarity of inputs
+
+    Returns:
+        Clusters with two or more members
+    """
+    hasher = _MinHasher()
+    ids: list[str] = []
+    signatures: list[str] = []
+    lane_sets: list[frozenset[int]] = []
+    outcome_groups: dict[str, int] = {}
+    buckets: dict[tuple, list[int]] = {}
+
+    # Inputs that differ only in keys/numbers share one MinHash
+    by_text: dict[str, tuple[tuple[int, ...], frozenset[int]]] = {}
+
+    for case in cases:
+        normalized = normalize_input(str(case.get("input") or ""))
+        if not normalized or "id" not in case:
+            continue
+        index = len(ids)
+        ids.append(case["id"])
+        signature = outcome_signature(case)
+        signatures.append(signature)
+        group = outcome_groups.setdefault(signature, len(outcome_groups))
+
+        entry = by_text.get(normalized)
+        if entry is None:
+            minhash = hasher.signature(shingles(normalized))
+            entry = by_text[normalized] = (minhash, frozenset(minhash))
+        minhash, lanes = entry
+        lane_sets.append(lanes)
+        for start in range(0, NUM_LANES, BAND_ROWS):
+            key = (group, start, minhash[start : start + BAND_ROWS])
+            buckets.setdefault(key, []).append(index)
+
+    # Union-find over verified candidate pairs
+    parent = list(range(len(ids)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    min_shared = threshold * NUM_LANES
+    for members in buckets.values():
+        # Compare against the bucket's first member only: linear per bucket,
+        # and the other bands pick up links this misses
+        anchor = members[0]
+        for other in members[1:]:
+            root_a, root_b = find(anchor), find(other)
+            if (
+                root_a != root_b
+                and len(lane_sets[anchor] & lane_sets[other]) >= min_shared
+            ):
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    groups: dict[int, list[int]] = {}
+    for index in range(len(ids)):
+        groups.setdefault(find(index), []).append(index)
+
+    return [
+        DuplicateCluster(
+            representative=ids[members[0]],
+            members=[ids[i] for i in members],
+            signature=signatures[members[0]],
+        )
+        for members in groups.values()
+        if len(members) > 1
+    ]
+
+
+def redundant_case_ids(
+    cases: list[dict] | None = None,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> set[str]:
+    """IDs that --dedupe skips (every cluster member but its representative)."""
+    if cases is None:
+        cases = list(load_golden_cases().values())
+    return {
+        test_id
+        for cluster in find_duplicate_clusters(cases, threshold)
+        for test_id in cluster.redundant
+    }
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Find near-duplicate golden cases with the same expected outcome",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Minimum input similarity (default: {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print clusters as JSON",
+    )
+    args = parser.parse_args()
+
+    cases = load_golden_cases()
+    clusters = find_duplicate_clusters(list(cases.values()), args.threshold)
+
+    if args.json:
+        print(json.dumps([c.to_dict() for c in clusters], indent=2))
+        return
+
+    if not clusters:
+        print(f"No near-duplicates among {len(cases)} cases")
+        return
+
+    for cluster in clusters:
+        print(f"{cluster.representative} (runs with --dedupe):")
+        for test_id in cluster.members:
+            print(f"  {test_id}: {cases[test_id]['input']}")
+    redundant = sum(len(c.redundant) for c in clusters)
+    print(f"\n{redundant} of {len(cases)} cases are skipped by --dedupe")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Golden routing cases (routing_golden.yaml) as plain data.
+
+Shared by the tools that reason about the golden set (watch mode, cost
+estimates, smoke selection, deduplication, tournaments, span analysis)
+without importing any of their CLIs.
+"""
+
+from pathlib import Path
+
+import yaml
+
+TESTS_DIR = Path(__file__).parent
+GOLDEN_FILE = TESTS_DIR / "routing_golden.yaml"
+
+
+def load_golden_cases(golden_file: Path = GOLDEN_FILE) -> dict[str, dict]:
+    """Load runnable golden cases keyed by ID (skipped cases are left out)."""
+    with open(golden_file) as f:
+        data = yaml.safe_load(f) or {}
+    return {
+        case["id"]: case
+        for case in data.get("tests", [])
+        if "id" in case and not case.get("skip")
+    }
+
+
+def case_skills(case: dict) -> set[str]:
+    """Collect every skill a golden case refers to."""
+    skills = {case.get("expected_skill"), case.get("not_skill")}
+    skills.update(case.get("disambiguation_options") or [])
+    skills.update(case.get("alternate_skills") or [])
+    skills.update(step.get("skill") for step in case.get("workflow") or [])
+    skills.discard(None)
+    return skills
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""Run the routing golden set across several models and compare them.
+
+Each model gets its own pytest run (and run ID), all started concurrently
+and recording into the same results store. The runs share one spend limit:
+every case checks the summed cost of the whole matrix before it starts.
+
+The report compares models per case, per expected skill, and on cost and
+latency, and recommends a fast and a production model for
+RemediationEngine based on the measured accuracy.
+
+Usage:
+    # Compare haiku, sonnet and opus with a $10 cap
+    python matrix_runner.py --models haiku,sonnet,opus --budget 10
+
+    # Only some cases, 2 workers per model, JSON report
+    python matrix_runner.py --models haiku,sonnet --id TC001,TC012 \\
+        --parallel 2 --output matrix.json
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+# Add tests directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from results_store import RESULTS_DB_ENV_VAR, CaseRecord, ResultsStore
+from test_runner import TestRunner, TestSuiteResult
+
+logger = logging.getLogger(__name__)
+
+TESTS_DIR = Path(__file__).parent
+
+# A fast model may trail the most accurate one by this many points
+FAST_MODEL_ACCURACY_TOLERANCE = 5.0
+
+
+@dataclass
+class ModelSummary:
+    """Aggregate results for one model."""
+
+    model: str
+    run_id: str
+    passed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    total_cost_usd: float = 0.0
+    p50_wall_ms: float = 0.0
+    p95_wall_ms: float = 0.0
+    mean_duration_ms: float = 0.0
+    error: str | None = None
+
+    @property
+    def executed(self) -> int:
+        """Number of cases that ran to a verdict."""
+        return self.passed + self.failed
+
+    @property
+    def accuracy(self) -> float:
+        """Pass rate as a percentage."""
+        return (self.passed / self.executed * 100) if self.executed else 0.0
+
+    @property
+    def cost_per_case(self) -> float:
+        """Mean API cost per executed case."""
+        return self.total_cost_usd / self.executed if self.executed else 0.0
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        data = asdict(self)
+        data["accuracy"] = round(self.accuracy, 2)
+        data["cost_per_case"] = round(self.cost_per_case, 6)
+        return data
+
+
+@dataclass
+class MatrixReport:
+    """Comparison of routing results across models."""
+
+    matrix_id: str
+    models: list[str]
+    summaries: dict[str, ModelSummary] = field(default_factory=dict)
+    # test ID -> model -> {"passed", "expected_skill", "actual_skill"}
+    cases: dict[str, dict[str, dict]] = field(default_factory=dict)
+    # expected skill -> model -> [passed, executed]
+    skills: dict[str, dict[str, list[int]]] = field(default_factory=dict)
+    recommended_fast_model: str | None = None
+    recommended_production_model: str | None = None
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "matrix_id": self.matrix_id,
+            "models": self.models,
+            "summaries": {m: s.to_dict() for m, s in self.summaries.items()},
+            "cases": self.cases,
+            "skills": self.skills,
+            "recommended_fast_model": self.recommended_fast_model,
+            "recommended_production_model": self.recommended_production_model,
+        }
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def build_report(
+    matrix_id: str,
+    records_by_model: dict[str, list[CaseRecord]],
+    suite_results: dict[str, TestSuiteResult] | None = None,
+) -> MatrixReport:
+    """
+    Build the comparison report from recorded case results.
+
+    Args:
+        matrix_id: Matrix run ID
+        records_by_model: Results store records for each model's run
+        suite_results: Parsed pytest results per model (for skips/errors)
+
+    Returns:
+        MatrixReport with summaries, per-case/per-skill tables and
+        model recommendations
+    """
+    suite_results = suite_results or {}
+    report = MatrixReport(matrix_id=matrix_id, models=list(records_by_model))
+
+    for model, records in records_by_model.items():
+        suite = suite_results.get(model)
+        # Coalesced cases waited on another session; they are not latency samples
+        sampled = [r for r in records if not r.coalesced]
+        wall_times = [r.wall_ms for r in sampled]
+        summary = ModelSummary(
+            model=model,
+            run_id=records[0].run_id if records else "",
+            passed=sum(1 for r in records if r.passed),
+            failed=sum(1 for r in records if not r.passed),
+            skipped=len(suite.skipped) if suite else 0,
+            total_cost_usd=sum(r.cost_usd for r in records),
+            p50_wall_ms=_percentile(wall_times, 50),
+            p95_wall_ms=_percentile(wall_times, 95),
+            mean_duration_ms=(
+                statistics.mean(r.duration_ms for r in sampled) if sampled else 0.0
+            ),
+            error=suite.error if suite else None,
+        )
+        report.summaries[model] = summary
+
+        for record in records:
+            report.cases.setdefault(record.test_id, {})[model] = {
+                "passed": record.passed,
+                "expected_skill": record.expected_skill,
+                "actual_skill": record.actual_skill,
+            }
+            counts = report.skills.setdefault(record.expected_skill, {}).setdefault(
+                model, [0, 0]
+            )
+            counts[0] += int(record.passed)
+            counts[1] += 1
+
+    _recommend_models(report)
+    return report
+
+
+def _recommend_models(report: MatrixReport) -> None:
+    """Pick the most accurate model for production, cheapest close one for fast."""
+    candidates = [s for s in report.summaries.values() if s.executed and not s.error]
+    if not candidates:
+        return
+
+    production = max(candidates, key=lambda s: (s.accuracy, -s.cost_per_case))
+    report.recommended_production_model = production.model
+
+    close_enough = [
+        s
+        for s in candidates
+        if s.accuracy >= production.accuracy - FAST_MODEL_ACCURACY_TOLERANCE
+    ]
+    fast = min(close_enough, key=lambda s: (s.p50_wall_ms, s.cost_per_case))
+    report.recommended_fast_model = fast.model
+
+
+def format_report(report: MatrixReport) -> str:
+    """Render the report as markdown tables."""
+    models = report.models
+    lines = [f"# Routing model matrix ({report.matrix_id})", ""]
+
+    lines += [
+        "## Models",
+        "",
+        "| Model | Accuracy | Passed | Failed | Skipped | Cost | Cost/case "
+        "| p50 wall | p95 wall |",
+        "|---|---|---|---|---|---|---|---|---|",
+    ]
+    for model in models:
+        s = report.summaries[model]
+        lines.append(
+            f"| {model} | {s.accuracy:.1f}% | {s.passed} | {s.failed} | {s.skipped} "
+            f"| ${s.total_cost_usd:.4f} | ${s.cost_per_case:.4f} "
+            f"| {s.p50_wall_ms / 1000:.1f}s | {s.p95_wall_ms / 1000:.1f}s |"
+        )
+        if s.error:
+            lines.append(f"|  | error: {s.error} |")
+
+    lines += ["", "## By expected skill", ""]
+    lines.append("| Skill | " + " | ".join(models) + " |")
+    lines.append("|---|" + "---|" * len(models))
+    for skill in sorted(report.skills):
+        cells = []
+        for model in models:
+            passed, executed = report.skills[skill].get(model, [0, 0])
+            cells.append(f"{passed}/{executed}" if executed else "-")
+        lines.append(f"| {skill} | " + " | ".join(cells) + " |")
+
+    # Only list cases where the models disagree or something failed
+    lines += ["", "## Cases with failures or disagreement", ""]
+    lines.append("| Test | " + " | ".join(models) + " |")
+    lines.append("|---|" + "---|" * len(models))
+    for test_id in sorted(report.cases):
+        results = report.cases[test_id]
+        if all(r["passed"] for r in results.values()) and len(results) == len(models):
+            continue
+        cells = []
+        for model in models:
+            result = results.get(model)
+            if result is None:
+                cells.append("-")
+            elif result["passed"]:
+                cells.append("pass")
+            elif result["actual_skill"] != result["expected_skill"]:
+                cells.append(f"FAIL -> {result['actual_skill']}")
+            else:
+                cells.append("FAIL")
+        lines.append(f"| {test_id} | " + " | ".join(cells) + " |")
+
+    lines += [
+        "",
+        "## Recommendation",
+        "",
+        f"- fast_model: {report.recommended_fast_model or 'n/a'}",
+        f"- production_model: {report.recommended_production_model or 'n/a'}",
+    ]
+    return "\n".join(lines)
+
+
+class MatrixRunner:
+    """Runs the golden set for several models concurrently."""
+
+    def __init__(
+        self,
+        models: list[str],
+        parallel: int = 1,
+        budget_usd: float | None = None,
+        timeout: int = 2400,
+        otel: bool = False,
+        db_path: Path | None = None,
+    ):
+        """Initialize matrix runner.
+
+        Args:
+            models: Models to compare (e.g., ["haiku", "sonnet", "opus"])
+            parallel: xdist workers per model
+            budget_usd: Spend limit across all models (None for no limit)
+            timeout: Timeout in seconds for each model's suite
+            otel: Whether to enable OpenTelemetry export in each run
+            db_path: Results store location. If None, uses the default.
+        """
+        self.models = models
+        self.parallel = parallel
+        self.budget_usd = budget_usd
+        self.timeout = timeout
+        self.otel = otel
+        self.store = ResultsStore(db_path)
+        self.matrix_id = f"matrix-{uuid.uuid4().hex[:8]}"
+
+    def _run_model(
+        self, model: str, test_ids: list[str] | None
+    ) -> tuple[str, TestSuiteResult]:
+        env = {
+            "ROUTING_RUN_ID": f"{self.matrix_id}-{model}",
+            "ROUTING_BUDGET_SCOPE": self.matrix_id,
+            RESULTS_DB_ENV_VAR: str(self.store.db_path),
+        }
+        if self.budget_usd is not None:
+            env["ROUTING_BUDGET_USD"] = str(self.budget_usd)
+
+        runner = TestRunner(
+            otel=self.otel,
+            progress_file=TESTS_DIR / f".routing_progress.{model}.json",
+        )
+        logger.info(f"[{model}] starting run {env['ROUTING_RUN_ID']}")
+        result = runner.run_tests(
+            test_ids=test_ids,
+            model=model,
+            parallel=self.parallel,
+            timeout=self.timeout,
+            env=env,
+        )
+        logger.info(f"[{model}] done: {result.pass_rate:.1f}% passed")
+        return model, result
+
+    def run(self, test_ids: list[str] | None = None) -> MatrixReport:
+        """
+        Run every model and build the comparison report.
+
+        Args:
+            test_ids: Test IDs to run. If None, runs the full golden set.
+
+        Returns:
+            MatrixReport for this matrix run
+        """
+        with ThreadPoolExecutor(max_workers=len(self.models)) as executor:
+            suite_results = dict(
+                executor.map(lambda m: self._run_model(m, test_ids), self.models)
+            )
+
+        records_by_model = {
+            model: self.store.run_results(f"{self.matrix_id}-{model}")
+            for model in self.models
+        }
+        return build_report(self.matrix_id, records_by_model, suite_results)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Compare routing accuracy, cost and latency across models",
+    )
+    parser.add_argument(
+        "--models",
+        default="haiku,sonnet,opus",
+        help="Comma-separated models to compare (default: haiku,sonnet,opus)",
+    )
+    parser.add_argument(
+        "--id",
+        help="Comma-separated test IDs to run (default: full golden set)",
+    )
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=1,
+        help="Parallel test workers per model (default: 1)",
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=None,
+        help="Total API spend limit in USD across all models",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=int,
+        default=2400,
+        help="Timeout in seconds for each model's suite (default: 2400)",
+    )
+    parser.add_argument(
+        "--otel",
+        action="store_true",
+        help="Enable OpenTelemetry export in each run",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Write the report as JSON to this file",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Enable verbose logging",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+    models = [m.strip() for m in args.models.split(",") if m.strip()]
+    test_ids = [t.strip() for t in args.id.split(",")] if args.id else None
+
+    runner = MatrixRunner(
+        models=models,
+        parallel=args.parallel,
+        budget_usd=args.budget,
+        timeout=args.timeout,
+        otel=args.otel,
+    )
+    report = runner.run(test_ids)
+
+    print(format_report(report))
+    if args.output:
+        args.output.write_text(json.dumps(report.to_dict(), indent=2))
+        print(f"\nReport written to {args.output}")
+
+    sys.exit(0 if all(not s.error for s in report.summaries.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,8 @@ OpenTelemetry instrumentation for routing tests.
 
 Exports metrics and traces to OTLP endpoints for observability.
 
-Resource Attributes (static, per-process):
+Resource Attributes (static, per-process; probed values are cached, see
+discover_resource_probes):
 - service.name, service.version, service.namespace
 - deployment.environment
 - host.name, os.type, os.version
@@ -12,49 +13,69 @@ Resource Attributes (static, per-process):
 - skill.version, golden_set.version
 
 Metrics exported:
-- routing_test_total: Counter with labels (category, result, expected_skill, actual_skill, model)
+- routing_test_total: Counter with labels (category, result, expected_skill, actual_skill, model);
+  skills outside the plugin are labeled "other"
 - routing_test_duration_seconds: Histogram of test durations
 - routing_test_cost_usd: Histogram of API costs per test
 - routing_accuracy_percent: Gauge of current accuracy percentage
+- routing_metric_series: Gauge of distinct label sets per instrument (label sets
+  beyond MAX_SERIES_PER_METRIC are recorded under otel.metric.overflow=true)
+- routing_telemetry_queue_depth, routing_telemetry_dropped_total: Test results
+  waiting for the recorder thread, and results dropped while its queue was full
+
+Histograms use explicit buckets (see _metric_views).
+
+Providers and exporters come from telemetry_runtime (shared with
+remediate_tests); a $TRACEPARENT from the launching process makes the suite
+span part of its trace.
+
+record_test_result only queues a result; a background recorder thread builds
+its span and metrics, so telemetry does not add to per-case latency.
+flush_records (called by shutdown) waits for the queue to drain.
 
 Traces exported:
-- routing_test_{id}: Span per test with comprehensive attributes
+- routing_test_{id}: Span per test with comprehensive attributes (prompt and
+  response payloads per payload_policy)
 - routing_test_session: Span for full test session
 """
 
 import hashlib
+import importlib.util
 import json
 import os
 import platform
+import queue
 import re
+import shutil
 import socket
 import subprocess
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from pathlib import Path
 
-# OpenTelemetry imports
-try:
-    import opentelemetry.version
-    from opentelemetry import metrics, trace
-    from opentelemetry.exporter.otlp.proto.http.metric_exporter import (
-        OTLPMetricExporter,
-    )
-    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
-    from opentelemetry.sdk.metrics import MeterProvider
-    from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
-    from opentelemetry.sdk.resources import Resource
-    from opentelemetry.sdk.trace import TracerProvider
-    from opentelemetry.sdk.trace.export import BatchSpanProcessor
-    from opentelemetry.semconv.resource import ResourceAttributes
-    from opentelemetry.trace import Status, StatusCode
-
-    OTEL_AVAILABLE = True
-except ImportError:
-    OTEL_AVAILABLE = False
-
-# Configuration
-OTLP_HTTP_ENDPOINT = os.getenv("OTLP_HTTP_ENDPOINT", "http://localhost:4318")
+import telemetry_runtime
+from payload_policy import (
+    CODE_BLOCK_CHARS,
+    MAX_CODE_BLOCKS,
+    PROMPT_CHARS,
+    RESPONSE_CHARS,
+    PayloadPolicy,
+)
+from telemetry_runtime import otlp_endpoint
+
+# OpenTelemetry is imported by init_telemetry (see _load_sdk), so runs
+# without --otel don't pay for the SDK and OTLP exporters. Until then every
+# recording function below is a no-op.
+OTEL_AVAILABLE = all(
+    importlib.util.find_spec(name) is not None
+    for name in ("opentelemetry.sdk", "opentelemetry.exporter.otlp.proto.http")
+)
+
+# Configuration (export destination is read when telemetry is initialized,
+# so conftest's --otlp-endpoint / --otlp-file take effect; see
+# telemetry_runtime.otlp_endpoint)
 SERVICE_NAME = "jira-assistant-routing-tests"
 SERVICE_NAMESPACE = "jira-assistant-skills"
 
@@ -65,6 +86,23 @@ PLUGIN_JSON = PLUGIN_DIR / "plugin.json"
 SKILL_MD = TESTS_DIR.parent / "SKILL.md"
 GOLDEN_YAML = TESTS_DIR / "routing_golden.yaml"
 
+# Discovered resource attributes: cached on disk, and passed to xdist
+# workers and child pytest runs through the environment
+RESOURCE_CACHE_FILE = TESTS_DIR / ".otel_resource_cache.json"
+RESOURCE_ENV_VAR = "ROUTING_OTEL_RESOURCE"
+
+# Test results waiting for the recorder thread (0 records them inline).
+# When the queue is full, record_test_result waits up to
+# RECORD_QUEUE_BLOCK_S for room, then drops the result and counts it.
+RECORD_QUEUE_SIZE_ENV_VAR = "ROUTING_OTEL_QUEUE_SIZE"
+DEFAULT_RECORD_QUEUE_SIZE = 1000
+RECORD_QUEUE_BLOCK_S = 0.05
+RECORD_FLUSH_TIMEOUT_S = 30.0
+
+# SDK names, bound by _load_sdk
+metrics = trace = Status = StatusCode = None
+View = ExplicitBucketHistogramAggregation = None
+
 # Global state
 _meter = None
 _tracer = None
@@ -92,11 +130,96 @@ _accuracy_gauge = None
 _tool_use_accuracy_gauge = None
 _accuracy_value = {"value": 0.0}
 _tool_use_accuracy_value = {"value": 0.0}
-
-
-def _get_git_info() -> dict:
-    """Get git commit SHA and branch."""
-    info = {"commit": "unknown", "branch": "unknown"}
+_concurrency_gauge = None
+_rate_limit_counter = None
+_concurrency_value = {"limit": 0, "in_flight": 0}
+_latency_histograms = {}
+_payload_policy = None
+_series: dict[str, set] = {}  # Instrument name -> label sets recorded
+_series_gauge = None
+_known_skills: set[str] | None = None
+_turns_histogram = None
+_tokens_histogram = None
+_record_queue: queue.Queue | None = None
+_record_thread: threading.Thread | None = None
+_record_stats = {"dropped": 0, "failed": 0}
+_dropped_counter = None
+_queue_gauge = None
+_skill_score_gauges = {}
+_skill_score_values: dict[str, tuple] = {}  # Skill -> (labels, scores)
+
+# Per-case latency parts: breakdown key -> (histogram name, description)
+LATENCY_PARTS = {
+    "duration_api_ms": (
+        "routing_claude_api_duration_seconds",
+        "Time the Claude CLI spent waiting on the API",
+    ),
+    "cli_overhead_ms": (
+        "routing_claude_cli_overhead_seconds",
+        "Claude CLI time not spent on the API (startup, local tools)",
+    ),
+    "queue_ms": (
+        "routing_harness_queue_seconds",
+        "Waiting for a concurrency slot, rate-limit backoff or coalescing lock",
+    ),
+    "spawn_ms": (
+        "routing_harness_spawn_seconds",
+        "Starting the Claude CLI process",
+    ),
+    "wait_ms": (
+        "routing_harness_wait_seconds",
+        "Claude CLI process running until exit, as seen by the harness",
+    ),
+    "parse_ms": (
+        "routing_harness_parse_seconds",
+        "Decoding the Claude CLI JSON output",
+    ),
+    "inference_ms": (
+        "routing_harness_inference_seconds",
+        "Skill detection (debug log scan) and response checks",
+    ),
+}
+
+# Usage fields recorded on the token histogram, by token type
+TOKEN_TYPES = {
+    "input_tokens": "input",
+    "output_tokens": "output",
+    "cache_read_input_tokens": "cache_read",
+    "cache_creation_input_tokens": "cache_creation",
+}
+
+# Labels kept on routing_test_total. routing_correct, clarification_asked
+# and error_type stay on the test spans (spanmetrics serves error panels).
+TEST_COUNTER_LABELS = {"category", "result", "expected_skill", "actual_skill", "model"}
+
+# Histogram bucket boundaries
+DURATION_BUCKETS_S = [1, 2, 5, 10, 15, 20, 30, 45, 60, 90, 120, 180, 300]
+HARNESS_BUCKETS_S = [0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60]
+COST_BUCKETS_USD = [0.001, 0.0025, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1]
+TURN_BUCKETS = [1, 2, 3, 5, 8, 13, 20]
+TOKEN_BUCKETS = [100, 500, 1000, 5000, 10_000, 25_000, 50_000, 100_000, 200_000]
+
+# Latency parts on the scale of whole test durations (the rest are
+# harness overheads, usually milliseconds)
+_SLOW_LATENCY_PARTS = {"duration_api_ms", "cli_overhead_ms", "wait_ms"}
+
+# Distinct label sets per instrument before new ones fold into one overflow
+# series (the OpenTelemetry otel.metric.overflow convention)
+MAX_SERIES_PER_METRIC = 500
+OVERFLOW_LABELS = {"otel.metric.overflow": "true"}
+
+# Skill label value for skills outside the plugin
+OTHER_SKILL = "other"
+
+# Expected/actual values that are outcomes rather than skills, kept as labels
+SKILL_OUTCOME_LABELS = {"none", "asked", "disambiguation", "ask_for_input"}
+
+# Per-skill scores exported once per suite (routing_skill_<score>)
+SKILL_SCORES = ("precision", "recall", "f1")
+
+
+def _get_git_commit() -> str:
+    """Get the short git commit SHA."""
     try:
         result = subprocess.run(
             ["git", "rev-parse", "HEAD"],
@@ -106,8 +229,15 @@ def _get_git_info() -> dict:
             cwd=PLUGIN_DIR,
         )
         if result.returncode == 0:
-            info["commit"] = result.stdout.strip()[:12]
+            return result.stdout.strip()[:12]
+    except Exception:
+        pass
+    return "unknown"
+
 
+def _get_git_branch() -> str:
+    """Get the current git branch ("detached" without one)."""
+    try:
         result = subprocess.run(
             ["git", "branch", "--show-current"],
             capture_output=True,
@@ -116,10 +246,10 @@ def _get_git_info() -> dict:
             cwd=PLUGIN_DIR,
         )
         if result.returncode == 0:
-            info["branch"] = result.stdout.strip() or "detached"
+            return result.stdout.strip() or "detached"
     except Exception:
         pass
-    return info
+    return "unknown"
 
 
 def _get_plugin_version() -> str:
@@ -172,38 +302,146 @@ def _get_claude_version() -> str:
     return "unknown"
 
 
+# Resource probes: attribute -> function. These run git and the Claude CLI
+# or parse files, so their results are cached (see discover_resource_probes).
+_RESOURCE_PROBES = {
+    "service.version": _get_plugin_version,
+    "vcs.commit.sha": _get_git_commit,
+    "vcs.branch": _get_git_branch,
+    "skill.version": _get_skill_version,
+    "golden_set.version": _get_golden_set_version,
+    "claude.cli.version": _get_claude_version,
+}
+
+
+def _git_ref_stamp() -> str:
+    """HEAD and the modification time of the ref it points to."""
+    git_dir = PLUGIN_DIR / ".git"
+    try:
+        if git_dir.is_file():  # Worktree or submodule: "gitdir: <path>"
+            git_dir = (
+                PLUGIN_DIR / git_dir.read_text().split(":", 1)[1].strip()
+            ).resolve()
+        head = (git_dir / "HEAD").read_text().strip()
+    except (OSError, IndexError):
+        return "no-git"
+
+    common_dir = git_dir
+    if (git_dir / "commondir").exists():
+        common_dir = (git_dir / (git_dir / "commondir").read_text().strip()).resolve()
+
+    stamp = head
+    if head.startswith("ref: "):
+        for ref_file in (common_dir / head[5:], common_dir / "packed-refs"):
+            if ref_file.exists():
+                stamp += f"@{ref_file.stat().st_mtime_ns}"
+                break
+    return stamp
+
+
+def _resource_cache_key() -> str:
+    """Fingerprint of everything the resource probes read."""
+    claude = shutil.which("claude")
+    parts = [
+        _git_ref_stamp(),
+        f"{claude}@{os.stat(claude).st_mtime_ns if claude else 0}",
+    ]
+    for path in (PLUGIN_JSON, SKILL_MD, GOLDEN_YAML):
+        try:
+            parts.append(hashlib.sha256(path.read_bytes()).hexdigest())
+        except OSError:
+            parts.append("missing")
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:16]
+
+
+def _read_resource_cache(key: str) -> dict | None:
+    """Cached probe results for a key, from the environment or the cache file."""
+    for source in (
+        lambda: os.environ.get(RESOURCE_ENV_VAR),
+        lambda: RESOURCE_CACHE_FILE.read_text(),
+    ):
+        try:
+            cached = json.loads(source() or "{}")
+        except (OSError, ValueError):
+            continue
+        if cached.get("key") == key and set(cached.get("probes", {})) == set(
+            _RESOURCE_PROBES
+        ):
+            return cached["probes"]
+    return None
+
+
+def discover_resource_probes() -> dict:
+    """
+    Run the resource probes, or reuse their results when nothing changed.
+
+    Results are keyed by the git HEAD ref and its modification time, the
+    Claude CLI binary and its modification time, and hashes of plugin.json,
+    SKILL.md and the golden set. They are reused from ``ROUTING_OTEL_RESOURCE``
+    (set by a parent process) or the cache file when the key matches;
+    otherwise the probes run concurrently and the cache file is rewritten.
+    Either way the result is exported to ``ROUTING_OTEL_RESOURCE`` so xdist
+    workers and child pytest runs inherit it.
+
+    Returns:
+        Resource attribute -> discovered value
+    """
+    key = _resource_cache_key()
+    probes = _read_resource_cache(key)
+    if probes is None:
+        with ThreadPoolExecutor(max_workers=len(_RESOURCE_PROBES)) as pool:
+            futures = {
+                attr: pool.submit(probe) for attr, probe in _RESOURCE_PROBES.items()
+            }
+            probes = {attr: future.result() for attr, future in futures.items()}
+        try:
+            tmp = RESOURCE_CACHE_FILE.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"key": key, "probes": probes}))
+            os.replace(tmp, RESOURCE_CACHE_FILE)
+        except OSError:
+            pass  # Read-only checkout: probe again next time
+
+    os.environ[RESOURCE_ENV_VAR] = json.dumps({"key": key, "probes": probes})
+    return probes
+
+
+def _sdk_version() -> str:
+    """Installed OpenTelemetry API version ("N/A" without it)."""
+    if not OTEL_AVAILABLE:
+        return "N/A"
+    import opentelemetry.version
+
+    return opentelemetry.version.__version__
+
+
 def _build_resource_attributes() -> dict:
-    """Build comprehensive resource attributes."""
-    git_info = _get_git_info()
+    """Build comprehensive resource attributes (semantic convention keys)."""
+    probes = discover_resource_probes()
 
     attrs = {
         # Service identification
-        ResourceAttributes.SERVICE_NAME: SERVICE_NAME,
-        ResourceAttributes.SERVICE_VERSION: _get_plugin_version(),
-        ResourceAttributes.SERVICE_NAMESPACE: SERVICE_NAMESPACE,
+        "service.name": SERVICE_NAME,
+        "service.version": probes["service.version"],
+        "service.namespace": SERVICE_NAMESPACE,
         # Deployment
-        ResourceAttributes.DEPLOYMENT_ENVIRONMENT: os.getenv(
-            "DEPLOYMENT_ENV", "development"
-        ),
+        "deployment.environment": os.getenv("DEPLOYMENT_ENV", "development"),
         # Host
-        ResourceAttributes.HOST_NAME: socket.gethostname(),
-        ResourceAttributes.OS_TYPE: platform.system(),
-        ResourceAttributes.OS_VERSION: platform.release(),
+        "host.name": socket.gethostname(),
+        "os.type": platform.system(),
+        "os.version": platform.release(),
         # Runtime
         "python.version": platform.python_version(),
         "python.implementation": platform.python_implementation(),
         # OpenTelemetry SDK
-        "otel.sdk.version": opentelemetry.version.__version__
-        if OTEL_AVAILABLE
-        else "N/A",
+        "otel.sdk.version": _sdk_version(),
         # Version Control
-        "vcs.commit.sha": git_info["commit"],
-        "vcs.branch": git_info["branch"],
+        "vcs.commit.sha": probes["vcs.commit.sha"],
+        "vcs.branch": probes["vcs.branch"],
         "vcs.repository": "jira-assistant-skills",
         # Skill/Test versions
-        "skill.version": _get_skill_version(),
-        "golden_set.version": _get_golden_set_version(),
-        "claude.cli.version": _get_claude_version(),
+        "skill.version": probes["skill.version"],
+        "golden_set.version": probes["golden_set.version"],
+        "claude.cli.version": probes["claude.cli.version"],
         # Test framework
         "test.framework": "pytest",
         "test.type": "routing",
@@ -220,6 +458,81 @@ def get_resource_attributes() -> dict:
     return _resource_attributes
 
 
+def _load_sdk() -> bool:
+    """Import the OpenTelemetry API and metric view types (once)."""
+    global metrics, trace, Status, StatusCode
+    global View, ExplicitBucketHistogramAggregation
+
+    if trace is not None:
+        return True
+
+    try:
+        from opentelemetry import metrics, trace
+        from opentelemetry.sdk.metrics.view import (
+            ExplicitBucketHistogramAggregation,
+            View,
+        )
+        from opentelemetry.trace import Status, StatusCode
+    except ImportError:
+        return False
+    return True
+
+
+def _metric_views() -> list:
+    """Views: counter labels and explicit histogram buckets."""
+    histograms = {
+        "routing_test_duration_seconds": DURATION_BUCKETS_S,
+        "routing_test_cost_usd": COST_BUCKETS_USD,
+        "routing_claude_turns": TURN_BUCKETS,
+        "routing_claude_tokens": TOKEN_BUCKETS,
+    }
+    for part, (name, _) in LATENCY_PARTS.items():
+        histograms[name] = (
+            DURATION_BUCKETS_S if part in _SLOW_LATENCY_PARTS else HARNESS_BUCKETS_S
+        )
+    return [
+        View(
+            instrument_name="routing_test_total",
+            attribute_keys=TEST_COUNTER_LABELS | set(OVERFLOW_LABELS),
+        ),
+        *(
+            View(
+                instrument_name=name,
+                aggregation=ExplicitBucketHistogramAggregation(boundaries),
+            )
+            for name, boundaries in histograms.items()
+        ),
+    ]
+
+
+def _skill_label(skill: str) -> str:
+    """A skill as a metric label: an outcome, a plugin skill, or "other"."""
+    global _known_skills
+    if _known_skills is None:
+        _known_skills = {
+            path.parent.name for path in (PLUGIN_DIR / "skills").glob("*/SKILL.md")
+        }
+    if skill in SKILL_OUTCOME_LABELS or skill in _known_skills:
+        return skill
+    return OTHER_SKILL
+
+
+def _bounded(instrument: str, labels: dict) -> dict:
+    """
+    Labels for a recording, capped per instrument.
+
+    Once an instrument has MAX_SERIES_PER_METRIC distinct label sets, new
+    ones are recorded under OVERFLOW_LABELS instead.
+    """
+    series = _series.setdefault(instrument, set())
+    key = tuple(sorted(labels.items()))
+    if key not in series:
+        if len(series) >= MAX_SERIES_PER_METRIC:
+            return OVERFLOW_LABELS
+        series.add(key)
+    return labels
+
+
 def init_telemetry() -> bool:
     """
     Initialize OpenTelemetry metrics and tracing with rich resource attributes.
@@ -229,20 +542,24 @@ def init_telemetry() -> bool:
     """
     global _meter, _tracer, _metrics_initialized
     global _test_counter, _duration_histogram, _cost_histogram, _accuracy_gauge
+    global _concurrency_gauge, _rate_limit_counter
+    global _turns_histogram, _tokens_histogram, _payload_policy, _series_gauge
+    global _dropped_counter, _queue_gauge
 
-    if not OTEL_AVAILABLE:
+    if _metrics_initialized:
+        return True
+
+    if not OTEL_AVAILABLE or not _load_sdk():
         print(
             "OpenTelemetry not available. Install with: pip install -r requirements-otel.txt"
         )
         return False
 
-    if _metrics_initialized:
-        return True
-
     try:
         # Build resource with comprehensive attributes
         resource_attrs = get_resource_attributes()
-        resource = Resource.create(resource_attrs)
+        plugin_version = resource_attrs["service.version"]
+        _payload_policy = PayloadPolicy.from_env()
 
         # Log resource attributes for debugging
         print("OpenTelemetry Resource Attributes:")
@@ -255,26 +572,11 @@ def init_telemetry() -> bool:
         ]:
             print(f"  {key}: {resource_attrs.get(key, 'N/A')}")
 
-        # Setup metrics
-        metric_exporter = OTLPMetricExporter(
-            endpoint=f"{OTLP_HTTP_ENDPOINT}/v1/metrics"
-        )
-        metric_reader = PeriodicExportingMetricReader(
-            metric_exporter,
-            export_interval_millis=5000,  # Export every 5 seconds
-        )
-        meter_provider = MeterProvider(
-            resource=resource, metric_readers=[metric_reader]
-        )
-        metrics.set_meter_provider(meter_provider)
-        _meter = metrics.get_meter("routing_tests", _get_plugin_version())
-
-        # Setup tracing
-        trace_exporter = OTLPSpanExporter(endpoint=f"{OTLP_HTTP_ENDPOINT}/v1/traces")
-        tracer_provider = TracerProvider(resource=resource)
-        tracer_provider.add_span_processor(BatchSpanProcessor(trace_exporter))
-        trace.set_tracer_provider(tracer_provider)
-        _tracer = trace.get_tracer("routing_tests", _get_plugin_version())
+        # Providers and exporters (OTLP/HTTP or the local spool), shared
+        # with anything else in this process that uses telemetry_runtime
+        destination = telemetry_runtime.start(resource_attrs, views=_metric_views())
+        _meter = telemetry_runtime.get_meter("routing_tests", plugin_version)
+        _tracer = telemetry_runtime.get_tracer("routing_tests", plugin_version)
 
         # Create metric instruments with descriptive units
         _test_counter = _meter.create_counter(
@@ -315,8 +617,85 @@ def init_telemetry() -> bool:
             ],
         )
 
+        _concurrency_gauge = _meter.create_observable_gauge(
+            name="routing_concurrency_sessions",
+            description="Adaptive Claude session concurrency (limit and in flight)",
+            unit="{session}",
+            callbacks=[
+                lambda options: [
+                    metrics.Observation(value, {"state": state})
+                    for state, value in _concurrency_value.items()
+                ]
+            ],
+        )
+
+        _rate_limit_counter = _meter.create_counter(
+            name="routing_rate_limited_total",
+            description="Claude sessions rejected by rate limiting or overload",
+            unit="{session}",
+        )
+
+        for part, (name, description) in LATENCY_PARTS.items():
+            _latency_histograms[part] = _meter.create_histogram(
+                name=name, description=description, unit="s"
+            )
+
+        _turns_histogram = _meter.create_histogram(
+            name="routing_claude_turns",
+            description="Agent turns per Claude session",
+            unit="{turn}",
+        )
+
+        _tokens_histogram = _meter.create_histogram(
+            name="routing_claude_tokens",
+            description="Tokens per Claude session, by type (input, output, cache)",
+            unit="{token}",
+        )
+
+        for score in SKILL_SCORES:
+            _skill_score_gauges[score] = _meter.create_observable_gauge(
+                name=f"routing_skill_{score}",
+                description=f"Per-skill routing {score} over the suite "
+                "(from the confusion matrix)",
+                unit="1",
+                callbacks=[_skill_score_callback(score)],
+            )
+
+        _series_gauge = _meter.create_observable_gauge(
+            name="routing_metric_series",
+            description="Distinct label sets recorded per instrument by this process",
+            unit="{series}",
+            callbacks=[
+                lambda options: [
+                    metrics.Observation(len(series), {"metric": name})
+                    for name, series in list(_series.items())
+                ]
+            ],
+        )
+
+        _queue_gauge = _meter.create_observable_gauge(
+            name="routing_telemetry_queue_depth",
+            description="Test results waiting for the telemetry recorder thread",
+            unit="{result}",
+            callbacks=[
+                lambda options: [
+                    metrics.Observation(
+                        _record_queue.qsize() if _record_queue else 0, {}
+                    )
+                ]
+            ],
+        )
+
+        _dropped_counter = _meter.create_counter(
+            name="routing_telemetry_dropped_total",
+            description="Test results dropped because the recorder queue was full",
+            unit="{result}",
+        )
+
+        _start_recorder()
+
         _metrics_initialized = True
-        print(f"OpenTelemetry initialized. Exporting to {OTLP_HTTP_ENDPOINT}")
+        print(f"OpenTelemetry initialized. Exporting to {destination}")
         return True
 
     except Exception as e:
@@ -353,6 +732,81 @@ def update_tool_use_accuracy(matched: int, total: int):
         _tool_use_accuracy_value["value"] = (matched / total) * 100
 
 
+def _start_recorder():
+    """Start the recorder thread (unless the queue size is 0)."""
+    global _record_queue, _record_thread
+    size = int(os.getenv(RECORD_QUEUE_SIZE_ENV_VAR, DEFAULT_RECORD_QUEUE_SIZE))
+    if size <= 0 or _record_thread is not None:
+        return
+    _record_queue = queue.Queue(maxsize=size)
+    _record_thread = threading.Thread(
+        target=_recorder_loop,
+        args=(_record_queue,),
+        name="otel-recorder",
+        daemon=True,
+    )
+    _record_thread.start()
+
+
+def _recorder_loop(records: queue.Queue):
+    """Build spans and metrics for queued results until a None sentinel."""
+    while True:
+        case = records.get()
+        try:
+            if case is None:
+                return
+            _record_test_result(**case)
+        except Exception as e:
+            _record_stats["failed"] += 1
+            print(f"Warning: could not record telemetry for {case['test_id']}: {e}")
+        finally:
+            records.task_done()
+
+
+def flush_records(timeout: float = RECORD_FLUSH_TIMEOUT_S) -> bool:
+    """
+    Wait until every queued test result has been recorded.
+
+    Args:
+        timeout: Seconds to wait at most
+
+    Returns:
+        True if the queue drained, False on timeout
+    """
+    records = _record_queue
+    if records is None:
+        return True
+
+    deadline = time.monotonic() + timeout
+    with records.all_tasks_done:
+        while records.unfinished_tasks:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                print(
+                    f"Warning: {records.unfinished_tasks} telemetry records "
+                    f"still queued after {timeout:.0f}s"
+                )
+                return False
+            records.all_tasks_done.wait(remaining)
+    return True
+
+
+def _stop_recorder():
+    """Drain the queue and stop the recorder thread."""
+    global _record_queue, _record_thread
+    if _record_thread is None:
+        return
+    if flush_records():
+        _record_queue.put(None)
+        _record_thread.join(timeout=RECORD_FLUSH_TIMEOUT_S)
+    _record_queue = _record_thread = None
+    if _record_stats["dropped"]:
+        print(
+            f"Warning: dropped {_record_stats['dropped']} telemetry records "
+            f"(recorder queue full; see ${RECORD_QUEUE_SIZE_ENV_VAR})"
+        )
+
+
 def record_test_result(
     test_id: str,
     category: str,
@@ -376,6 +830,7 @@ def record_test_result(
     tool_use_accuracy: float | None = None,
     tool_use_matched: int | None = None,
     tool_use_total: int | None = None,
+    latency: dict | None = None,
 ):
     """
     Record a single test result with comprehensive context.
@@ -402,10 +857,66 @@ def record_test_result(
         tool_use_accuracy: Accuracy of expected command matching (0.0-1.0)
         tool_use_matched: Number of expected command patterns matched
         tool_use_total: Total number of expected command patterns
+        latency: Latency breakdown (LatencyBreakdown.to_dict() from
+            test_routing): CLI-reported durations, turns and usage, and
+            harness timers in milliseconds
+
+    The result is queued and recorded on the recorder thread. If the queue
+    stays full for RECORD_QUEUE_BLOCK_S, the result is dropped and counted
+    (routing_telemetry_dropped_total).
     """
+    case = dict(locals())  # Exactly the arguments above
     if not _metrics_initialized:
         return
 
+    # The span ends now and under the current worker span, wherever it is built
+    case["end_time_ns"] = time.time_ns()
+    case["parent_context"] = get_worker_context()
+
+    if _record_queue is None:
+        _record_test_result(**case)
+        return
+    try:
+        _record_queue.put(case, timeout=RECORD_QUEUE_BLOCK_S)
+    except queue.Full:
+        _record_stats["dropped"] += 1
+        if _dropped_counter is not None:
+            _dropped_counter.add(1)
+
+
+def _record_test_result(
+    test_id: str,
+    category: str,
+    input_text: str,
+    expected_skill: str | None,
+    actual_skill: str | None,
+    passed: bool,
+    duration_ms: int,
+    cost_usd: float,
+    end_time_ns: int,
+    parent_context=None,
+    asked_clarification: bool = False,
+    session_id: str = "",
+    model: str = "unknown",
+    tokens_input: int = 0,
+    tokens_output: int = 0,
+    retry_count: int = 0,
+    disambiguation_options: list | None = None,
+    error_type: str | None = None,
+    error_message: str | None = None,
+    response_text: str = "",
+    tool_use_accuracy: float | None = None,
+    tool_use_matched: int | None = None,
+    tool_use_total: int | None = None,
+    latency: dict | None = None,
+):
+    """
+    Build the metrics and span for one test result (see record_test_result).
+
+    Args:
+        end_time_ns: When the result was reported (the span's end)
+        parent_context: Context the span is a child of
+    """
     # Normalize values
     expected = expected_skill or "none"
     actual = actual_skill or "none"
@@ -418,54 +929,79 @@ def record_test_result(
         else "false"
     )
 
-    # Metric labels (keep cardinality reasonable)
+    # Metric labels (see TEST_COUNTER_LABELS): skills outside the plugin
+    # share one label value, and every instrument is capped at
+    # MAX_SERIES_PER_METRIC label sets
     metric_labels = {
         "category": category,
         "result": result,
-        "expected_skill": expected,
-        "actual_skill": actual,
-        "routing_correct": routing_correct,
+        "expected_skill": _skill_label(expected),
+        "actual_skill": _skill_label(actual),
         "model": model,
-        "clarification_asked": str(asked_clarification).lower(),
     }
 
-    if error_type:
-        metric_labels["error_type"] = error_type
-
     # Record counter
-    _test_counter.add(1, metric_labels)
-
-    # Record duration (convert ms to seconds for standard units)
-    _duration_histogram.record(
-        duration_ms / 1000.0, {"category": category, "result": result, "model": model}
-    )
+    _test_counter.add(1, _bounded("routing_test_total", metric_labels))
+
+    # Record duration (convert ms to seconds for standard units); cases
+    # without a session of their own (coalesced, empty input) report 0
+    if duration_ms > 0:
+        _duration_histogram.record(
+            duration_ms / 1000.0,
+            _bounded(
+                "routing_test_duration_seconds",
+                {"category": category, "result": result, "model": model},
+            ),
+        )
 
     # Record cost
+    part_labels = {"category": category, "model": model}
     if cost_usd > 0:
-        _cost_histogram.record(cost_usd, {"category": category, "model": model})
+        _cost_histogram.record(cost_usd, _bounded("routing_test_cost_usd", part_labels))
+
+    # Record latency parts, turns and tokens. A coalesced case reports its
+    # session's parts, turns and tokens as 0 (run_claude_routing) and only
+    # records its harness parts, so shared sessions are counted once
+    if latency:
+        for part, histogram in _latency_histograms.items():
+            if latency.get(part):
+                histogram.record(
+                    latency[part] / 1000.0,
+                    _bounded(LATENCY_PARTS[part][0], part_labels),
+                )
+        if latency.get("num_turns"):
+            _turns_histogram.record(
+                latency["num_turns"], _bounded("routing_claude_turns", part_labels)
+            )
+        for field_name, token_type in TOKEN_TYPES.items():
+            if latency.get(field_name):
+                _tokens_histogram.record(
+                    latency[field_name],
+                    _bounded(
+                        "routing_claude_tokens", {**part_labels, "type": token_type}
+                    ),
+                )
 
     # Create detailed trace span with correct duration
     # Backdate the span start time so spanmetrics captures the actual test duration
     # If suite context exists, create span as child of suite span
     if _tracer:
-        end_time_ns = time.time_ns()
         start_time_ns = end_time_ns - (duration_ms * 1_000_000)  # Convert ms to ns
 
-        # Use worker context as parent (falls back to suite context)
-        parent_context = get_worker_context()
-
+        # Parent is the worker context when queued (falls back to suite context)
         with _tracer.start_as_current_span(
             f"routing_test_{test_id}",
             context=parent_context,
             start_time=start_time_ns,
+            end_on_exit=False,
         ) as span:
             # Test identification
             span.set_attribute("test.id", test_id)
             span.set_attribute("test.category", category)
             span.set_attribute("test.name", f"routing_test_{test_id}")
 
-            # Input context (truncate for size, include hash for correlation)
-            span.set_attribute("test.input", input_text[:500])
+            # Input context (hash for correlation; the text itself is set
+            # below, only when the payload policy keeps full payloads)
             span.set_attribute("test.input.length", len(input_text))
             span.set_attribute("test.input.hash", _hash_input(input_text))
             span.set_attribute("test.input.word_count", len(input_text.split()))
@@ -496,6 +1032,21 @@ def record_test_result(
             span.set_attribute("claude.tokens.total", tokens_input + tokens_output)
             span.set_attribute("claude.retry_count", retry_count)
 
+            # Latency breakdown (latency.<part>_ms, plus CLI-reported turns
+            # and cache usage)
+            if latency:
+                span.set_attribute("claude.duration_api_ms", latency["duration_api_ms"])
+                span.set_attribute("claude.num_turns", latency["num_turns"])
+                span.set_attribute(
+                    "claude.tokens.cache_read", latency["cache_read_input_tokens"]
+                )
+                span.set_attribute(
+                    "claude.tokens.cache_creation",
+                    latency["cache_creation_input_tokens"],
+                )
+                for part in LATENCY_PARTS:
+                    span.set_attribute(f"latency.{part}", float(latency[part]))
+
             # Error context
             if error_type:
                 span.set_attribute("error.type", error_type)
@@ -528,12 +1079,22 @@ def record_test_result(
                     tool_use_accuracy >= 0.5 if tool_use_accuracy else False,
                 )
 
-            # Add span events for prompt and response (for detailed tracing)
+            # Add span events for prompt and response. Full payloads only for
+            # failures (misroutes among them), slow cases and sampled passes;
+            # digests and lengths otherwise (see payload_policy)
+            policy = _payload_policy or PayloadPolicy()
+            payload_reason = policy.reason(
+                test_id, passed, routing_correct == "true", duration_ms
+            )
+            full = payload_reason is not None
+            span.set_attribute("payload.mode", payload_reason or "digest")
+            if full:
+                span.set_attribute("test.input", input_text[:500])
+
             span.add_event(
                 "prompt",
                 attributes={
-                    "prompt.text": input_text[:2000],  # Truncate for size
-                    "prompt.length": len(input_text),
+                    **policy.attributes("prompt", input_text, PROMPT_CHARS, full),
                     "prompt.word_count": len(input_text.split()),
                 },
             )
@@ -544,10 +1105,9 @@ def record_test_result(
                 span.add_event(
                     "response",
                     attributes={
-                        "response.text": response_text[
-                            :4000
-                        ],  # Larger limit for response
-                        "response.length": len(response_text),
+                        **policy.attributes(
+                            "response", response_text, RESPONSE_CHARS, full
+                        ),
                         "response.word_count": len(response_text.split()),
                         "response.code_block_count": len(code_blocks),
                         "response.has_bash_command": any(
@@ -557,12 +1117,14 @@ def record_test_result(
                 )
 
                 # Add separate event for each code block (up to 5)
-                for i, block in enumerate(code_blocks[:5]):
+                for i, block in enumerate(
+                    code_blocks[:MAX_CODE_BLOCKS] if full else []
+                ):
                     span.add_event(
                         f"code_block_{i}",
                         attributes={
                             "code_block.index": i,
-                            "code_block.content": block[:1000],
+                            "code_block.content": block[:CODE_BLOCK_CHARS],
                             "code_block.length": len(block),
                         },
                     )
@@ -574,6 +1136,61 @@ def record_test_result(
                 span.set_status(
                     Status(StatusCode.ERROR, f"Expected {expected}, got {actual}")
                 )
+        span.end(end_time=end_time_ns)
+
+
+def update_concurrency(limit: int, in_flight: int):
+    """
+    Update the adaptive concurrency gauge.
+
+    Args:
+        limit: Current concurrent session limit
+        in_flight: Sessions currently running
+    """
+    _concurrency_value["limit"] = limit
+    _concurrency_value["in_flight"] = in_flight
+
+
+def record_rate_limited():
+    """Count a session rejected by rate limiting or overload."""
+    if _rate_limit_counter is not None:
+        _rate_limit_counter.add(1)
+
+
+def _skill_score_callback(score: str):
+    """Observable gauge callback reporting one score for every skill."""
+
+    def callback(options):
+        return [
+            metrics.Observation(values[score], labels)
+            for labels, values in _skill_score_values.values()
+            if values.get(score) is not None
+        ]
+
+    return callback
+
+
+def record_skill_scores(scores: dict[str, dict], model: str = "unknown"):
+    """
+    Set the per-skill precision, recall and F1 gauges for this suite.
+
+    Called once, by the controller, with the merged confusion matrix before
+    telemetry shuts down (the final collection exports the values). Labels
+    outside the plugin's skills are left out rather than merged, since
+    their scores cannot be combined.
+
+    Args:
+        scores: Label -> SkillScore.to_dict() (see confusion_matrix)
+        model: Model under test
+    """
+    for label, score in scores.items():
+        skill = _skill_label(label)
+        if skill == OTHER_SKILL:
+            continue
+        _skill_score_values[skill] = (
+            {"skill": skill, "model": model},
+            {name: score.get(name) for name in SKILL_SCORES},
+        )
 
 
 def update_accuracy(passed: int, total: int):
@@ -621,9 +1238,11 @@ def start_suite_span(
 
         _suite_start_time = time.time_ns()
 
-        # Create the suite span (don't use context manager - we'll end it manually)
+        # Create the suite span (don't use context manager - we'll end it
+        # manually), under the launching process's span if it passed one
         _suite_span = _tracer.start_span(
             suite_name,
+            context=telemetry_runtime.context_from_env(),
             start_time=_suite_start_time,
         )
 
@@ -710,17 +1329,20 @@ def end_suite_span(
     failed: int,
     skipped: int,
     total_cost_usd: float = 0.0,
+    total_api_duration_ms: int = 0,
 ):
     """
     End the suite span with final summary attributes.
 
-    This should be called at pytest_sessionfinish.
+    This should be called at pytest_sessionfinish. Under xdist the cost and
+    API duration are the controller's totals merged from every worker.
 
     Args:
         passed: Number of passed tests
         failed: Number of failed tests
         skipped: Number of skipped tests
         total_cost_usd: Total API cost
+        total_api_duration_ms: Sum of Claude session durations across tests
     """
     global _suite_span, _suite_context, _suite_token, _suite_start_time
 
@@ -749,6 +1371,7 @@ def end_suite_span(
         _suite_span.set_attribute("suite.duration_ms", duration_ms)
         _suite_span.set_attribute("suite.duration_seconds", duration_ms / 1000.0)
         _suite_span.set_attribute("suite.cost_usd", total_cost_usd)
+        _suite_span.set_attribute("suite.api_duration_ms", total_api_duration_ms)
 
         # Set status based on failures
         if failed > 0:
@@ -1012,7 +1635,7 @@ def test_span(test_id: str, category: str, input_text: str):
     with _tracer.start_as_current_span(f"routing_test_{test_id}") as span:
         span.set_attribute("test.id", test_id)
         span.set_attribute("test.category", category)
-        span.set_attribute("test.input", input_text[:500])
+        # The outcome (and so the payload policy) is unknown here: hash only
         span.set_attribute("test.input.hash", _hash_input(input_text))
         yield span
 
@@ -1022,20 +1645,11 @@ def shutdown():
     if not _metrics_initialized:
         return
 
-    try:
-        # Get providers and force flush
-        meter_provider = metrics.get_meter_provider()
-        if hasattr(meter_provider, "force_flush"):
-            meter_provider.force_flush()
-        if hasattr(meter_provider, "shutdown"):
-            meter_provider.shutdown()
-
-        tracer_provider = trace.get_tracer_provider()
-        if hasattr(tracer_provider, "force_flush"):
-            tracer_provider.force_flush()
-        if hasattr(tracer_provider, "shutdown"):
-            tracer_provider.shutdown()
+    # Queued test results first, so their spans and metrics are exported
+    _stop_recorder()
 
+    try:
+        telemetry_runtime.shutdown()
         print("OpenTelemetry shutdown complete.")
     except Exception as e:
         print(f"Error during OpenTelemetry shutdown: {e}")
@@ -1053,7 +1667,7 @@ def test_connectivity() -> bool:
 
     try:
         req = urllib.request.Request(
-            f"{OTLP_HTTP_ENDPOINT}/v1/metrics",
+            f"{otlp_endpoint()}/v1/metrics",
             method="POST",
             headers={"Content-Type": "application/x-protobuf"},
         )
@@ -1069,7 +1683,7 @@ def test_connectivity() -> bool:
 
 if __name__ == "__main__":
     # Quick connectivity and attribute test
-    print(f"Testing OTLP endpoint: {OTLP_HTTP_ENDPOINT}")
+    print(f"Testing OTLP endpoint: {otlp_endpoint()}")
     print("\nResource Attributes:")
     for k, v in get_resource_attributes().items():
         print(f"  {k}: {v}")
@@ -1092,5 +1706,5 @@ if __name__ == "__main__":
             print("Test metric sent. Check your observability stack.")
             shutdown()
     else:
-        print(f"\nCannot reach OTLP endpoint at {OTLP_HTTP_ENDPOINT}")
+        print(f"\nCannot reach OTLP endpoint at {otlp_endpoint()}")
         print("Ensure your OpenTelemetry collector is running.")
@@ -0,0 +1,85 @@
+"""OpenTelemetry exporters that spool OTLP-JSON to local files.
+
+Used by otel_metrics instead of the OTLP/HTTP exporters when ``--otlp-file``
+is given; ``otlp_spool.py`` uploads the files later. Requests are encoded
+with the OTLP protobuf encoders and written in the OTLP/HTTP JSON encoding
+(hex trace and span IDs, integer enums), so any collector's OTLP/HTTP
+receiver accepts them as they are.
+"""
+
+import base64
+import logging
+
+from google.protobuf.json_format import MessageToDict
+from opentelemetry.exporter.otlp.proto.common.metrics_encoder import encode_metrics
+from opentelemetry.exporter.otlp.proto.common.trace_encoder import encode_spans
+from opentelemetry.sdk.metrics.export import MetricExporter, MetricExportResult
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+from otlp_spool import SpoolWriter
+
+logger = logging.getLogger(__name__)
+
+# Bytes fields that OTLP/JSON encodes as hex instead of base64
+_ID_FIELDS = {"traceId", "spanId", "parentSpanId"}
+
+
+def _hex_ids(value):
+    """Re-encode trace/span IDs in a MessageToDict result as hex."""
+    if isinstance(value, dict):
+        return {
+            key: base64.b64decode(item).hex()
+            if key in _ID_FIELDS and isinstance(item, str)
+            else _hex_ids(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_hex_ids(item) for item in value]
+    return value
+
+
+def to_otlp_json(message) -> dict:
+    """An OTLP export request protobuf in the OTLP/HTTP JSON encoding."""
+    return _hex_ids(MessageToDict(message, use_integers_for_enums=True))
+
+
+class OTLPFileSpanExporter(SpanExporter):
+    """Writes span batches to the ``traces`` spool."""
+
+    def __init__(self, directory: str, **writer_options):
+        self._writer = SpoolWriter(directory, "traces", **writer_options)
+
+    def export(self, spans) -> SpanExportResult:
+        try:
+            self._writer.write(to_otlp_json(encode_spans(spans)))
+        except OSError as e:
+            logger.warning(f"Failed to spool {len(spans)} spans: {e}")
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True  # Every batch is already on disk
+
+    def shutdown(self):
+        self._writer.close()
+
+
+class OTLPFileMetricExporter(MetricExporter):
+    """Writes metric collections to the ``metrics`` spool."""
+
+    def __init__(self, directory: str, **writer_options):
+        super().__init__()
+        self._writer = SpoolWriter(directory, "metrics", **writer_options)
+
+    def export(self, metrics_data, timeout_millis: float = 10_000, **kwargs):
+        try:
+            self._writer.write(to_otlp_json(encode_metrics(metrics_data)))
+        except OSError as e:
+            logger.warning(f"Failed to spool metrics: {e}")
+            return MetricExportResult.FAILURE
+        return MetricExportResult.SUCCESS
+
+    def force_flush(self, timeout_millis: float = 10_000) -> bool:
+        return True
+
+    def shutdown(self, timeout_millis: float = 30_000, **kwargs):
+        self._writer.close()
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""Local OTLP/HTTP receiver stand-in for measuring telemetry overhead.
+
+Accepts ``POST /v1/traces`` and ``POST /v1/metrics`` on localhost and counts
+what arrives (requests, bytes, spans and metric data points) without
+storing it. Latency and failures can be injected to stand in for a slow or
+overloaded collector: every request waits ``latency_ms``, and a share of
+requests (``fail_rate``) is answered with ``fail_status`` (503 by default,
+which exporters retry).
+
+Protobuf bodies (the SDK exporters) are decoded with ``opentelemetry-proto``
+when it is installed; otherwise only requests and bytes are counted. JSON
+bodies (``otlp_spool.py`` uploads) are always decoded.
+
+Usage:
+    # Stand-in collector for a routing run
+    python otlp_receiver.py --port 4318
+    pytest test_routing.py --otel --otlp-endpoint http://127.0.0.1:4318
+
+    # Degraded collector: 500 ms per request, a third of requests fail
+    python otlp_receiver.py --port 4318 --latency-ms 500 --fail-rate 0.33
+
+    # In code (see test_harness_benchmarks.py)
+    with OTLPReceiver(latency_ms=100) as receiver:
+        ...  # export to receiver.endpoint
+        print(receiver.stats.to_dict())
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import random
+import sys
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+
+# URL path -> signal
+SIGNAL_PATHS = {"/v1/traces": "traces", "/v1/metrics": "metrics"}
+
+
+@dataclass
+class SignalStats:
+    """What one signal's endpoint received."""
+
+    requests: int = 0
+    failed: int = 0  # Answered with the injected failure status
+    bytes: int = 0
+    items: int = 0  # Spans or metric data points (accepted requests only)
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "requests": self.requests,
+            "failed": self.failed,
+            "bytes": self.bytes,
+            "items": self.items,
+        }
+
+
+@dataclass
+class ReceiverStats:
+    """Per-signal counts for a receiver."""
+
+    traces: SignalStats = field(default_factory=SignalStats)
+    metrics: SignalStats = field(default_factory=SignalStats)
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {"traces": self.traces.to_dict(), "metrics": self.metrics.to_dict()}
+
+
+def _decompress(body: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        return zlib.decompress(body)
+    return body
+
+
+def _count_json(signal: str, request: dict) -> int:
+    """Spans or data points in an OTLP-JSON export request."""
+    if signal == "traces":
+        return sum(
+            len(scope.get("spans", []))
+            for resource in request.get("resourceSpans", [])
+            for scope in resource.get("scopeSpans", [])
+        )
+    count = 0
+    for resource in request.get("resourceMetrics", []):
+        for scope in resource.get("scopeMetrics", []):
+            for metric in scope.get("metrics", []):
+                for data in metric.values():
+                    if isinstance(data, dict):
+                        count += len(data.get("dataPoints", []))
+    return count
+
+
+def _count_protobuf(signal: str, body: bytes) -> int:
+    """Spans or data points in a protobuf export request (0 if undecodable)."""
+    try:
+        if signal == "traces":
+            from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
+                ExportTraceServiceRequest,
+            )
+
+            request = ExportTraceServiceRequest.FromString(body)
+            return sum(
+                len(scope.spans)
+                for resource in request.resource_spans
+                for scope in resource.scope_spans
+            )
+
+        from opentelemetry.proto.collector.metrics.v1.metrics_service_pb2 import (
+            ExportMetricsServiceRequest,
+        )
+
+        request = ExportMetricsServiceRequest.FromString(body)
+        count = 0
+        for resource in request.resource_metrics:
+            for scope in resource.scope_metrics:
+                for metric in scope.metrics:
+                    kind = metric.WhichOneof("data")
+                    if kind:
+                        count += len(getattr(metric, kind).data_points)
+        return count
+    except Exception as e:  # ImportError or a malformed body
+        logger.debug(f"Could not decode {signal} request: {e}")
+        return 0
+
+
+class OTLPReceiver:
+    """Threaded localhost OTLP/HTTP receiver with fault injection."""
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = 0,
+        latency_ms: float = 0.0,
+        fail_rate: float = 0.0,
+        fail_status: int = 503,
+        seed: int | None = None,
+    ):
+        """Initialize receiver.
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free one)
+            latency_ms: Delay before answering each request
+            fail_rate: Share of requests answered with ``fail_status``
+            fail_status: Status returned for injected failures
+            seed: Seed for the failure choice (reproducible runs)
+        """
+        self.latency_ms = latency_ms
+        self.fail_rate = fail_rate
+        self.fail_status = fail_status
+        self.stats = ReceiverStats()
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def endpoint(self) -> str:
+        """Base URL to export to (e.g. as $OTLP_HTTP_ENDPOINT)."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                signal = SIGNAL_PATHS.get(self.path)
+                if signal is None:
+                    self.send_error(404)
+                    return
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                status = receiver._receive(
+                    signal,
+                    body,
+                    self.headers.get("Content-Type", ""),
+                    self.headers.get("Content-Encoding", ""),
+                )
+                self.send_response(status)
+                if status < 300:
+                    # An empty body is a valid (fully accepted) export response
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", "2")
+                    self.end_headers()
+                    self.wfile.write(b"{}")
+                else:
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        return Handler
+
+    def _receive(self, signal: str, body: bytes, content_type: str, encoding: str):
+        """Count one request; returns the status to answer with."""
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+        with self._lock:
+            stats = getattr(self.stats, signal)
+            stats.requests += 1
+            stats.bytes += len(body)
+            if self.fail_rate and self._random.random() < self.fail_rate:
+                stats.failed += 1
+                return self.fail_status
+
+        try:
+            raw = _decompress(body, encoding)
+            if "json" in content_type:
+                items = _count_json(signal, json.loads(raw))
+            else:
+                items = _count_protobuf(signal, raw)
+        except (OSError, ValueError, zlib.error) as e:
+            logger.debug(f"Undecodable {signal} request: {e}")
+            return 400
+
+        with self._lock:
+            stats.items += items
+        return 200
+
+    def start(self) -> "OTLPReceiver":
+        """Serve in a background thread."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="otlp-receiver", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the port."""
+        if self._thread:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "OTLPReceiver":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Local OTLP/HTTP receiver that counts telemetry (with fault injection)",
+    )
+    parser.add_argument(
+        "--host",
+        default=DEFAULT_HOST,
+        help=f"Interface to listen on (default: {DEFAULT_HOST})",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=4318,
+        help="Port to listen on (default: 4318)",
+    )
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=0.0,
+        help="Delay before answering each request",
+    )
+    parser.add_argument(
+        "--fail-rate",
+        type=float,
+        default=0.0,
+        help="Share of requests answered with --fail-status (0-1)",
+    )
+    parser.add_argument(
+        "--fail-status",
+        type=int,
+        default=503,
+        help="Status for injected failures (default: 503)",
+    )
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="Enable verbose logging",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+    )
+
+    receiver = OTLPReceiver(
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency_ms,
+        fail_rate=args.fail_rate,
+        fail_status=args.fail_status,
+    )
+    receiver.start()
+    logger.info(f"Receiving OTLP/HTTP on {receiver.endpoint} (Ctrl-C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        receiver.stop()
+
+    print(json.dumps(receiver.stats.to_dict(), indent=2))
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
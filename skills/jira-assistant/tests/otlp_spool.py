@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""Durable local OTLP spool and its uploader.
+
+With ``--otlp-file DIR`` the routing tests write telemetry to rotating
+OTLP-JSON files instead of exporting over HTTP, so a run never blocks on
+(or loses data to) an unreachable collector. Each line is one OTLP/HTTP
+JSON export request (``ExportTraceServiceRequest`` or
+``ExportMetricsServiceRequest``). Files are written as
+``<signal>-<time_ns>-<pid>.jsonl.open`` and renamed to ``.jsonl`` once
+rotated or closed; the oldest completed files are dropped when a signal's
+files exceed the size cap.
+
+This script replays spooled files to a collector. Consecutive requests are
+merged into batches of bounded size; 429/5xx responses and connection
+errors back off (honouring ``Retry-After``) before retrying, so a busy
+collector slows the upload instead of losing data. Progress is saved per
+file, so an interrupted upload resumes where it stopped. Files the
+collector rejects (other 4xx) are renamed ``.rejected``.
+
+Usage:
+    pytest test_routing.py --otel --otlp-file /tmp/otlp       # Spool
+    python otlp_spool.py --dir /tmp/otlp                      # Upload later
+    python otlp_spool.py --dir /tmp/otlp --endpoint http://collector:4318
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Environment variable naming the spool directory (inherited by xdist workers)
+OTLP_FILE_DIR_ENV_VAR = "OTLP_FILE_DIR"
+
+DEFAULT_ENDPOINT = "http://localhost:4318"
+
+# Rotation and retention, per signal and directory
+DEFAULT_MAX_FILE_BYTES = 8 * 1024 * 1024
+DEFAULT_MAX_TOTAL_BYTES = 256 * 1024 * 1024
+
+# Upload batching and backoff
+DEFAULT_BATCH_BYTES = 1024 * 1024
+DEFAULT_MAX_RETRIES = 8
+MAX_BACKOFF_SECONDS = 60.0
+
+# Signal -> (request field holding the resource list, OTLP/HTTP path)
+SIGNALS = {
+    "traces": ("resourceSpans", "/v1/traces"),
+    "metrics": ("resourceMetrics", "/v1/metrics"),
+}
+
+OPEN_SUFFIX = ".jsonl.open"
+DONE_SUFFIX = ".jsonl"
+
+# Response codes worth retrying (the collector is busy or restarting)
+RETRYABLE_STATUS = {429, 502, 503, 504}
+
+
+class SpoolWriter:
+    """Appends OTLP-JSON requests for one signal to rotating files."""
+
+    def __init__(
+        self,
+        directory: str | Path,
+        signal: str,
+        max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+        max_total_bytes: int = DEFAULT_MAX_TOTAL_BYTES,
+    ):
+        """Initialize writer.
+
+        Args:
+            directory: Spool directory (created if missing)
+            signal: "traces" or "metrics"
+            max_file_bytes: Rotate the current file beyond this size
+            max_total_bytes: Drop the oldest completed files beyond this
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.signal = signal
+        self.max_file_bytes = max_file_bytes
+        self.max_total_bytes = max_total_bytes
+        self._lock = threading.Lock()
+        self._file = None
+        self._path: Path | None = None
+
+    def _open(self):
+        name = f"{self.signal}-{time.time_ns()}-{os.getpid()}{OPEN_SUFFIX}"
+        self._path = self.directory / name
+        self._file = open(self._path, "ab")
+
+    def _complete(self):
+        """Close the current file and hand it to the uploader."""
+        if self._file is None:
+            return
+        self._file.close()
+        self._path.rename(self._path.with_name(self._path.name[: -len(".open")]))
+        self._file = self._path = None
+        self._enforce_cap()
+
+    def _enforce_cap(self):
+        files = sorted(self.directory.glob(f"{self.signal}-*{DONE_SUFFIX}"))
+        total = 0
+        sizes = {}
+        for path in files:
+            try:
+                sizes[path] = path.stat().st_size
+            except FileNotFoundError:
+                continue
+            total += sizes[path]
+        for path in files:
+            if total <= self.max_total_bytes:
+                break
+            try:
+                path.unlink()
+                logger.warning(
+                    f"OTLP spool over {self.max_total_bytes} bytes, dropped {path.name}"
+                )
+            except FileNotFoundError:
+                pass
+            total -= sizes.get(path, 0)
+
+    def write(self, request: dict):
+        """Append one export request (flushed to disk before returning)."""
+        line = json.dumps(request, separators=(",", ":")).encode() + b"\n"
+        with self._lock:
+            if self._file is None:
+                self._open()
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            if self._file.tell() >= self.max_file_bytes:
+                self._complete()
+
+    def close(self):
+        """Complete the current file."""
+        with self._lock:
+            self._complete()
+
+
+def _writer_alive(path: Path) -> bool:
+    """Whether the process that opened a spool file is still running."""
+    try:
+        pid = int(path.name[: -len(OPEN_SUFFIX)].rsplit("-", 1)[1])
+        os.kill(pid, 0)
+    except (ValueError, IndexError, ProcessLookupError):
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def pending_files(directory: str | Path) -> list[Path]:
+    """
+    Spooled files ready to upload, oldest first.
+
+    Completed files, plus open files left behind by a process that exited
+    without closing them (e.g. a killed worker).
+    """
+    directory = Path(directory)
+    files = list(directory.glob(f"*{DONE_SUFFIX}"))
+    files.extend(p for p in directory.glob(f"*{OPEN_SUFFIX}") if not _writer_alive(p))
+    return sorted(files, key=lambda p: int(p.name.split("-")[1]))
+
+
+def _signal_of(path: Path) -> str:
+    return path.name.split("-", 1)[0]
+
+
+def _offset_file(path: Path) -> Path:
+    return path.with_name(path.name + ".offset")
+
+
+def read_batches(path: Path, batch_bytes: int = DEFAULT_BATCH_BYTES):
+    """
+    Merge a file's requests into batches, resuming after uploaded ones.
+
+    Args:
+        path: Spooled file
+        batch_bytes: Approximate maximum request size per batch
+
+    Yields:
+        (merged request, byte offset just past its last line)
+    """
+    field, _ = SIGNALS[_signal_of(path)]
+    offset_file = _offset_file(path)
+    start = int(offset_file.read_text()) if offset_file.exists() else 0
+
+    with open(path, "rb") as f:
+        f.seek(start)
+        resources, size, offset = [], 0, start
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # Torn write from a killed process
+            offset += len(line)
+            try:
+                resources.extend(json.loads(line).get(field, []))
+            except ValueError:
+                logger.warning(f"Skipping corrupt line in {path.name}")
+                continue
+            size += len(line)
+            if size >= batch_bytes:
+                yield {field: resources}, offset
+                resources, size = [], 0
+        if resources:
+            yield {field: resources}, offset
+
+
+def _post(url: str, body: bytes) -> tuple[int, float | None]:
+    """POST an OTLP-JSON body; returns (status, Retry-After seconds)."""
+    request = urllib.request.Request(
+        url, data=body, method="POST", headers={"Content-Type": "application/json"}
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.status, None
+    except urllib.error.HTTPError as e:
+        retry_after = e.headers.get("Retry-After") if e.headers else None
+        try:
+            return e.code, float(retry_after) if retry_after else None
+        except ValueError:
+            return e.code, None
+
+
+def upload_file(
+    path: Path,
+    endpoint: str = DEFAULT_ENDPOINT,
+    batch_bytes: int = DEFAULT_BATCH_BYTES,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+) -> int:
+    """
+    Upload one spooled file and delete it.
+
+    Args:
+        path: Spooled file
+        endpoint: Collector OTLP/HTTP base URL
+        batch_bytes: Approximate maximum request size per batch
+        max_retries: Attempts per batch before giving up
+
+    Returns:
+        Number of batches sent
+
+    Raises:
+        ConnectionError: If the collector stayed unavailable; progress so
+            far is saved and the upload can be resumed
+    """
+    _, url_path = SIGNALS[_signal_of(path)]
+    url = endpoint.rstrip("/") + url_path
+    offset_file = _offset_file(path)
+    sent = 0
+
+    for request, offset in read_batches(path, batch_bytes):
+        body = json.dumps(request, separators=(",", ":")).encode()
+        attempt = 0
+        while True:
+            try:
+                status, retry_after = _post(url, body)
+            except (urllib.error.URLError, OSError) as e:
+                status, retry_after = None, None
+                logger.debug(f"Upload to {url} failed: {e}")
+            if status is not None and status < 300:
+                break
+            if status is not None and status not in RETRYABLE_STATUS:
+                rejected = path.with_name(path.name.split(".")[0] + ".rejected")
+                path.rename(rejected)
+                offset_file.unlink(missing_ok=True)
+                logger.error(
+                    f"Collector rejected {path.name} (HTTP {status}), "
+                    f"kept as {rejected.name}"
+                )
+                return sent
+            attempt += 1
+            if attempt >= max_retries:
+                raise ConnectionError(
+                    f"Collector at {endpoint} unavailable; {path.name} will resume"
+                )
+            backoff = 2 ** (attempt - 1) if retry_after is None else retry_after
+            delay = min(backoff, MAX_BACKOFF_SECONDS)
+            logger.info(
+                f"Collector busy ({status or 'unreachable'}), retrying in {delay:.0f}s"
+            )
+            time.sleep(delay)
+        sent += 1
+        offset_file.write_text(str(offset))
+
+    path.unlink()
+    offset_file.unlink(missing_ok=True)
+    return sent
+
+
+def upload_spool(
+    directory: str | Path,
+    endpoint: str = DEFAULT_ENDPOINT,
+    batch_bytes: int = DEFAULT_BATCH_BYTES,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+) -> tuple[int, int]:
+    """
+    Upload every pending file in a spool directory, oldest first.
+
+    Returns:
+        (files uploaded, batches sent)
+
+    Raises:
+        ConnectionError: If the collector stayed unavailable
+    """
+    files = batches = 0
+    for path in pending_files(directory):
+        batches += upload_file(path, endpoint, batch_bytes, max_retries)
+        files += 1
+    return files, batches
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Upload spooled OTLP-JSON telemetry to a collector",
+    )
+    parser.add_argument(
+        "--dir",
+        default=os.environ.get(OTLP_FILE_DIR_ENV_VAR),
+        required=not os.environ.get(OTLP_FILE_DIR_ENV_VAR),
+        help=f"Spool directory (default: ${OTLP_FILE_DIR_ENV_VAR})",
+    )
+    parser.add_argument(
+        "--endpoint",
+        default=os.environ.get("OTLP_HTTP_ENDPOINT", DEFAULT_ENDPOINT),
+        help=f"Collector OTLP/HTTP endpoint (default: $OTLP_HTTP_ENDPOINT or {DEFAULT_ENDPOINT})",
+    )
+    parser.add_argument(
+        "--batch-bytes",
+        type=int,
+        default=DEFAULT_BATCH_BYTES,
+        help=f"Approximate maximum request size (default: {DEFAULT_BATCH_BYTES})",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=DEFAULT_MAX_RETRIES,
+        help=f"Attempts per batch before giving up (default: {DEFAULT_MAX_RETRIES})",
+    )
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="Enable verbose logging",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+    )
+
+    try:
+        files, batches = upload_spool(
+            args.dir, args.endpoint, args.batch_bytes, args.max_retries
+        )
+    except ConnectionError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+    logger.info(f"Uploaded {files} files ({batches} batches) to {args.endpoint}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
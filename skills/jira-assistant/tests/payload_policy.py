@@ -0,0 +1,157 @@
+"""Which routing test spans carry prompt and response payloads.
+
+Full payloads (prompt, response text and code blocks) are only worth
+exporting when someone will read them: failures (misroutes among them)
+and slow outliers. Every other case keeps payload lengths and SHA-256 digests, and a
+sample of passes (chosen by test ID, so reruns pick the same cases) keeps
+full payloads as a baseline to compare failures against.
+
+Optionally, payloads above a size threshold are written to a local
+content-addressed artifact store and the span keeps only a reference
+(``artifact:<sha256>``), which ``ArtifactStore.get`` resolves.
+
+Configuration comes from the environment, so xdist workers inherit what
+the controller was given (see conftest ``--payload-*`` options).
+"""
+
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+SAMPLE_ENV_VAR = "ROUTING_PAYLOAD_SAMPLE"
+SLOW_MS_ENV_VAR = "ROUTING_PAYLOAD_SLOW_MS"
+OFFLOAD_BYTES_ENV_VAR = "ROUTING_PAYLOAD_OFFLOAD_BYTES"
+ARTIFACT_DIR_ENV_VAR = "ROUTING_ARTIFACT_DIR"
+
+DEFAULT_PASS_SAMPLE_RATE = 0.1
+DEFAULT_SLOW_MS = 60_000
+DEFAULT_ARTIFACT_DIR = Path(__file__).parent / ".routing_artifacts"
+
+# Truncation limits for payloads kept on the span
+PROMPT_CHARS = 2000
+RESPONSE_CHARS = 4000
+CODE_BLOCK_CHARS = 1000
+MAX_CODE_BLOCKS = 5
+
+ARTIFACT_PREFIX = "artifact:"
+
+
+def digest(text: str) -> str:
+    """SHA-256 of a payload (hex)."""
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class ArtifactStore:
+    """Content-addressed payload files (``<dir>/<sha[:2]>/<sha>.txt``)."""
+
+    def __init__(self, root: Path | None = None):
+        """Initialize store.
+
+        Args:
+            root: Store directory. If None, uses ROUTING_ARTIFACT_DIR or the
+                default next to the tests.
+        """
+        self.root = Path(
+            root or os.environ.get(ARTIFACT_DIR_ENV_VAR) or DEFAULT_ARTIFACT_DIR
+        )
+
+    def _path(self, sha: str) -> Path:
+        return self.root / sha[:2] / f"{sha}.txt"
+
+    def put(self, text: str) -> str:
+        """Store a payload (once per content) and return its reference."""
+        sha = digest(text)
+        path = self._path(sha)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(text)
+            os.replace(tmp, path)
+        return f"{ARTIFACT_PREFIX}{sha}"
+
+    def get(self, ref: str) -> str | None:
+        """Payload for a reference (None if it is not in this store)."""
+        path = self._path(ref.removeprefix(ARTIFACT_PREFIX))
+        return path.read_text() if path.exists() else None
+
+
+@dataclass
+class PayloadPolicy:
+    """Decides per case whether spans get full payloads."""
+
+    pass_sample_rate: float = DEFAULT_PASS_SAMPLE_RATE  # 0 = no passes, 1 = all
+    slow_ms: float = DEFAULT_SLOW_MS  # Cases at least this slow keep payloads
+    offload_bytes: int | None = None  # Offload larger payloads (None = never)
+    artifact_dir: Path | None = None
+
+    @classmethod
+    def from_env(cls) -> "PayloadPolicy":
+        """Policy configured by ROUTING_PAYLOAD_* variables (defaults otherwise)."""
+        offload = os.environ.get(OFFLOAD_BYTES_ENV_VAR)
+        return cls(
+            pass_sample_rate=float(
+                os.environ.get(SAMPLE_ENV_VAR, DEFAULT_PASS_SAMPLE_RATE)
+            ),
+            slow_ms=float(os.environ.get(SLOW_MS_ENV_VAR, DEFAULT_SLOW_MS)),
+            offload_bytes=int(offload) if offload else None,
+        )
+
+    def reason(
+        self,
+        test_id: str,
+        passed: bool,
+        routing_correct: bool,
+        duration_ms: float,
+    ) -> str | None:
+        """
+        Why a case keeps full payloads.
+
+        Args:
+            test_id: Test case ID (sampling key)
+            passed: Whether the test passed
+            routing_correct: Whether the expected skill was routed to. Only
+                consulted for failures: a passing case may have been served
+                by an accepted alternate skill
+            duration_ms: Test duration in milliseconds
+
+        Returns:
+            "failed", "misrouted", "slow" or "sampled"; None for digests only
+        """
+        if not passed:
+            return "failed" if routing_correct else "misrouted"
+        if duration_ms >= self.slow_ms:
+            return "slow"
+        bucket = int(digest(test_id)[:8], 16) / 0x1_0000_0000
+        if bucket < self.pass_sample_rate:
+            return "sampled"
+        return None
+
+    def attributes(
+        self,
+        prefix: str,
+        text: str,
+        limit: int,
+        full: bool,
+    ) -> dict:
+        """
+        Span attributes for one payload.
+
+        Args:
+            prefix: Attribute prefix, e.g. "response"
+            text: The payload
+            limit: Characters kept on the span
+            full: Whether the case keeps full payloads
+
+        Returns:
+            ``<prefix>.length`` and ``<prefix>.sha256``, plus
+            ``<prefix>.text`` (truncated) or ``<prefix>.artifact`` when full
+        """
+        attrs = {f"{prefix}.length": len(text), f"{prefix}.sha256": digest(text)}
+        if not full:
+            return attrs
+        if self.offload_bytes is not None and len(text.encode()) > self.offload_bytes:
+            attrs[f"{prefix}.artifact"] = ArtifactStore(self.artifact_dir).put(text)
+        else:
+            attrs[f"{prefix}.text"] = text[:limit]
+        return attrs
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""Cheap per-candidate copies of the plugin tree.
+
+Every Claude session loads the plugin from ``CLAUDE_PLUGIN_DIR``, and
+SkillEditor edits SKILL.md files in place, so two candidate edits can never
+be evaluated at the same time against the working copy. A snapshot is a
+private plugin tree for one candidate:
+
+- Unchanged files are hardlinks to the working copy (no data copied)
+- Files a candidate modifies are detached first: their new content lives on
+  tmpfs (``/dev/shm``) and the tree holds a symlink to it, or a private
+  copy when tmpfs is not available
+
+Writing through a hardlink would change the working copy, so edits must go
+through ``PluginSnapshot.write_file()`` / ``apply_changes()``, which detach
+the file before writing.
+
+Usage:
+    snapshotter = PluginSnapshotter()
+    with snapshotter.snapshot("candidate-1", changes=fix.changes) as snap:
+        runner.run_tests(test_ids=["TC012"], env=snap.env())
+
+    # Score several candidates in parallel
+    results = score_candidates({"a": changes_a, "b": changes_b}, ["TC012"])
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from skill_editor import SkillContent, SkillEditor
+from test_runner import TestRunner, TestSuiteResult
+
+logger = logging.getLogger(__name__)
+
+TESTS_DIR = Path(__file__).parent
+PLUGIN_ROOT = TESTS_DIR.parent.parent.parent
+
+# Fallback snapshot location when the temp dir is on another filesystem
+# (hardlinks cannot cross filesystems)
+LOCAL_SNAPSHOT_DIR = TESTS_DIR / ".plugin_snapshots"
+
+# Where modified files live
+TMPFS_DIR = Path("/dev/shm")
+
+# Names never copied into a snapshot
+EXCLUDED_NAMES = {
+    ".git",
+    "__pycache__",
+    ".pytest_cache",
+    ".ruff_cache",
+    ".mypy_cache",
+    ".benchmarks",
+    ".venv",
+    "venv",
+    "node_modules",
+    ".skill_backups",
+    LOCAL_SNAPSHOT_DIR.name,
+}
+
+
+@dataclass
+class PluginSnapshot:
+    """A private plugin tree for one candidate."""
+
+    label: str
+    root: Path
+    tmpfs_dir: Path | None = None
+    modified: list[str] = field(default_factory=list)
+    linked_files: int = 0
+    copied_files: int = 0
+
+    @property
+    def skills_path(self) -> Path:
+        """The snapshot's skills/ directory."""
+        return self.root / "skills"
+
+    def env(self) -> dict[str, str]:
+        """Environment pointing Claude sessions at this snapshot."""
+        return {"CLAUDE_PLUGIN_DIR": str(self.root)}
+
+    def editor(self) -> SkillEditor:
+        """SkillEditor for this snapshot (call detach() before editing)."""
+        return SkillEditor(skills_base_path=self.skills_path)
+
+    def detach(self, rel_path: str | Path) -> Path:
+        """
+        Give the snapshot its own copy of a file so it can be modified.
+
+        Args:
+            rel_path: Path relative to the snapshot root
+
+        Returns:
+            Path of the file inside the snapshot
+        """
+        rel_path = Path(rel_path)
+        target = self.root / rel_path
+        if str(rel_path) in self.modified:
+            return target
+
+        content = target.read_bytes() if target.exists() else b""
+        if target.exists() or target.is_symlink():
+            target.unlink()  # Drop the hardlink; the working copy is untouched
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        if self.tmpfs_dir:
+            private = self.tmpfs_dir / rel_path
+            private.parent.mkdir(parents=True, exist_ok=True)
+            private.write_bytes(content)
+            target.symlink_to(private)
+        else:
+            target.write_bytes(content)
+
+        self.modified.append(str(rel_path))
+        return target
+
+    def write_file(self, rel_path: str | Path, content: str) -> Path:
+        """Replace a file's content in this snapshot only."""
+        target = self.detach(rel_path)
+        target.write_text(content)
+        return target
+
+    def apply_changes(self, changes: list[dict]) -> list[SkillContent]:
+        """
+        Apply a fix proposal's changes to this snapshot only.
+
+        Args:
+            changes: Change dictionaries as accepted by SkillEditor.apply_changes
+
+        Returns:
+            List of updated skill contents
+        """
+        editor = self.editor()
+        for skill_name in {change["skill"] for change in changes}:
+            skill_path = editor.get_skill_path(skill_name)
+            self.detach(skill_path.relative_to(self.root))
+        return editor.apply_changes(changes, backup=False)
+
+
+def _same_filesystem(a: Path, b: Path) -> bool:
+    try:
+        return a.stat().st_dev == b.stat().st_dev
+    except OSError:
+        return False
+
+
+class PluginSnapshotter:
+    """Creates and removes plugin snapshots."""
+
+    def __init__(
+        self,
+        source_root: Path | None = None,
+        base_dir: Path | None = None,
+        use_tmpfs: bool = True,
+    ):
+        """Initialize snapshotter.
+
+        Args:
+            source_root: Plugin tree to snapshot. If None, uses this plugin.
+            base_dir: Directory for snapshot trees. If None, uses the temp dir
+                when it shares a filesystem with the source, else
+                ``.plugin_snapshots`` next to this file.
+            use_tmpfs: Keep modified files on /dev/shm when available
+        """
+        self.source_root = source_root or PLUGIN_ROOT
+        if base_dir is None:
+            tmp = Path(tempfile.gettempdir())
+            base_dir = (
+                tmp if _same_filesystem(tmp, self.source_root) else LOCAL_SNAPSHOT_DIR
+            )
+        self.base_dir = base_dir
+        self.use_tmpfs = (
+            use_tmpfs and TMPFS_DIR.is_dir() and os.access(TMPFS_DIR, os.W_OK)
+        )
+
+    def _link_tree(self, snapshot: PluginSnapshot) -> None:
+        """Mirror the source tree into the snapshot with hardlinks."""
+        for dirpath, dirnames, filenames in os.walk(self.source_root):
+            dirnames[:] = [d for d in dirnames if d not in EXCLUDED_NAMES]
+            src_dir = Path(dirpath)
+            dst_dir = snapshot.root / src_dir.relative_to(self.source_root)
+            dst_dir.mkdir(parents=True, exist_ok=True)
+
+            for name in filenames:
+                src = src_dir / name
+                dst = dst_dir / name
+                if src.is_symlink():
+                    dst.symlink_to(os.readlink(src))
+                    continue
+                try:
+                    os.link(src, dst)
+                    snapshot.linked_files += 1
+                except OSError:
+                    # Cross-device or unsupported: fall back to a real copy
+                    shutil.copy2(src, dst)
+                    snapshot.copied_files += 1
+
+    def create(self, label: str, changes: list[dict] | None = None) -> PluginSnapshot:
+        """
+        Materialize a snapshot, optionally applying a candidate's changes.
+
+        Args:
+            label: Name of the candidate (used in directory names)
+            changes: SkillEditor change dictionaries to apply
+
+        Returns:
+            The snapshot; pass ``snapshot.env()`` to the test run
+        """
+        snapshot_id = f"{label}-{uuid.uuid4().hex[:8]}"
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        root = self.base_dir / f"plugin-snapshot-{snapshot_id}"
+        tmpfs_dir = (
+            TMPFS_DIR / f"plugin-snapshot-{snapshot_id}" if self.use_tmpfs else None
+        )
+        snapshot = PluginSnapshot(label=label, root=root, tmpfs_dir=tmpfs_dir)
+
+        try:
+            self._link_tree(snapshot)
+            if changes:
+                snapshot.apply_changes(changes)
+        except Exception:
+            self.remove(snapshot)
+            raise
+
+        logger.debug(
+            f"Snapshot {snapshot_id}: {snapshot.linked_files} linked, "
+            f"{snapshot.copied_files} copied, {len(snapshot.modified)} modified"
+        )
+        return snapshot
+
+    def remove(self, snapshot: PluginSnapshot) -> None:
+        """Delete a snapshot's tree and its tmpfs files."""
+        shutil.rmtree(snapshot.root, ignore_errors=True)
+        if snapshot.tmpfs_dir:
+            shutil.rmtree(snapshot.tmpfs_dir, ignore_errors=True)
+
+    @contextmanager
+    def snapshot(self, label: str, changes: list[dict] | None = None):
+        """Context manager yielding a snapshot that is removed on exit."""
+        snapshot = self.create(label, changes)
+        try:
+            yield snapshot
+        finally:
+            self.remove(snapshot)
+
+
+def score_candidates(
+    candidates: dict[str, list[dict]],
+    test_ids: list[str],
+    model: str = "haiku",
+    parallel: int = 1,
+    timeout: int = 600,
+    snapshotter: PluginSnapshotter | None = None,
+) -> dict[str, TestSuiteResult]:
+    """
+    Run the same tests against several candidate fixes at once.
+
+    Each candidate gets its own snapshot and pytest run; the working copy is
+    never modified.
+
+    Args:
+        candidates: Candidate label -> SkillEditor change dictionaries
+        test_ids: Test IDs to run for every candidate
+        model: Claude model to use
+        parallel: xdist workers per candidate run
+        timeout: Timeout in seconds for each candidate run
+        snapshotter: Snapshotter to use. If None, uses the default.
+
+    Returns:
+        Candidate label -> suite result
+    """
+    snapshotter = snapshotter or PluginSnapshotter()
+    runner = TestRunner(otel=False, progress_file=None)
+
+    def score(label: str) -> TestSuiteResult:
+        with snapshotter.snapshot(label, candidates[label]) as snap:
+            return runner.run_tests(
+                test_ids=test_ids,
+                model=model,
+                parallel=parallel,
+                timeout=timeout,
+                env=snap.env(),
+            )
+
+    if not candidates:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(candidates)) as executor:
+        return dict(zip(candidates, executor.map(score, candidates), strict=True))
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""Live progress and ETA reporting for long routing test runs."""
+
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Fallback per-case duration when there is no history (~17s per case)
+DEFAULT_CASE_DURATION_MS = 17_000
+
+# Completed cases needed before observed throughput calibrates the ETA
+CALIBRATION_MIN_CASES = 3
+
+
+@dataclass
+class ProgressSnapshot:
+    """Point-in-time view of a running suite."""
+
+    completed: int
+    total: int
+    passed: int
+    failed: int
+    skipped: int
+    elapsed_s: float
+    eta_s: float | None
+    throughput_per_min: float
+    concurrency: int
+    last_test_id: str = ""
+    last_status: str = ""
+    pid: int | None = None
+
+    @property
+    def percent(self) -> float:
+        """Completion percentage."""
+        return (self.completed / self.total * 100) if self.total else 0.0
+
+
+def format_duration(seconds: float | None) -> str:
+    """Format seconds as e.g. '14m05s' (or '?' when unknown)."""
+    if seconds is None:
+        return "?"
+    minutes, secs = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    if minutes:
+        return f"{minutes}m{secs:02d}s"
+    return f"{secs}s"
+
+
+class ProgressReporter:
+    """Tracks per-case completions and estimates remaining time.
+
+    The ETA starts from historical per-case durations spread over the
+    current concurrency, then is scaled by how fast cases actually complete
+    in this run once a few have finished.
+    """
+
+    def __init__(
+        self,
+        test_ids: list[str] | None = None,
+        total: int | None = None,
+        parallel: int = 1,
+        expected_durations_ms: dict[str, float] | None = None,
+        progress_file: Path | None = None,
+    ):
+        """Initialize progress reporter.
+
+        Args:
+            test_ids: Test IDs expected to run, if known
+            total: Expected number of cases (defaults to len(test_ids))
+            parallel: Number of concurrent workers
+            expected_durations_ms: Historical duration per test ID
+            progress_file: JSON file rewritten after every completion
+        """
+        self.pending = list(test_ids or [])
+        self.total = total if total is not None else len(self.pending)
+        self.parallel = max(1, parallel)
+        self.expected_durations_ms = expected_durations_ms or {}
+        self.progress_file = progress_file
+        self.pid: int | None = None
+
+        self.default_duration_ms = (
+            sum(self.expected_durations_ms.values()) / len(self.expected_durations_ms)
+            if self.expected_durations_ms
+            else DEFAULT_CASE_DURATION_MS
+        )
+
+        self.start_time = time.monotonic()
+        self.completed: list[str] = []
+        self.counts = {"PASSED": 0, "FAILED": 0, "SKIPPED": 0}
+        self._expected_done_ms = 0.0
+
+    def set_total(self, total: int) -> None:
+        """Update the expected case count (e.g. from pytest's collection line)."""
+        self.total = max(total, len(self.completed))
+
+    def _expected_ms(self, test_id: str) -> float:
+        return self.expected_durations_ms.get(test_id, self.default_duration_ms)
+
+    def _remaining_work_ms(self) -> float:
+        """Sum of expected durations for cases that have not completed."""
+        if self.pending:
+            return sum(self._expected_ms(t) for t in self.pending)
+        remaining = max(0, self.total - len(self.completed))
+        return remaining * self.default_duration_ms
+
+    def estimate_remaining_s(self) -> float | None:
+        """Estimate seconds until the suite completes."""
+        remaining_cases = max(0, self.total - len(self.completed))
+        if remaining_cases == 0:
+            return 0.0
+
+        concurrency = min(self.parallel, remaining_cases)
+        eta_s = self._remaining_work_ms() / 1000 / concurrency
+
+        # Calibrate against observed speed (rate limits, model, machine load)
+        if len(self.completed) >= CALIBRATION_MIN_CASES and self._expected_done_ms:
+            elapsed_s = time.monotonic() - self.start_time
+            expected_elapsed_s = self._expected_done_ms / 1000 / self.parallel
+            if expected_elapsed_s > 0:
+                eta_s *= min(4.0, max(0.25, elapsed_s / expected_elapsed_s))
+
+        return eta_s
+
+    def case_finished(self, test_id: str, status: str) -> ProgressSnapshot:
+        """Record a completed case and publish progress.
+
+        Args:
+            test_id: The test ID (e.g., "TC001")
+            status: PASSED, FAILED or SKIPPED
+
+        Returns:
+            Snapshot after this completion
+        """
+        if test_id in self.pending:
+            self.pending.remove(test_id)
+        self.completed.append(test_id)
+        self.counts[status] = self.counts.get(status, 0) + 1
+        self._expected_done_ms += self._expected_ms(test_id)
+        if len(self.completed) > self.total:
+            self.total = len(self.completed)
+
+        snapshot = self.snapshot(last_test_id=test_id, last_status=status)
+        self._publish(snapshot)
+        return snapshot
+
+    def snapshot(
+        self, last_test_id: str = "", last_status: str = ""
+    ) -> ProgressSnapshot:
+        """Build a snapshot of current progress."""
+        elapsed_s = time.monotonic() - self.start_time
+        throughput = len(self.completed) / elapsed_s * 60 if elapsed_s > 0 else 0.0
+        return ProgressSnapshot(
+            completed=len(self.completed),
+            total=self.total,
+            passed=self.counts.get("PASSED", 0),
+            failed=self.counts.get("FAILED", 0),
+            skipped=self.counts.get("SKIPPED", 0),
+            elapsed_s=elapsed_s,
+            eta_s=self.estimate_remaining_s(),
+            throughput_per_min=throughput,
+            concurrency=self.parallel,
+            last_test_id=last_test_id,
+            last_status=last_status,
+            pid=self.pid,
+        )
+
+    def _publish(self, snapshot: ProgressSnapshot) -> None:
+        """Log a progress line and rewrite the progress file."""
+        logger.info(
+            f"[{snapshot.completed}/{snapshot.total}] {snapshot.last_test_id} "
+            f"{snapshot.last_status} | {snapshot.passed} passed, "
+            f"{snapshot.failed} failed | {snapshot.throughput_per_min:.1f}/min | "
+            f"elapsed {format_duration(snapshot.elapsed_s)}, "
+            f"ETA {format_duration(snapshot.eta_s)}"
+        )
+        self.write_progress_file(snapshot)
+
+    def write_progress_file(self, snapshot: ProgressSnapshot) -> None:
+        """Atomically rewrite the progress file with a snapshot."""
+        if not self.progress_file:
+            return
+
+        data = asdict(snapshot)
+        data["percent"] = snapshot.percent
+        data["updated_at"] = time.time()
+
+        tmp_path = self.progress_file.with_suffix(".tmp")
+        try:
+            tmp_path.write_text(json.dumps(data, indent=2))
+            os.replace(tmp_path, self.progress_file)
+        except OSError as e:
+            logger.debug(f"Could not write progress file: {e}")
+
+    def finish(self) -> ProgressSnapshot:
+        """Publish the final snapshot."""
+        snapshot = self.snapshot()
+        self.write_progress_file(snapshot)
+        return snapshot
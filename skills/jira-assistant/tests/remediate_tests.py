@@ -12,7 +12,6 @@ This script iteratively fixes failing routing tests by:
 
 import argparse
 import logging
-import os
 import subprocess
 import sys
 from pathlib import Path
@@ -20,11 +19,16 @@ from pathlib import Path
 # Add tests directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+import telemetry_runtime
 from claude_analyzer import ClaudeAnalyzer, FixProposal, TestCase
+from cost_estimator import CostEstimate, CostEstimator, PlannedRun, format_estimate
+from otel_metrics import OTEL_AVAILABLE, get_resource_attributes
 from skill_editor import SkillEditor
 from state_tracker import StateTracker, TestStatus
 from test_runner import TestRunner, TestSuiteResult
 
+REMEDIATION_SERVICE_NAME = "routing-test-remediation"
+
 
 # Configure logging
 def setup_logging(
@@ -51,55 +55,36 @@ def setup_logging(
 
 
 # OpenTelemetry integration
-def setup_otel() -> bool:
-    """Set up OpenTelemetry if endpoint is available."""
-    endpoint = os.environ.get("OTEL_EXPORTER_OTLP_ENDPOINT")
-    if not endpoint:
-        return False
-
-    try:
-        from opentelemetry import metrics, trace
-        from opentelemetry.exporter.otlp.proto.http.metric_exporter import (
-            OTLPMetricExporter,
-        )
-        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
-            OTLPSpanExporter,
-        )
-        from opentelemetry.sdk.metrics import MeterProvider
-        from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
-        from opentelemetry.sdk.resources import Resource
-        from opentelemetry.sdk.trace import TracerProvider
-        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+def setup_otel(enabled: bool) -> bool:
+    """
+    Start this process's telemetry pipeline (see telemetry_runtime).
 
-        resource = Resource.create(
-            {
-                "service.name": "routing-test-remediation",
-                "service.version": "1.0.0",
-            }
-        )
-
-        # Traces
-        trace_provider = TracerProvider(resource=resource)
-        trace_provider.add_span_processor(
-            BatchSpanProcessor(OTLPSpanExporter(endpoint=f"{endpoint}/v1/traces"))
-        )
-        trace.set_tracer_provider(trace_provider)
-
-        # Metrics
-        metric_reader = PeriodicExportingMetricReader(
-            OTLPMetricExporter(endpoint=f"{endpoint}/v1/metrics"),
-            export_interval_millis=10000,
-        )
-        metrics.set_meter_provider(
-            MeterProvider(resource=resource, metric_readers=[metric_reader])
-        )
+    Remediation spans export to the same collector as the routing test
+    runs they launch, which continue the trace through $TRACEPARENT.
 
-        logging.info(f"OpenTelemetry configured with endpoint: {endpoint}")
-        return True
+    Args:
+        enabled: Whether the test runs export telemetry (TestRunner.otel)
 
-    except ImportError:
+    Returns:
+        True if telemetry is running
+    """
+    if not enabled:
+        return False
+    if not OTEL_AVAILABLE:
         logging.warning("OpenTelemetry packages not installed")
         return False
+
+    try:
+        # Probes git/CLI/version attributes once; every pytest run (and its
+        # xdist workers) inherits them through the environment
+        resource = {
+            **get_resource_attributes(),
+            "service.name": REMEDIATION_SERVICE_NAME,
+            "test.type": "remediation",
+        }
+        destination = telemetry_runtime.start(resource, export_interval_ms=10000)
+        logging.info(f"OpenTelemetry configured, exporting to {destination}")
+        return True
     except Exception as e:
         logging.warning(f"Failed to setup OpenTelemetry: {e}")
         return False
@@ -136,7 +121,6 @@ class RemediationEngine:
         self.suite_timeout = suite_timeout
 
         self.logger = setup_logging(log_file, verbose)
-        self.otel_enabled = setup_otel()
 
         self.state_tracker = StateTracker()
         self.skill_editor = SkillEditor()
@@ -145,16 +129,14 @@ class RemediationEngine:
             model=fast_model,
         )
         self.test_runner = TestRunner()
+        self.otel_enabled = setup_otel(self.test_runner.otel)
 
         # Track fix attempts for alternative proposals
         self.fix_attempts: dict[str, list[FixProposal]] = {}
 
         # OTel instruments
         if self.otel_enabled:
-            from opentelemetry import metrics, trace
-
-            self.tracer = trace.get_tracer(__name__)
-            meter = metrics.get_meter(__name__)
+            meter = telemetry_runtime.get_meter(__name__)
             self.tests_fixed_counter = meter.create_counter(
                 "tests_fixed", description="Number of tests fixed"
             )
@@ -165,15 +147,60 @@ class RemediationEngine:
                 "fix_attempts", description="Number of attempts to fix a test"
             )
 
+    def estimate(self) -> tuple[CostEstimate, list[str]]:
+        """Estimate one remediation pass from historical case results.
+
+        The plan is a fast-model suite run; for each case that failed its last
+        fast-model run, a fast check before and after the fix, a production
+        check and a fast-model regression suite; then the production
+        validation suite. Claude's fix-analysis sessions are not included.
+
+        Returns:
+            (estimate, IDs of the cases expected to need remediation)
+        """
+        estimator = CostEstimator()
+        all_ids = estimator.runnable_test_ids()
+        failing = estimator.recently_failing(self.fast_model)
+
+        plan = [PlannedRun(all_ids, self.fast_model, self.parallel)]
+        for test_id in failing:
+            plan += [
+                PlannedRun([test_id], self.fast_model),
+                PlannedRun([test_id], self.fast_model),
+                PlannedRun([test_id], self.production_model),
+                PlannedRun(all_ids, self.fast_model, self.parallel),
+            ]
+        plan.append(PlannedRun(all_ids, self.production_model, self.parallel))
+        return estimator.estimate_plan(plan), failing
+
     def run(self, resume: bool = False) -> bool:
         """Run the full remediation process.
 
+        With telemetry on, the run is one trace: a remediation_run span with
+        a span per iteration and per fix attempt, and the routing test
+        sessions each of them launches.
+
         Args:
             resume: Whether to resume from a previous run
 
         Returns:
             True if all tests pass, False otherwise
         """
+        with telemetry_runtime.span(
+            "remediation_run",
+            {
+                "remediation.fast_model": self.fast_model,
+                "remediation.production_model": self.production_model,
+                "remediation.max_attempts": self.max_attempts,
+            },
+        ) as span:
+            success = self._run(resume, span)
+            if span:
+                span.set_attribute("remediation.success", success)
+        return success
+
+    def _run(self, resume: bool, span) -> bool:
+        """Run the remediation loop (see run)."""
         self.logger.info("=" * 60)
         self.logger.info("Starting Automated Test Remediation")
         self.logger.info("=" * 60)
@@ -187,86 +214,92 @@ class RemediationEngine:
         else:
             state = self.state_tracker.reset(max_attempts=self.max_attempts)
             self.logger.info(f"Starting new run {state.run_id}")
+        if span:
+            span.set_attribute("remediation.run_id", state.run_id)
 
         iteration = 0
         max_iterations = 10  # Safety limit
 
         while iteration < max_iterations:
             iteration += 1
-            self.state_tracker.state.iteration = iteration
-            self.state_tracker.save()
+            with telemetry_runtime.span(
+                "remediation_iteration", {"remediation.iteration": iteration}
+            ):
+                self.state_tracker.state.iteration = iteration
+                self.state_tracker.save()
+
+                self.logger.info(f"\n{'=' * 60}")
+                self.logger.info(f"ITERATION {iteration}")
+                self.logger.info(f"{'=' * 60}")
+
+                # Run initial/current test suite
+                self.logger.info("Running full test suite (fast mode)...")
+                suite_result = self.test_runner.run_full_suite(
+                    model=self.fast_model,
+                    parallel=self.parallel,
+                    timeout=self.suite_timeout,
+                )
 
-            self.logger.info(f"\n{'=' * 60}")
-            self.logger.info(f"ITERATION {iteration}")
-            self.logger.info(f"{'=' * 60}")
+                if suite_result.error:
+                    self.logger.error(f"Test suite error: {suite_result.error}")
+                    return False
+
+                # Update baseline on first iteration
+                if iteration == 1:
+                    passing_ids = [r.test_id for r in suite_result.passed]
+                    failing_ids = [r.test_id for r in suite_result.failed]
+                    self.state_tracker.set_baseline(passing_ids, failing_ids)
+                    self.logger.info(
+                        f"Baseline: {len(passing_ids)} passing, {len(failing_ids)} failing"
+                    )
+
+                # Check if all tests pass
+                if suite_result.all_passed:
+                    self.logger.info("\n" + "=" * 60)
+                    self.logger.info("ALL TESTS PASSING!")
+                    self.logger.info("=" * 60)
+                    self.state_tracker.mark_completed()
+                    return True
+
+                # Update current failures
+                failing_ids = [r.test_id for r in suite_result.failed]
+                self.state_tracker.update_current_failures(failing_ids)
 
-            # Run initial/current test suite
-            self.logger.info("Running full test suite (fast mode)...")
-            suite_result = self.test_runner.run_full_suite(
-                model=self.fast_model,
-                parallel=self.parallel,
-                timeout=self.suite_timeout,
-            )
+                # Get pending tests
+                pending = self.state_tracker.get_pending_tests()
+                if not pending:
+                    self.logger.info("No more tests to remediate")
+                    break
 
-            if suite_result.error:
-                self.logger.error(f"Test suite error: {suite_result.error}")
-                return False
+                self.logger.info(f"\nTests to remediate: {len(pending)}")
 
-            # Update baseline on first iteration
-            if iteration == 1:
-                passing_ids = [r.test_id for r in suite_result.passed]
-                failing_ids = [r.test_id for r in suite_result.failed]
-                self.state_tracker.set_baseline(passing_ids, failing_ids)
-                self.logger.info(
-                    f"Baseline: {len(passing_ids)} passing, {len(failing_ids)} failing"
-                )
+                # Remediate each failing test (a span per fix attempt)
+                for test_id in pending:
+                    if not self._remediate_test(test_id):
+                        self.logger.warning(f"Could not fix {test_id}")
 
-            # Check if all tests pass
-            if suite_result.all_passed:
-                self.logger.info("\n" + "=" * 60)
-                self.logger.info("ALL TESTS PASSING!")
-                self.logger.info("=" * 60)
-                self.state_tracker.mark_completed()
-                return True
-
-            # Update current failures
-            failing_ids = [r.test_id for r in suite_result.failed]
-            self.state_tracker.update_current_failures(failing_ids)
-
-            # Get pending tests
-            pending = self.state_tracker.get_pending_tests()
-            if not pending:
-                self.logger.info("No more tests to remediate")
-                break
-
-            self.logger.info(f"\nTests to remediate: {len(pending)}")
-
-            # Remediate each failing test
-            for test_id in pending:
-                if not self._remediate_test(test_id):
-                    self.logger.warning(f"Could not fix {test_id}")
-
-            # Check if any progress was made
-            if iteration > 1:
-                prev_failures = len(self.state_tracker.state.initial_failures)
-                curr_failures = len(failing_ids)
-                if curr_failures >= prev_failures:
-                    self.logger.warning("No progress made this iteration")
+                # Check if any progress was made
+                if iteration > 1:
+                    prev_failures = len(self.state_tracker.state.initial_failures)
+                    curr_failures = len(failing_ids)
+                    if curr_failures >= prev_failures:
+                        self.logger.warning("No progress made this iteration")
 
         # Final production validation
         self.logger.info("\nRunning final production validation...")
-        final_result = self.test_runner.run_full_suite(
-            model=self.production_model,
-            parallel=self.parallel,
-            timeout=self.suite_timeout,
-        )
+        with telemetry_runtime.span("remediation_validation"):
+            final_result = self.test_runner.run_full_suite(
+                model=self.production_model,
+                parallel=self.parallel,
+                timeout=self.suite_timeout,
+            )
 
         self._print_summary(final_result)
 
         return final_result.all_passed
 
     def _remediate_test(self, test_id: str) -> bool:
-        """Attempt to remediate a single failing test.
+        """Attempt to remediate a single failing test (in a fix attempt span).
 
         Args:
             test_id: The test ID to remediate
@@ -274,6 +307,18 @@ class RemediationEngine:
         Returns:
             True if test was fixed, False otherwise
         """
+        attempt = self.state_tracker.get_test_state(test_id).attempts + 1
+        with telemetry_runtime.span(
+            "remediation_fix_attempt",
+            {"test.id": test_id, "remediation.attempt": attempt},
+        ) as span:
+            fixed = self._attempt_fix(test_id)
+            if span:
+                span.set_attribute("remediation.fixed", fixed)
+        return fixed
+
+    def _attempt_fix(self, test_id: str) -> bool:
+        """Analyze, apply and validate one fix (see _remediate_test)."""
         self.logger.info(f"\n--- Remediating {test_id} ---")
 
         # Get test info
@@ -705,6 +750,9 @@ Examples:
 
   # Use 8 parallel workers with longer timeout
   python remediate_tests.py --parallel 8 --suite-timeout 3600
+
+  # Predict cost and duration without running anything
+  python remediate_tests.py --estimate-only
 """,
     )
 
@@ -752,6 +800,11 @@ Examples:
         action="store_true",
         help="Enable verbose logging",
     )
+    parser.add_argument(
+        "--estimate-only",
+        action="store_true",
+        help="Print the predicted cost and duration of one pass, then exit",
+    )
 
     args = parser.parse_args()
 
@@ -765,7 +818,20 @@ Examples:
         verbose=args.verbose,
     )
 
-    success = engine.run(resume=args.resume)
+    # Flush the run's spans even when it fails or is interrupted
+    try:
+        if args.estimate_only:
+            estimate, failing = engine.estimate()
+            print(format_estimate(estimate))
+            print(
+                f"  ({len(failing)} case(s) failed their last {args.fast_model} "
+                "run; excludes fix-analysis sessions)"
+            )
+            sys.exit(0)
+
+        success = engine.run(resume=args.resume)
+    finally:
+        telemetry_runtime.shutdown()
 
     sys.exit(0 if success else 1)
 
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""Local SQLite store of per-case routing test results.
+
+Every routing case recorded through the ``record_otel`` fixture is appended
+here, independent of OpenTelemetry. The history feeds tooling that needs
+per-case durations and costs (progress ETA, estimators, reports) without a
+metrics backend. SQLite in WAL mode lets xdist workers write concurrently.
+"""
+
+import os
+import sqlite3
+import statistics
+import time
+from contextlib import closing
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+
+TESTS_DIR = Path(__file__).parent
+DEFAULT_DB_PATH = TESTS_DIR / ".routing_results.db"
+
+# Environment override for the store location ("" disables recording)
+RESULTS_DB_ENV_VAR = "ROUTING_RESULTS_DB"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS case_results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    test_id TEXT NOT NULL,
+    category TEXT NOT NULL DEFAULT '',
+    model TEXT NOT NULL DEFAULT 'default',
+    expected_skill TEXT NOT NULL DEFAULT '',
+    actual_skill TEXT NOT NULL DEFAULT '',
+    passed INTEGER NOT NULL,
+    asked_clarification INTEGER NOT NULL DEFAULT 0,
+    duration_ms INTEGER NOT NULL DEFAULT 0,
+    wall_ms INTEGER NOT NULL DEFAULT 0,
+    cost_usd REAL NOT NULL DEFAULT 0.0,
+    coalesced INTEGER NOT NULL DEFAULT 0,
+    worker_id TEXT NOT NULL DEFAULT 'main',
+    started_at REAL NOT NULL DEFAULT 0.0,
+    finished_at REAL NOT NULL DEFAULT 0.0
+);
+CREATE INDEX IF NOT EXISTS idx_case_results_test_model
+    ON case_results (test_id, model);
+CREATE INDEX IF NOT EXISTS idx_case_results_run
+    ON case_results (run_id);
+CREATE TABLE IF NOT EXISTS skill_tree_evaluations (
+    tree_hash TEXT NOT NULL,
+    test_id TEXT NOT NULL,
+    model TEXT NOT NULL,
+    samples INTEGER NOT NULL DEFAULT 0,
+    passes INTEGER NOT NULL DEFAULT 0,
+    commit_sha TEXT NOT NULL DEFAULT '',
+    updated_at REAL NOT NULL DEFAULT 0.0,
+    PRIMARY KEY (tree_hash, test_id, model)
+);
+"""
+
+
+@dataclass
+class CaseRecord:
+    """One executed routing case."""
+
+    run_id: str
+    test_id: str
+    passed: bool
+    category: str = ""
+    model: str = "default"
+    expected_skill: str = ""
+    actual_skill: str = ""
+    asked_clarification: bool = False
+    duration_ms: int = 0  # Claude session duration reported by the CLI
+    wall_ms: int = 0  # Harness wall-clock time for the whole case
+    cost_usd: float = 0.0
+    # Served from an identical request's session: no session time or cost
+    # of its own, so it is not a sample of the case's duration or cost
+    coalesced: bool = False
+    worker_id: str = "main"
+    started_at: float = 0.0
+    finished_at: float = 0.0
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "CaseRecord":
+        """Create from a database row."""
+        data = {f.name: row[f.name] for f in fields(cls)}
+        data["passed"] = bool(data["passed"])
+        data["asked_clarification"] = bool(data["asked_clarification"])
+        data["coalesced"] = bool(data["coalesced"])
+        return cls(**data)
+
+
+@dataclass
+class TreeEvaluation:
+    """Aggregated samples of one test against one skills tree."""
+
+    tree_hash: str
+    test_id: str
+    model: str
+    samples: int = 0
+    passes: int = 0
+    commit_sha: str = ""
+    updated_at: float = 0.0
+
+    @property
+    def pass_rate(self) -> float:
+        """Fraction of samples that passed (0.0 if none)."""
+        return self.passes / self.samples if self.samples else 0.0
+
+
+def default_db_path() -> Path | None:
+    """Resolve the store location, honouring ``ROUTING_RESULTS_DB``."""
+    override = os.environ.get(RESULTS_DB_ENV_VAR)
+    if override is None:
+        return DEFAULT_DB_PATH
+    return Path(override) if override else None
+
+
+class ResultsStore:
+    """Append-only store of routing case results."""
+
+    def __init__(self, db_path: str | Path | None = None):
+        """Initialize results store.
+
+        Args:
+            db_path: Path to the SQLite file. If None, uses default_db_path().
+        """
+        self.db_path = Path(db_path) if db_path else default_db_path()
+        if self.db_path is None:
+            raise ValueError(f"Results store disabled via {RESULTS_DB_ENV_VAR}")
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection, creating the schema on first use."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._initialized = True
+        return conn
+
+    def record_case(self, record: CaseRecord) -> None:
+        """Append a case result."""
+        data = asdict(record)
+        columns = ", ".join(data)
+        placeholders = ", ".join(f":{name}" for name in data)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                f"INSERT INTO case_results ({columns}) VALUES ({placeholders})",
+                data,
+            )
+
+    def get_tree_evaluation(
+        self, tree_hash: str, test_id: str, model: str
+    ) -> TreeEvaluation | None:
+        """Get cached samples of a test against a skills tree."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT * FROM skill_tree_evaluations "
+                "WHERE tree_hash = ? AND test_id = ? AND model = ?",
+                (tree_hash, test_id, model),
+            ).fetchone()
+        if row is None:
+            return None
+        return TreeEvaluation(**{f.name: row[f.name] for f in fields(TreeEvaluation)})
+
+    def add_tree_samples(
+        self,
+        tree_hash: str,
+        test_id: str,
+        model: str,
+        samples: int,
+        passes: int,
+        commit_sha: str = "",
+    ) -> TreeEvaluation:
+        """Add samples of a test against a skills tree to the cache."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO skill_tree_evaluations "
+                "(tree_hash, test_id, model, samples, passes, commit_sha, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (tree_hash, test_id, model) DO UPDATE SET "
+                "samples = samples + excluded.samples, "
+                "passes = passes + excluded.passes, "
+                "updated_at = excluded.updated_at",
+                (tree_hash, test_id, model, samples, passes, commit_sha, time.time()),
+            )
+        return self.get_tree_evaluation(tree_hash, test_id, model)
+
+    def run_results(self, run_id: str) -> list[CaseRecord]:
+        """Get all case results for a run, in completion order."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT * FROM case_results WHERE run_id = ? ORDER BY finished_at",
+                (run_id,),
+            ).fetchall()
+        return [CaseRecord.from_row(row) for row in rows]
+
+    def latest_run_id(self) -> str | None:
+        """Get the ID of the run with the most recently finished case."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT run_id FROM case_results ORDER BY finished_at DESC LIMIT 1"
+            ).fetchone()
+        return row[0] if row else None
+
+    def total_cost(self, run_id_prefix: str) -> float:
+        """Get the summed cost of all runs whose ID starts with a prefix."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT COALESCE(SUM(cost_usd), 0) FROM case_results "
+                "WHERE substr(run_id, 1, ?) = ?",
+                (len(run_id_prefix), run_id_prefix),
+            ).fetchone()
+        return float(row[0])
+
+    def case_history(
+        self,
+        model: str | None = None,
+        limit_per_case: int = 20,
+    ) -> dict[str, list[CaseRecord]]:
+        """Get the most recent results per test ID, newest first.
+
+        Args:
+            model: Only include results for this model. If None, all models.
+            limit_per_case: Maximum results kept per test ID
+
+        Returns:
+            Mapping of test ID to its recent results
+        """
+        query = "SELECT * FROM case_results"
+        params: tuple = ()
+        if model:
+            query += " WHERE model = ?"
+            params = (model,)
+        query += " ORDER BY finished_at DESC"
+
+        history: dict[str, list[CaseRecord]] = {}
+        with closing(self._connect()) as conn:
+            for row in conn.execute(query, params):
+                records = history.setdefault(row["test_id"], [])
+                if len(records) < limit_per_case:
+                    records.append(CaseRecord.from_row(row))
+        return history
+
+    def median_wall_ms(self, model: str | None = None) -> dict[str, float]:
+        """Get the median harness wall time per test ID (coalesced runs excluded)."""
+        medians = {}
+        for test_id, records in self.case_history(model).items():
+            walls = [r.wall_ms for r in records if not r.coalesced]
+            if walls:
+                medians[test_id] = statistics.median(walls)
+        return medians
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""Find the SKILL.md commit that broke a routing test.
+
+Binary-searches the commits between a known-good commit and a bad one
+(HEAD by default) that touch ``skills/*/SKILL.md``. Each candidate commit is
+checked out into a temporary git worktree, which is used as the plugin dir
+(``CLAUDE_PLUGIN_DIR``) while the *current* golden case runs against it.
+
+Routing is not deterministic, so each commit can be sampled several times
+and judged by pass rate. Results are cached in the results store per
+(skill files hash, test, model): commits with identical SKILL.md files and
+plugin manifest share results, and repeated bisects reuse every earlier
+evaluation.
+
+Usage:
+    # Which commit since v1.2.0 broke TC012?
+    python routing_bisect.py --test TC012 --good v1.2.0
+
+    # Sample each commit 3 times with the production model
+    python routing_bisect.py --test TC012 --good abc1234 --model sonnet --samples 3
+"""
+
+import argparse
+import hashlib
+import logging
+import subprocess
+import sys
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+# Add tests directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from results_store import ResultsStore, TreeEvaluation
+from test_runner import TestRunner
+
+logger = logging.getLogger(__name__)
+
+TESTS_DIR = Path(__file__).parent
+
+# Commits are only candidates if they change one of these paths
+SKILL_PATHSPEC = "skills/*/SKILL.md"
+
+# Plugin manifest, which decides how the skills are loaded
+PLUGIN_MANIFEST = ".claude-plugin/plugin.json"
+
+
+@dataclass
+class CommitVerdict:
+    """Evaluation of one commit during a bisect."""
+
+    commit_sha: str
+    subject: str
+    evaluation: TreeEvaluation
+    passed: bool
+    cached: bool = False
+
+
+@dataclass
+class BisectResult:
+    """Outcome of a bisect."""
+
+    test_id: str
+    model: str
+    first_bad: CommitVerdict | None
+    verdicts: list[CommitVerdict]
+    message: str
+
+
+def _git(repo_root: Path, *args: str) -> str:
+    result = subprocess.run(
+        ["git", *args],
+        cwd=repo_root,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip()
+
+
+class RoutingBisector:
+    """Bisects SKILL.md history for a single failing routing test."""
+
+    def __init__(
+        self,
+        test_id: str,
+        model: str = "haiku",
+        samples: int = 1,
+        pass_threshold: float = 0.5,
+        timeout: int = 300,
+        repo_root: Path | None = None,
+        store: ResultsStore | None = None,
+    ):
+        """Initialize bisector.
+
+        Args:
+            test_id: Golden test ID to bisect (e.g., "TC012")
+            model: Claude model to use
+            samples: Runs per commit (more samples for flaky cases)
+            pass_threshold: Minimum pass rate for a commit to count as good
+            timeout: Timeout in seconds for each run
+            repo_root: Git repository root. If None, detected from this file.
+            store: Results store holding the evaluation cache
+        """
+        self.test_id = test_id
+        self.model = model
+        self.samples = max(1, samples)
+        self.pass_threshold = pass_threshold
+        self.timeout = timeout
+        self.repo_root = repo_root or Path(
+            _git(TESTS_DIR, "rev-parse", "--show-toplevel")
+        )
+        self.store = store or ResultsStore()
+        self.test_runner = TestRunner(otel=False, progress_file=None)
+
+    def candidate_commits(self, good: str, bad: str) -> list[str]:
+        """List commits after ``good`` up to ``bad`` that change SKILL.md, oldest first."""
+        output = _git(
+            self.repo_root,
+            "rev-list",
+            "--reverse",
+            "--ancestry-path",
+            f"{good}..{bad}",
+            "--",
+            SKILL_PATHSPEC,
+        )
+        return output.split() if output else []
+
+    def skill_files_hash(self, commit: str) -> str:
+        """Hash of the SKILL.md and manifest blobs at a commit (the cache key).
+
+        Only the files routing depends on are hashed, so commits that change
+        scripts, docs or tests under skills/ share their evaluations.
+        """
+        entries = _git(
+            self.repo_root,
+            "ls-tree",
+            "-r",
+            "--full-tree",
+            commit,
+            "--",
+            "skills",
+            PLUGIN_MANIFEST,
+        )
+        relevant = sorted(
+            line
+            for line in entries.splitlines()
+            if Path(line.split("\t", 1)[1]).match(SKILL_PATHSPEC)
+            or line.endswith(f"\t{PLUGIN_MANIFEST}")
+        )
+        return hashlib.sha256("\n".join(relevant).encode()).hexdigest()
+
+    def _run_sample(self, plugin_dir: Path, commit: str, index: int) -> bool | None:
+        """Run the test once against a plugin checkout (None if inconclusive)."""
+        suite = self.test_runner.run_tests(
+            test_ids=[self.test_id],
+            model=self.model,
+            timeout=self.timeout,
+            env={
+                "CLAUDE_PLUGIN_DIR": str(plugin_dir),
+                "ROUTING_RUN_ID": f"bisect-{commit[:8]}-{uuid.uuid4().hex[:6]}",
+            },
+        )
+        if any(r.test_id == self.test_id for r in suite.passed):
+            return True
+        if any(r.test_id == self.test_id for r in suite.failed):
+            return False
+        logger.warning(
+            f"{commit[:8]} sample {index + 1}: no result for {self.test_id}"
+            + (f" ({suite.error})" if suite.error else "")
+        )
+        return None
+
+    def _sample_commit(self, commit: str, count: int) -> tuple[int, int]:
+        """Run ``count`` samples against a worktree of ``commit``."""
+        with tempfile.TemporaryDirectory(prefix="routing-bisect-") as tmp:
+            worktree = Path(tmp) / "plugin"
+            _git(self.repo_root, "worktree", "add", "--detach", str(worktree), commit)
+            try:
+                with ThreadPoolExecutor(max_workers=count) as executor:
+                    outcomes = list(
+                        executor.map(
+                            lambda i: self._run_sample(worktree, commit, i),
+                            range(count),
+                        )
+                    )
+            finally:
+                _git(self.repo_root, "worktree", "remove", "--force", str(worktree))
+
+        conclusive = [o for o in outcomes if o is not None]
+        return len(conclusive), sum(conclusive)
+
+    def evaluate(self, commit: str) -> CommitVerdict:
+        """Judge a commit, topping up cached samples as needed."""
+        sha = _git(self.repo_root, "rev-parse", commit)
+        subject = _git(self.repo_root, "log", "-1", "--format=%s", sha)
+        tree_hash = self.skill_files_hash(sha)
+
+        evaluation = self.store.get_tree_evaluation(tree_hash, self.test_id, self.model)
+        cached = evaluation is not None and evaluation.samples >= self.samples
+        if not cached:
+            needed = self.samples - (evaluation.samples if evaluation else 0)
+            logger.info(f"{sha[:8]}: running {needed} sample(s) - {subject}")
+            samples, passes = self._sample_commit(sha, needed)
+            if samples == 0 and evaluation is None:
+                raise RuntimeError(
+                    f"No conclusive result for {self.test_id} at {sha[:8]}"
+                )
+            evaluation = self.store.add_tree_samples(
+                tree_hash, self.test_id, self.model, samples, passes, sha
+            )
+
+        verdict = CommitVerdict(
+            commit_sha=sha,
+            subject=subject,
+            evaluation=evaluation,
+            passed=evaluation.pass_rate >= self.pass_threshold,
+            cached=cached,
+        )
+        logger.info(
+            f"{sha[:8]}: {'good' if verdict.passed else 'bad'} "
+            f"({evaluation.passes}/{evaluation.samples} passed"
+            f"{', cached' if cached else ''})"
+        )
+        return verdict
+
+    def bisect(self, good: str, bad: str = "HEAD", verify_good: bool = False):
+        """
+        Find the first SKILL.md commit after ``good`` where the test fails.
+
+        Args:
+            good: Commit where the test is known to pass
+            bad: Commit where the test fails (default: HEAD)
+            verify_good: Also evaluate ``good`` instead of trusting it
+
+        Returns:
+            BisectResult naming the first bad commit, if one was found
+        """
+        verdicts: list[CommitVerdict] = []
+
+        def result(first_bad: CommitVerdict | None, message: str) -> BisectResult:
+            return BisectResult(self.test_id, self.model, first_bad, verdicts, message)
+
+        candidates = self.candidate_commits(good, bad)
+        if not candidates:
+            return result(None, f"No commits touch {SKILL_PATHSPEC} in {good}..{bad}")
+
+        if verify_good:
+            good_verdict = self.evaluate(good)
+            verdicts.append(good_verdict)
+            if not good_verdict.passed:
+                return result(None, f"{self.test_id} also fails at good commit {good}")
+
+        # The newest candidate has the same SKILL.md files as ``bad``
+        last = self.evaluate(candidates[-1])
+        verdicts.append(last)
+        if last.passed:
+            return result(
+                None,
+                f"{self.test_id} passes with the SKILL.md files at {bad}; "
+                "the failure is not caused by a SKILL.md change",
+            )
+
+        # Invariant: candidates[lo] is good (or ``good`` when lo == -1),
+        # candidates[hi] is bad
+        lo, hi = -1, len(candidates) - 1
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            verdict = self.evaluate(candidates[mid])
+            verdicts.append(verdict)
+            if verdict.passed:
+                lo = mid
+            else:
+                hi = mid
+
+        first_bad = next(v for v in verdicts if v.commit_sha == candidates[hi])
+        return result(
+            first_bad,
+            f"First bad commit: {first_bad.commit_sha[:8]} {first_bad.subject}",
+        )
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Find the SKILL.md commit that broke a routing test",
+    )
+    parser.add_argument("--test", required=True, help="Failing test ID (e.g., TC012)")
+    parser.add_argument("--good", required=True, help="Commit where the test passed")
+    parser.add_argument(
+        "--bad", default="HEAD", help="Commit where the test fails (default: HEAD)"
+    )
+    parser.add_argument(
+        "--model", default="haiku", help="Claude model to use (default: haiku)"
+    )
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=1,
+        help="Runs per commit, for flaky cases (default: 1)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.5,
+        help="Minimum pass rate for a commit to count as good (default: 0.5)",
+    )
+    parser.add_argument(
+        "--verify-good",
+        action="store_true",
+        help="Evaluate the good commit too instead of trusting it",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Enable verbose logging",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+    bisector = RoutingBisector(
+        test_id=args.test,
+        model=args.model,
+        samples=args.samples,
+        pass_threshold=args.threshold,
+    )
+    result = bisector.bisect(args.good, args.bad, verify_good=args.verify_good)
+
+    # Evaluation order jumps around the range; report good -> bad instead
+    history = {
+        sha: index
+        for index, sha in enumerate(bisector.candidate_commits(args.good, args.bad))
+    }
+    print(f"\n{result.message}")
+    for verdict in sorted(result.verdicts, key=lambda v: history.get(v.commit_sha, -1)):
+        ev = verdict.evaluation
+        print(
+            f"  {verdict.commit_sha[:8]} {'good' if verdict.passed else 'BAD '} "
+            f"{ev.passes}/{ev.samples}{' (cached)' if verdict.cached else ''}  "
+            f"{verdict.subject}"
+        )
+    if result.first_bad:
+        print(
+            f"\nInspect with: git show {result.first_bad.commit_sha[:8]} "
+            f"-- '{SKILL_PATHSPEC}'"
+        )
+
+    sys.exit(0 if result.first_bad else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""Watch skill descriptions and re-run the routing cases they affect.
+
+Watches ``skills/*/SKILL.md`` and ``routing_golden.yaml``. Saves are
+debounced (editors often write a file several times per save), then only the
+impacted cases run:
+
+- A skill's SKILL.md: every case that names the skill (expected, not-skill,
+  disambiguation option, alternate or workflow step)
+- The router's own SKILL.md (jira-assistant): every case
+- routing_golden.yaml: cases that were added or changed
+
+If a save lands while a run is still going and the run has unfinished cases
+that the save affects, those Claude sessions are stale: the run is cancelled
+(SIGINT to its process group, so pytest cleans up) and restarted with the
+new cases plus the ones it had not finished.
+
+Uses watchdog (inotify on Linux) when installed, otherwise polls mtimes.
+
+Usage:
+    python routing_watch.py --model haiku
+    python routing_watch.py --model haiku --parallel 2
+
+    # Or via the fast iteration runner
+    ./fast_test.sh --watch --fast
+"""
+
+import argparse
+import logging
+import os
+import queue
+import signal
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import yaml
+
+# Add tests directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from golden_set import GOLDEN_FILE, case_skills, load_golden_cases
+from test_runner import TestRunner
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+    WATCHDOG_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+TESTS_DIR = Path(__file__).parent
+SKILLS_DIR = TESTS_DIR.parent.parent
+
+# The router skill; its description affects every case
+ROUTER_SKILL = "jira-assistant"
+
+# Quiet period after the last save before a run starts
+DEBOUNCE_S = 0.75
+
+# Mtime scan interval when watchdog is not installed
+POLL_INTERVAL_S = 0.5
+
+# Time a cancelled run gets to shut down before it is killed
+CANCEL_GRACE_S = 5.0
+
+# pytest's short summary line for a failure (reported with -rf, the default)
+FAILED_SUMMARY_PREFIX = "FAILED test_routing.py::"
+
+
+def is_watched(path: Path, skills_dir: Path = SKILLS_DIR) -> bool:
+    """Check whether a path is a skill description or the golden set."""
+    if path.name == GOLDEN_FILE.name:
+        return path.parent == TESTS_DIR
+    return path.name == "SKILL.md" and path.parent.parent == skills_dir
+
+
+class _ChangeHandler(FileSystemEventHandler):
+    """Forwards watchdog events for watched files to a queue."""
+
+    def __init__(self, changes: queue.Queue):
+        self.changes = changes
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        for attr in ("src_path", "dest_path"):
+            path = getattr(event, attr, None)
+            if path and is_watched(Path(path)):
+                self.changes.put(Path(path))
+
+
+class _MtimePoller(threading.Thread):
+    """Fallback watcher that compares mtimes of the watched files."""
+
+    def __init__(self, changes: queue.Queue):
+        super().__init__(daemon=True)
+        self.changes = changes
+        self._mtimes = self._scan()
+
+    def _scan(self) -> dict[Path, float]:
+        paths = [*SKILLS_DIR.glob("*/SKILL.md"), GOLDEN_FILE]
+        mtimes = {}
+        for path in paths:
+            try:
+                mtimes[path] = path.stat().st_mtime
+            except FileNotFoundError:
+                pass
+        return mtimes
+
+    def run(self):
+        while True:
+            time.sleep(POLL_INTERVAL_S)
+            current = self._scan()
+            for path, mtime in current.items():
+                if self._mtimes.get(path) != mtime:
+                    self.changes.put(path)
+            self._mtimes = current
+
+
+class CaseRun:
+    """A pytest run over a set of routing cases, streamed as it goes."""
+
+    def __init__(self, case_ids: set[str], model: str | None, parallel: int):
+        self.case_ids = set(case_ids)
+        self.results: dict[str, str] = {}
+        self.failures: dict[str, str] = {}
+        self.started_at = time.monotonic()
+        self._parser = TestRunner(otel=False, progress_file=None)
+
+        cmd = [
+            "pytest",
+            str(TestRunner.TEST_FILE),
+            "-v",
+            "--tb=no",
+            "-k",
+            " or ".join(sorted(self.case_ids)),
+        ]
+        if model:
+            cmd.extend(["--model", model])
+        if parallel > 1:
+            cmd.extend(["-n", str(parallel)])
+
+        self.proc = subprocess.Popen(
+            cmd,
+            cwd=TESTS_DIR,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            # Own process group, so cancelling also stops Claude sessions
+            start_new_session=True,
+        )
+        self._reader = threading.Thread(target=self._pump, daemon=True)
+        self._reader.start()
+
+    def _pump(self) -> None:
+        for line in self.proc.stdout:
+            if line.startswith(FAILED_SUMMARY_PREFIX) and " - " in line:
+                node, reason = line.rstrip().split(" - ", 1)
+                self.failures[node.rsplit("[", 1)[-1].rstrip("]")] = reason
+                continue
+            result = self._parser._match_result_line(line)
+            if result and result[0] not in self.results:
+                test_id, status = result
+                self.results[test_id] = status
+                print(f"  {status:<7} {test_id}", flush=True)
+
+    @property
+    def running(self) -> bool:
+        """Whether the pytest process is still running."""
+        return self.proc.poll() is None
+
+    @property
+    def unfinished(self) -> set[str]:
+        """Cases without a result yet."""
+        return self.case_ids - set(self.results)
+
+    def cancel(self) -> None:
+        """Interrupt the run and every session it started."""
+        if not self.running:
+            return
+        if hasattr(os, "killpg"):
+            os.killpg(self.proc.pid, signal.SIGINT)
+        else:  # pragma: no cover - Windows
+            self.proc.terminate()
+        try:
+            self.proc.wait(timeout=CANCEL_GRACE_S)
+        except subprocess.TimeoutExpired:
+            if hasattr(os, "killpg"):
+                os.killpg(self.proc.pid, signal.SIGKILL)
+            else:  # pragma: no cover - Windows
+                self.proc.kill()
+            self.proc.wait()
+        self._reader.join(timeout=CANCEL_GRACE_S)
+
+    def wait(self) -> None:
+        """Wait for the output to be fully read."""
+        self.proc.wait()
+        self._reader.join()
+
+
+class RoutingWatcher:
+    """Re-runs impacted routing cases whenever a watched file is saved."""
+
+    def __init__(
+        self,
+        model: str | None = None,
+        parallel: int = 1,
+        debounce_s: float = DEBOUNCE_S,
+        use_polling: bool = False,
+    ):
+        """Initialize watcher.
+
+        Args:
+            model: Claude model passed to pytest (None for the suite default)
+            parallel: xdist workers per run
+            debounce_s: Quiet period after a save before running
+            use_polling: Poll mtimes even if watchdog is available
+        """
+        self.model = model
+        self.parallel = parallel
+        self.debounce_s = debounce_s
+        self.use_polling = use_polling or not WATCHDOG_AVAILABLE
+        self.changes: queue.Queue[Path] = queue.Queue()
+        self.golden = load_golden_cases()
+        self.last_status: dict[str, str] = {}
+
+    def impacted_cases(self, paths: set[Path]) -> set[str]:
+        """Map changed files to the cases that need to run again."""
+        impacted: set[str] = set()
+        for path in paths:
+            if path.name == GOLDEN_FILE.name:
+                try:
+                    current = load_golden_cases()
+                except (OSError, yaml.YAMLError) as e:
+                    print(f"Skipping {path.name}: {e}")
+                    continue
+                impacted.update(
+                    case_id
+                    for case_id, case in current.items()
+                    if self.golden.get(case_id) != case
+                )
+                self.golden = current
+                continue
+
+            skill = path.parent.name
+            if skill == ROUTER_SKILL:
+                impacted.update(self.golden)
+                continue
+            impacted.update(
+                case_id
+                for case_id, case in self.golden.items()
+                if skill in case_skills(case)
+            )
+        return impacted
+
+    def _start_observer(self):
+        if self.use_polling:
+            poller = _MtimePoller(self.changes)
+            poller.start()
+            return None
+        observer = Observer()
+        handler = _ChangeHandler(self.changes)
+        observer.schedule(handler, str(SKILLS_DIR), recursive=True)
+        observer.start()
+        return observer
+
+    def _next_batch(self, block: bool) -> set[Path]:
+        """Collect changed paths once saves have been quiet for the debounce period."""
+        try:
+            first = self.changes.get(timeout=None if block else 0.2)
+        except queue.Empty:
+            return set()
+        batch = {first}
+        while True:
+            try:
+                batch.add(self.changes.get(timeout=self.debounce_s))
+            except queue.Empty:
+                return batch
+
+    def _report(self, run: CaseRun) -> None:
+        elapsed = time.monotonic() - run.started_at
+        counts = {
+            status: sum(1 for s in run.results.values() if s == status)
+            for status in ("PASSED", "FAILED", "SKIPPED")
+        }
+        for test_id, reason in sorted(run.failures.items()):
+            print(f"  {test_id}: {reason}")
+        changed = [
+            f"{test_id} {self.last_status[test_id]} -> {status}"
+            for test_id, status in sorted(run.results.items())
+            if self.last_status.get(test_id, status) != status
+        ]
+        if changed:
+            print(f"  Changed: {', '.join(changed)}")
+        print(
+            f"  {counts['PASSED']} passed, {counts['FAILED']} failed, "
+            f"{counts['SKIPPED']} skipped in {elapsed:.0f}s\n"
+        )
+        self.last_status.update(run.results)
+
+    def _start_run(self, case_ids: set[str]) -> CaseRun:
+        print(f"Running {len(case_ids)} case(s): {', '.join(sorted(case_ids))}")
+        return CaseRun(case_ids, self.model, self.parallel)
+
+    def watch(self, initial: set[str] | None = None) -> None:
+        """Watch until interrupted.
+
+        Args:
+            initial: Cases to run once before the first save
+        """
+        observer = self._start_observer()
+        mode = "polling" if self.use_polling else "watchdog"
+        print(f"Watching {SKILLS_DIR}/*/SKILL.md and {GOLDEN_FILE.name} ({mode})")
+        print("Press Ctrl+C to stop\n")
+
+        run: CaseRun | None = self._start_run(initial) if initial else None
+        pending: set[str] = set()
+        try:
+            while True:
+                changed = self._next_batch(block=run is None and not pending)
+                if changed:
+                    names = ", ".join(
+                        sorted(str(p.relative_to(SKILLS_DIR)) for p in changed)
+                    )
+                    impacted = self.impacted_cases(changed)
+                    print(f"Changed: {names} -> {len(impacted)} impacted case(s)")
+                    pending |= impacted
+
+                if run and run.running and pending & run.unfinished:
+                    print("Cancelling stale run")
+                    run.cancel()
+                    pending |= run.unfinished
+                    run = None
+
+                if run and not run.running:
+                    run.wait()
+                    self._report(run)
+                    run = None
+
+                if run is None and pending:
+                    run = self._start_run(pending)
+                    pending = set()
+        except KeyboardInterrupt:
+            print("\nStopping")
+        finally:
+            if run:
+                run.cancel()
+            if observer:
+                observer.stop()
+                observer.join()
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Re-run impacted routing cases when SKILL.md files change",
+    )
+    parser.add_argument(
+        "--model",
+        help="Claude model to use (default: the suite's default model)",
+    )
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=1,
+        help="Number of parallel workers per run (default: 1)",
+    )
+    parser.add_argument(
+        "--id",
+        help="Comma-separated test IDs to run once at startup",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=DEBOUNCE_S,
+        help=f"Seconds of quiet after a save before running (default: {DEBOUNCE_S})",
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="Poll file mtimes instead of using watchdog",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Enable verbose logging",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+    watcher = RoutingWatcher(
+        model=args.model,
+        parallel=args.parallel,
+        debounce_s=args.debounce,
+        use_polling=args.poll,
+    )
+    # Treat termination like Ctrl+C so the current run is cancelled too
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    initial = {i.strip() for i in args.id.split(",")} if args.id else None
+    watcher.watch(initial=initial)
+
+
+if __name__ == "__main__":
+    main()
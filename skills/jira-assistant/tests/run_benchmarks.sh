@@ -0,0 +1,57 @@
+#!/usr/bin/env bash
+# Microbenchmarks for the routing harness (no Claude API calls)
+#
+# Compares against the most recent saved baseline and fails if any
+# benchmark's median regresses by more than the threshold.
+#
+# Usage:
+#   ./run_benchmarks.sh --save              # Record a new baseline
+#   ./run_benchmarks.sh                     # Compare against latest baseline
+#   ./run_benchmarks.sh --threshold 10%     # Stricter regression threshold
+#   ./run_benchmarks.sh -k parse            # Extra args are passed to pytest
+
+set -e
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+cd "$SCRIPT_DIR"
+
+# Defaults
+SAVE=""
+THRESHOLD="25%"
+EXTRA_ARGS=()
+STORAGE="file://$SCRIPT_DIR/.benchmarks"
+
+while [[ $# -gt 0 ]]; do
+    case $1 in
+        --save)
+            SAVE="1"
+            shift
+            ;;
+        --threshold)
+            shift
+            THRESHOLD="$1"
+            shift
+            ;;
+        -h|--help)
+            sed -n '2,11p' "$0" | sed 's/^# \{0,1\}//'
+            exit 0
+            ;;
+        *)
+            EXTRA_ARGS+=("$1")
+            shift
+            ;;
+    esac
+done
+
+CMD=(pytest test_harness_benchmarks.py -m benchmark --benchmark-only --benchmark-storage="$STORAGE" -p no:xdist --benchmark-warmup=on --benchmark-min-rounds=10)
+
+if [[ -n "$SAVE" ]]; then
+    CMD+=(--benchmark-save=baseline)
+elif ls "$SCRIPT_DIR"/.benchmarks/*/*.json >/dev/null 2>&1; then
+    CMD+=(--benchmark-compare --benchmark-compare-fail="median:$THRESHOLD")
+else
+    echo "No baseline found - run '$0 --save' first. Running without comparison."
+fi
+
+echo "Running: ${CMD[*]} ${EXTRA_ARGS[*]}"
+exec "${CMD[@]}" "${EXTRA_ARGS[@]}"
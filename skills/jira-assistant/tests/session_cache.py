@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""Run-scoped coalescing of identical Claude CLI sessions.
+
+The golden set and the sandbox suite issue the same prompt with the same
+CLI configuration more than once. Within a run, each distinct request is
+executed once and its output is shared with every test that asks for it,
+including tests running on other xdist workers.
+
+Coalescing is keyed on the input plus the CLI arguments (model, allowed
+tools, plugin dir, ...). Results are kept as JSON files in a directory named
+by ``ROUTING_SESSION_CACHE_DIR``; a per-key file lock makes concurrent
+requests for the same key wait for the first one instead of starting their
+own session. When the variable is unset, every request runs normally.
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+try:
+    import fcntl
+
+    FCNTL_AVAILABLE = True
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    FCNTL_AVAILABLE = False
+
+from concurrency import (
+    MAX_RATE_LIMIT_RETRIES,
+    AdaptiveLimiter,
+    is_rate_limited,
+    retry_backoff_s,
+)
+
+# Directory shared by the controller and its xdist workers for one run
+SESSION_CACHE_ENV_VAR = "ROUTING_SESSION_CACHE_DIR"
+
+
+@dataclass
+class CompletedSession:
+    """Captured output of one Claude CLI invocation."""
+
+    stdout: str
+    stderr: str
+    returncode: int
+    coalesced: bool = False
+    retries: int = 0
+    # Harness-side timers, summed over retries
+    # Waiting for a concurrency slot, backoff or a coalescing lock
+    queue_ms: float = 0.0
+    spawn_ms: float = 0.0  # Starting the CLI process
+    wait_ms: float = 0.0  # CLI process running until exit
+
+
+@dataclass
+class CoalesceStats:
+    """Per-process counts of executed and coalesced sessions."""
+
+    sessions_executed: int = 0
+    sessions_coalesced: int = 0
+
+    @property
+    def requests(self) -> int:
+        """Total session requests seen."""
+        return self.sessions_executed + self.sessions_coalesced
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return asdict(self)
+
+
+_stats = CoalesceStats()
+
+
+def get_stats() -> CoalesceStats:
+    """Get this process's coalescing counts."""
+    return _stats
+
+
+def session_key(cmd: list[str], input_text: str) -> str:
+    """Build the coalescing key for a CLI command and its stdin input."""
+    payload = json.dumps({"cmd": cmd, "input": input_text}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def _cache_dir() -> Path | None:
+    """Get the run's cache directory, or None if coalescing is off."""
+    cache_dir = os.environ.get(SESSION_CACHE_ENV_VAR)
+    if not cache_dir:
+        return None
+    path = Path(cache_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _execute(cmd: list[str], input_text: str, timeout: int) -> CompletedSession:
+    """Run a session in an adaptive concurrency slot, retrying rate limits."""
+    limiter = AdaptiveLimiter()
+    attempt = 0
+    queue_ms = spawn_ms = wait_ms = 0.0
+    while True:
+        requested = time.monotonic()
+        token = limiter.acquire()
+        start = time.monotonic()
+        queue_ms += (start - requested) * 1000
+        try:
+            process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+            spawned = time.monotonic()
+            spawn_ms += (spawned - start) * 1000
+            try:
+                stdout, stderr = process.communicate(input_text, timeout=timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.communicate()
+                raise
+        except BaseException:
+            # Free the slot on any failure (timeout, missing CLI, interrupt);
+            # a leaked slot would block every later session of the run
+            latency_ms = (time.monotonic() - start) * 1000
+            limiter.release(token, latency_ms, error=True)
+            raise
+
+        finished = time.monotonic()
+        wait_ms += (finished - spawned) * 1000
+        latency_ms = (finished - start) * 1000
+        rate_limited = is_rate_limited(stdout, stderr, process.returncode)
+        limiter.release(
+            token,
+            latency_ms,
+            rate_limited=rate_limited,
+            error=process.returncode != 0,
+        )
+
+        if rate_limited and attempt < MAX_RATE_LIMIT_RETRIES:
+            attempt += 1
+            backoff_s = retry_backoff_s(attempt)
+            time.sleep(backoff_s)
+            queue_ms += backoff_s * 1000
+            continue
+
+        _stats.sessions_executed += 1
+        return CompletedSession(
+            stdout=stdout,
+            stderr=stderr,
+            returncode=process.returncode,
+            retries=attempt,
+            queue_ms=queue_ms,
+            spawn_ms=spawn_ms,
+            wait_ms=wait_ms,
+        )
+
+
+def run_session(cmd: list[str], input_text: str, timeout: int) -> CompletedSession:
+    """
+    Run a Claude CLI command, sharing the result of identical requests.
+
+    Only successful sessions are shared; a failed or timed-out session is
+    not cached, so the next request for the same key runs it again.
+
+    Args:
+        cmd: Full CLI command (determines the key together with the input)
+        input_text: Prompt passed on stdin
+        timeout: Maximum seconds to wait for the session
+
+    Returns:
+        CompletedSession, with ``coalesced`` set if it was served from the
+        result of an earlier identical request
+
+    Raises:
+        subprocess.TimeoutExpired: If the session times out
+        TimeoutError: If no concurrent session slot frees up (see concurrency)
+    """
+    cache_dir = _cache_dir()
+    if cache_dir is None:
+        return _execute(cmd, input_text, timeout)
+
+    key = session_key(cmd, input_text)
+    result_file = cache_dir / f"{key}.json"
+
+    with open(cache_dir / f"{key}.lock", "w") as lock_file:
+        # Hold the key's lock while running so identical requests on other
+        # workers wait for this session rather than starting their own
+        lock_start = time.monotonic()
+        if FCNTL_AVAILABLE:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        lock_ms = (time.monotonic() - lock_start) * 1000
+
+        if result_file.exists():
+            try:
+                data = json.loads(result_file.read_text())
+                _stats.sessions_coalesced += 1
+                return CompletedSession(
+                    **{
+                        **data,
+                        "coalesced": True,
+                        "retries": 0,
+                        "queue_ms": lock_ms,
+                        "spawn_ms": 0.0,
+                        "wait_ms": 0.0,
+                    }
+                )
+            except (OSError, json.JSONDecodeError, TypeError):
+                pass  # Unreadable entry - run the session again
+
+        session = _execute(cmd, input_text, timeout)
+        session.queue_ms += lock_ms
+        if session.returncode == 0:
+            tmp_file = result_file.with_suffix(".tmp")
+            tmp_file.write_text(json.dumps(asdict(session)))
+            os.replace(tmp_file, result_file)
+        return session
@@ -84,8 +84,19 @@ class SkillEditor:
             Parsed skill content
         """
         skill_path = self.get_skill_path(skill_name)
-        content = skill_path.read_text()
+        return self.parse_content(skill_path.read_text(), skill_path)
 
+    @staticmethod
+    def parse_content(content: str, file_path: Path) -> SkillContent:
+        """Parse SKILL.md text (e.g., a version from git history).
+
+        Args:
+            content: Full SKILL.md text
+            file_path: Path the content belongs to
+
+        Returns:
+            Parsed skill content
+        """
         # Parse YAML frontmatter
         frontmatter = {}
         raw_frontmatter = ""
@@ -99,12 +110,25 @@ class SkillEditor:
                 raw_frontmatter = content[3 : end_match.start() + 3].strip()
                 body = content[end_pos:]
 
-                # Parse frontmatter (simple key: value parsing)
-                for line in raw_frontmatter.split("\n"):
+                # Parse frontmatter (simple key: value parsing, plus
+                # folded/literal block scalars such as "description: >")
+                block_key, block_style, block_lines = None, "", []
+                for line in raw_frontmatter.split("\n") + [""]:
+                    if line[:1] in (" ", "\t") or (block_key and not line):
+                        if block_key:
+                            block_lines.append(line.strip())
+                        continue
+                    if block_key:
+                        joiner = " " if block_style == ">" else "\n"
+                        frontmatter[block_key] = joiner.join(block_lines).strip()
+                        block_key = None
                     if ":" in line:
                         key, value = line.split(":", 1)
                         key = key.strip()
                         value = value.strip()
+                        if value[:1] in (">", "|") and value[1:] in ("", "-", "+"):
+                            block_key, block_style, block_lines = key, value[0], []
+                            continue
                         # Remove quotes if present
                         if (value.startswith('"') and value.endswith('"')) or (
                             value.startswith("'") and value.endswith("'")
@@ -116,7 +140,7 @@ class SkillEditor:
             frontmatter=frontmatter,
             body=body,
             raw_frontmatter=raw_frontmatter,
-            file_path=skill_path,
+            file_path=file_path,
         )
 
     def backup_skill(self, skill_name: str) -> Path:
@@ -213,18 +237,15 @@ class SkillEditor:
 
             # Check if key exists in frontmatter
             if key in skill.frontmatter:
-                old_value = skill.frontmatter[key]
-                # Replace the existing value
-                # Handle both quoted and unquoted values
-                patterns = [
-                    (f'{key}: "{re.escape(old_value)}"', f'{key}: "{escaped_value}"'),
-                    (f"{key}: '{re.escape(old_value)}'", f'{key}: "{escaped_value}"'),
-                    (f"{key}: {re.escape(old_value)}", f'{key}: "{escaped_value}"'),
-                ]
-                for old_pattern, new_pattern in patterns:
-                    if old_pattern in content:
-                        content = content.replace(old_pattern, new_pattern, 1)
-                        break
+                # Replace the key's line and any indented continuation
+                # lines (block scalars, lists); frontmatter comes first, so
+                # the first match is the frontmatter field
+                field = re.compile(
+                    rf"^{re.escape(key)}:.*\n(?:[ \t]+.*\n|\n(?=[ \t]))*",
+                    re.MULTILINE,
+                )
+                new_field = f'{key}: "{escaped_value}"\n'
+                content = field.sub(lambda _: new_field, content, count=1)
             else:
                 # Add new field after the opening ---
                 content = content.replace(
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""Token footprint of the skill metadata loaded into every routing prompt.
+
+Every Claude session sees each skill's frontmatter ``name`` and
+``description``, so each token there is paid on every routing call (and
+shows up in ``claude.tokens.input``). This measures the footprint per skill
+and in total, optionally across git history, and exits non-zero when a
+budget is exceeded so growth is caught at review time.
+
+Token counts are a local approximation of a BPE tokenizer (no API calls):
+words of up to seven letters count as one token, longer words as one per
+seven letters, and every digit group or punctuation mark as one. Use the
+numbers for trends and budgets, not billing.
+
+Usage:
+    python skill_footprint.py                    # Current tree vs. budget
+    python skill_footprint.py --max-skill 150    # Tighter per-skill budget
+    python skill_footprint.py --history 20       # Last 20 SKILL.md commits
+    python skill_footprint.py --commit v1.2.0    # A past revision
+"""
+
+import argparse
+import json
+import math
+import re
+import subprocess
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+# Add tests directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from skill_editor import SkillContent, SkillEditor
+
+TESTS_DIR = Path(__file__).parent
+
+# SKILL.md files whose frontmatter is measured (as a git pathspec)
+SKILL_PATHSPEC = "skills/*/SKILL.md"
+
+# Budgets in approximate tokens
+DEFAULT_MAX_TOTAL_TOKENS = 1600
+DEFAULT_MAX_SKILL_TOKENS = 200
+
+# Letters per token for long words
+_LETTERS_PER_TOKEN = 7
+
+_TOKEN_PIECES = re.compile(r"[A-Za-z]+|\d{1,3}|[^\sA-Za-z\d]")
+_QUOTED_PHRASE = re.compile(r"'[^']+'|\"[^\"]+\"")
+
+
+def _git(repo_root: Path, *args: str) -> str:
+    result = subprocess.run(
+        ["git", *args],
+        cwd=repo_root,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip()
+
+
+def trigger_phrases(description: str) -> list[str]:
+    """Quoted trigger phrases in a skill description."""
+    return [phrase[1:-1] for phrase in _QUOTED_PHRASE.findall(description)]
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the number of tokens in a text."""
+    return sum(
+        math.ceil(len(piece) / _LETTERS_PER_TOKEN) if piece.isalpha() else 1
+        for piece in _TOKEN_PIECES.findall(text)
+    )
+
+
+@dataclass
+class SkillFootprint:
+    """Routing-prompt footprint of one skill."""
+
+    skill: str  # Skill directory, e.g. jira-ops
+    name: str  # Frontmatter name, e.g. jira-operations
+    description_chars: int
+    tokens: int  # name + description
+    trigger_phrases: int  # Quoted phrases in the description
+
+    @classmethod
+    def from_skill(cls, skill: str, content: SkillContent) -> "SkillFootprint":
+        """Measure a parsed SKILL.md."""
+        name = content.frontmatter.get("name", skill)
+        description = content.description
+        return cls(
+            skill=skill,
+            name=name,
+            description_chars=len(description),
+            tokens=estimate_tokens(name) + estimate_tokens(description),
+            trigger_phrases=len(trigger_phrases(description)),
+        )
+
+
+@dataclass
+class FootprintReport:
+    """Footprint of every skill at one revision."""
+
+    skills: list[SkillFootprint]
+    commit: str | None = None  # None for the working tree
+    date: str | None = None
+
+    @property
+    def total_tokens(self) -> int:
+        """Tokens across all skills."""
+        return sum(s.tokens for s in self.skills)
+
+    def violations(
+        self,
+        max_total: int = DEFAULT_MAX_TOTAL_TOKENS,
+        max_skill: int = DEFAULT_MAX_SKILL_TOKENS,
+    ) -> list[str]:
+        """Budget violations, one message each (empty when within budget)."""
+        messages = [
+            f"{s.skill}: {s.tokens} tokens exceeds the per-skill budget of {max_skill}"
+            for s in self.skills
+            if s.tokens > max_skill
+        ]
+        if self.total_tokens > max_total:
+            messages.append(
+                f"Total: {self.total_tokens} tokens exceeds the budget of {max_total}"
+            )
+        return messages
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {**asdict(self), "total_tokens": self.total_tokens}
+
+
+def measure_tree(editor: SkillEditor | None = None) -> FootprintReport:
+    """Measure the skills in a working tree."""
+    editor = editor or SkillEditor()
+    return FootprintReport(
+        skills=[
+            SkillFootprint.from_skill(skill, editor.parse_skill(skill))
+            for skill in editor.get_all_skill_names()
+        ]
+    )
+
+
+def _read_blobs(repo_root: Path, objects: list[str]) -> list[str]:
+    """Read several ``<rev>:<path>`` objects with one ``git cat-file``."""
+    result = subprocess.run(
+        ["git", "cat-file", "--batch"],
+        cwd=repo_root,
+        input="".join(f"{obj}\n" for obj in objects).encode(),
+        check=True,
+        capture_output=True,
+    )
+    out, pos, blobs = result.stdout, 0, []
+    for _ in objects:
+        header_end = out.index(b"\n", pos)
+        size = int(out[pos:header_end].split()[2])
+        blobs.append(out[header_end + 1 : header_end + 1 + size].decode())
+        pos = header_end + 1 + size + 1  # Content is followed by a newline
+    return blobs
+
+
+def measure_commit(commit: str, repo_root: Path | None = None) -> FootprintReport:
+    """
+    Measure the skills at a git revision.
+
+    Args:
+        commit: Any revision git understands
+        repo_root: Repository root. If None, uses this checkout.
+
+    Returns:
+        FootprintReport for that revision
+    """
+    repo_root = repo_root or Path(_git(TESTS_DIR, "rev-parse", "--show-toplevel"))
+    sha = _git(repo_root, "rev-parse", "--verify", f"{commit}^{{commit}}")
+    paths = [
+        path
+        for path in _git(
+            repo_root, "ls-tree", "-r", "--name-only", sha, "--", "skills"
+        ).splitlines()
+        if re.fullmatch(r"skills/jira-[^/]+/SKILL\.md", path)
+    ]
+    blobs = _read_blobs(repo_root, [f"{sha}:{path}" for path in paths])
+    return FootprintReport(
+        skills=[
+            SkillFootprint.from_skill(
+                path.split("/")[1],
+                SkillEditor.parse_content(blob, repo_root / path),
+            )
+            for path, blob in zip(paths, blobs, strict=True)
+        ],
+        commit=sha,
+        date=_git(repo_root, "log", "-1", "--format=%cs", sha),
+    )
+
+
+def footprint_history(
+    rev: str = "HEAD",
+    max_count: int = 20,
+    repo_root: Path | None = None,
+) -> list[FootprintReport]:
+    """
+    Measure every recent commit that changed a SKILL.md, oldest first.
+
+    Args:
+        rev: Revision to walk back from
+        max_count: Maximum number of commits
+        repo_root: Repository root. If None, uses this checkout.
+
+    Returns:
+        One FootprintReport per commit
+    """
+    repo_root = repo_root or Path(_git(TESTS_DIR, "rev-parse", "--show-toplevel"))
+    shas = _git(
+        repo_root,
+        "log",
+        f"--max-count={max_count}",
+        "--format=%H",
+        rev,
+        "--",
+        SKILL_PATHSPEC,
+    ).splitlines()
+    return [measure_commit(sha, repo_root) for sha in reversed(shas)]
+
+
+def format_report(
+    report: FootprintReport,
+    max_skill: int = DEFAULT_MAX_SKILL_TOKENS,
+) -> str:
+    """Render a report as a table, largest skills first."""
+    revision = report.commit[:10] if report.commit else "working tree"
+    lines = [
+        f"Skill metadata footprint ({revision})",
+        "",
+        f"{'Skill':<22} {'Tokens':>7} {'Chars':>7} {'Triggers':>9}",
+    ]
+    for s in sorted(report.skills, key=lambda s: -s.tokens):
+        flag = "  over budget" if s.tokens > max_skill else ""
+        lines.append(
+            f"{s.skill:<22} {s.tokens:>7} {s.description_chars:>7} "
+            f"{s.trigger_phrases:>9}{flag}"
+        )
+    lines.append(f"{'Total':<22} {report.total_tokens:>7}")
+    return "\n".join(lines)
+
+
+def format_history(reports: list[FootprintReport]) -> str:
+    """Render total footprint per commit with the change from the previous one."""
+    lines = [f"{'Commit':<10} {'Date':<10} {'Total':>7} {'Change':>7}  Largest"]
+    previous = None
+    for report in reports:
+        change = "" if previous is None else f"{report.total_tokens - previous:+d}"
+        largest = max(report.skills, key=lambda s: s.tokens, default=None)
+        lines.append(
+            f"{report.commit[:10]:<10} {report.date:<10} "
+            f"{report.total_tokens:>7} {change:>7}  "
+            + (f"{largest.skill} ({largest.tokens})" if largest else "-")
+        )
+        previous = report.total_tokens
+    return "\n".join(lines)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Measure skill metadata tokens and check them against a budget",
+    )
+    parser.add_argument(
+        "--commit",
+        help="Measure a git revision instead of the working tree",
+    )
+    parser.add_argument(
+        "--history",
+        type=int,
+        metavar="N",
+        help="Show the total for the last N commits that changed a SKILL.md",
+    )
+    parser.add_argument(
+        "--max-total",
+        type=int,
+        default=DEFAULT_MAX_TOTAL_TOKENS,
+        help=f"Budget for all skills (default: {DEFAULT_MAX_TOTAL_TOKENS})",
+    )
+    parser.add_argument(
+        "--max-skill",
+        type=int,
+        default=DEFAULT_MAX_SKILL_TOKENS,
+        help=f"Budget per skill (default: {DEFAULT_MAX_SKILL_TOKENS})",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the report(s) as JSON",
+    )
+    args = parser.parse_args()
+
+    if args.history:
+        reports = footprint_history(max_count=args.history)
+        if args.json:
+            print(json.dumps([r.to_dict() for r in reports], indent=2))
+        else:
+            print(format_history(reports))
+        return
+
+    report = measure_commit(args.commit) if args.commit else measure_tree()
+    violations = report.violations(args.max_total, args.max_skill)
+    if args.json:
+        print(json.dumps({**report.to_dict(), "violations": violations}, indent=2))
+    else:
+        print(format_report(report, args.max_skill))
+        if violations:
+            print("\nOver budget:")
+            for message in violations:
+                print(f"  {message}")
+
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == "__main__":
+    main()
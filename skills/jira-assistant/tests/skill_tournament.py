@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""Tournament between alternative texts for one skill section.
+
+Given K candidate texts for a skill's description (or another section),
+every variant is evaluated concurrently in its own plugin snapshot against
+the golden cases that involve the skill. Evaluation uses successive
+halving: the impacted cases are split into rounds, each round runs the next
+(larger) slice of cases for the surviving variants only, and the weaker half
+is dropped. Variants are ranked on their results over every case run so
+far, not just the latest slice, and a variant tied with the last one kept
+survives too: equal evidence is no reason to drop either. Five variants
+plus the baseline cost about three passes over the impacted cases instead of
+six (more when ties keep extra variants in).
+
+The current text takes part as the ``baseline`` variant. It wins a final tie
+it is part of, so a variant has to beat it outright to be recommended. A
+final tie between other variants has no winner; the report lists them.
+
+Usage:
+    # Each file holds one candidate description
+    python skill_tournament.py --skill agile --variant a.txt --variant b.txt
+
+    # Candidates for a body section
+    python skill_tournament.py --skill bulk --section "When to use this skill" \\
+        --variant narrow.md --variant broad.md --parallel 2
+"""
+
+import argparse
+import json
+import logging
+import math
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+# Add tests directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from golden_set import case_skills, load_golden_cases
+from plugin_snapshot import PluginSnapshotter, score_candidates
+from skill_editor import SkillEditor
+
+logger = logging.getLogger(__name__)
+
+BASELINE_LABEL = "baseline"
+
+# Shorter slices than this leave elimination to chance
+MIN_ROUND_CASES = 3
+
+
+@dataclass
+class SkillVariant:
+    """One candidate text for a skill section."""
+
+    label: str
+    text: str
+
+    def changes(self, skill: str, section: str, action: str) -> list[dict]:
+        """Build SkillEditor changes applying this variant."""
+        return [
+            {
+                "skill": skill,
+                "section": section,
+                "action": action,
+                "new_text": self.text,
+            }
+        ]
+
+
+@dataclass
+class VariantStanding:
+    """A variant's accumulated results."""
+
+    label: str
+    cases: dict[str, dict] = field(default_factory=dict)  # test_id -> evidence
+    eliminated_in_round: int | None = None
+
+    @property
+    def passed(self) -> int:
+        """Number of cases passed so far."""
+        return sum(1 for c in self.cases.values() if c["passed"])
+
+    @property
+    def pass_rate(self) -> float:
+        """Pass rate over the cases run so far."""
+        return self.passed / len(self.cases) if self.cases else 0.0
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {**asdict(self), "passed": self.passed, "pass_rate": self.pass_rate}
+
+
+@dataclass
+class TournamentResult:
+    """Outcome of a tournament."""
+
+    skill: str
+    section: str
+    model: str
+    rounds: list[list[str]]  # test IDs per round
+    standings: dict[str, VariantStanding]
+    winner: str | None = None
+    tied: list[str] = field(default_factory=list)  # Final tie without a winner
+
+    @property
+    def cases_run(self) -> int:
+        """Total case executions across all variants."""
+        return sum(len(s.cases) for s in self.standings.values())
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "skill": self.skill,
+            "section": self.section,
+            "model": self.model,
+            "rounds": self.rounds,
+            "winner": self.winner,
+            "tied": self.tied,
+            "cases_run": self.cases_run,
+            "standings": {k: v.to_dict() for k, v in self.standings.items()},
+        }
+
+
+def impacted_cases(skill: str) -> list[str]:
+    """Golden case IDs that involve a skill."""
+    return sorted(
+        case_id
+        for case_id, case in load_golden_cases().items()
+        if skill in case_skills(case)
+    )
+
+
+def split_rounds(case_ids: list[str], variant_count: int) -> list[list[str]]:
+    """
+    Split cases into one slice per halving round.
+
+    There are ceil(log2 K) rounds. Slices double in size as the field halves,
+    so every round costs about the same number of case executions. Every
+    slice but the last has at least MIN_ROUND_CASES cases when there are
+    enough to go around.
+    """
+    rounds = math.ceil(math.log2(variant_count)) if variant_count > 1 else 1
+    rounds = max(1, min(rounds, len(case_ids)))
+    weights = [2**i for i in range(rounds)]
+    slices, start = [], 0
+    for i, weight in enumerate(weights):
+        remaining_rounds = rounds - i - 1
+        size = round(len(case_ids) * weight / sum(weights))
+        # A minimum per round, but leave one case for each later round
+        size = max(min(MIN_ROUND_CASES, len(case_ids) // rounds), size, 1)
+        size = min(size, len(case_ids) - start - remaining_rounds)
+        end = len(case_ids) if remaining_rounds == 0 else start + size
+        slices.append(case_ids[start:end])
+        start = end
+    return slices
+
+
+class SkillTournament:
+    """Successive-halving tournament between variants of one skill section."""
+
+    def __init__(
+        self,
+        skill: str,
+        variants: list[SkillVariant],
+        section: str = "frontmatter",
+        action: str = "replace",
+        model: str = "haiku",
+        parallel: int = 1,
+        timeout: int = 600,
+        include_baseline: bool = True,
+        snapshotter: PluginSnapshotter | None = None,
+    ):
+        """Initialize tournament.
+
+        Args:
+            skill: Skill name (e.g., 'jira-agile' or 'agile')
+            variants: Candidate texts (labels must be unique)
+            section: "frontmatter" (description) or a section header
+            action: SkillEditor action for section variants
+            model: Claude model to use
+            parallel: xdist workers per variant run
+            timeout: Timeout in seconds for each variant run
+            include_baseline: Also evaluate the current, unmodified text
+            snapshotter: Snapshotter to use. If None, uses the default.
+        """
+        self.skill = skill if skill.startswith("jira-") else f"jira-{skill}"
+        self.section = section
+        self.action = action
+        self.model = model
+        self.parallel = parallel
+        self.timeout = timeout
+        self.snapshotter = snapshotter or PluginSnapshotter()
+
+        labels = [v.label for v in variants]
+        if len(set(labels)) != len(labels) or BASELINE_LABEL in labels:
+            raise ValueError(
+                f"Variant labels must be unique and not '{BASELINE_LABEL}'"
+            )
+        # Fail early on unknown skills rather than in every snapshot
+        SkillEditor().get_skill_path(self.skill)
+
+        self.changes: dict[str, list[dict]] = {}
+        if include_baseline:
+            self.changes[BASELINE_LABEL] = []
+        for variant in variants:
+            self.changes[variant.label] = variant.changes(
+                self.skill, self.section, self.action
+            )
+
+    @staticmethod
+    def _rank(standings: list[VariantStanding]) -> list[VariantStanding]:
+        # Pass rate over every case run so far (survivors have all run the
+        # same cases), best first
+        return sorted(standings, key=lambda s: -s.pass_rate)
+
+    @staticmethod
+    def _keep(ranked: list[VariantStanding]) -> list[VariantStanding]:
+        # The better half, plus any variant tied with the last one kept
+        cutoff = ranked[max(1, math.ceil(len(ranked) / 2)) - 1].pass_rate
+        return [s for s in ranked if s.pass_rate >= cutoff]
+
+    def run(self, test_ids: list[str] | None = None) -> TournamentResult:
+        """
+        Run the tournament.
+
+        Args:
+            test_ids: Cases to evaluate on. If None, uses every golden case
+                that involves the skill.
+
+        Returns:
+            TournamentResult with per-case evidence for every variant
+        """
+        case_ids = test_ids or impacted_cases(self.skill)
+        if not case_ids:
+            raise ValueError(f"No golden cases involve {self.skill}")
+
+        standings = {label: VariantStanding(label) for label in self.changes}
+        rounds = split_rounds(case_ids, len(standings))
+        survivors = list(standings)
+
+        for round_no, round_cases in enumerate(rounds, start=1):
+            logger.info(
+                f"Round {round_no}/{len(rounds)}: {len(survivors)} variant(s) "
+                f"x {len(round_cases)} case(s)"
+            )
+            results = score_candidates(
+                {label: self.changes[label] for label in survivors},
+                test_ids=round_cases,
+                model=self.model,
+                parallel=self.parallel,
+                timeout=self.timeout,
+                snapshotter=self.snapshotter,
+            )
+            for label in survivors:
+                suite = results[label]
+                cases = standings[label].cases
+                for result in suite.passed:
+                    cases[result.test_id] = {"passed": True, "round": round_no}
+                for result in suite.failed:
+                    cases[result.test_id] = {
+                        "passed": False,
+                        "round": round_no,
+                        "error": result.error_message,
+                    }
+                if suite.error:
+                    # A broken run counts as failing every case in the round
+                    for test_id in round_cases:
+                        cases.setdefault(
+                            test_id,
+                            {"passed": False, "round": round_no, "error": suite.error},
+                        )
+
+            ranked = self._rank([standings[label] for label in survivors])
+            if round_no < len(rounds):
+                kept = self._keep(ranked)
+                for standing in ranked[len(kept) :]:
+                    standing.eliminated_in_round = round_no
+                survivors = [s.label for s in kept]
+            else:
+                survivors = [s.label for s in ranked]
+
+            logger.info(
+                "  "
+                + ", ".join(
+                    f"{s.label} {s.passed}/{len(s.cases)}"
+                    + (" (out)" if s.eliminated_in_round == round_no else "")
+                    for s in ranked
+                )
+            )
+
+        # Best pass rate wins; the baseline wins a tie it is part of, and a
+        # tie between other variants has no winner
+        best = [
+            label
+            for label in survivors
+            if standings[label].pass_rate == standings[survivors[0]].pass_rate
+        ]
+        winner, tied = None, []
+        if BASELINE_LABEL in best:
+            winner = BASELINE_LABEL
+        elif len(best) == 1:
+            winner = best[0]
+        else:
+            tied = best
+        return TournamentResult(
+            skill=self.skill,
+            section=self.section,
+            model=self.model,
+            rounds=rounds,
+            standings=standings,
+            winner=winner,
+            tied=tied,
+        )
+
+
+def format_result(result: TournamentResult) -> str:
+    """Render the tournament as markdown tables."""
+    labels = list(result.standings)
+    lines = [
+        f"# Skill tournament: {result.skill} ({result.section}, {result.model})",
+        "",
+        "| Variant | Passed | Cases | Pass rate | Eliminated |",
+        "|---|---|---|---|---|",
+    ]
+    for label in labels:
+        s = result.standings[label]
+        out = f"round {s.eliminated_in_round}" if s.eliminated_in_round else "-"
+        marker = " (winner)" if label == result.winner else ""
+        lines.append(
+            f"| {label}{marker} | {s.passed} | {len(s.cases)} "
+            f"| {s.pass_rate * 100:.0f}% | {out} |"
+        )
+
+    lines += ["", "## Per-case evidence", ""]
+    lines.append("| Test | Round | " + " | ".join(labels) + " |")
+    lines.append("|---|---|" + "---|" * len(labels))
+    for round_no, round_cases in enumerate(result.rounds, start=1):
+        for test_id in round_cases:
+            cells = []
+            for label in labels:
+                case = result.standings[label].cases.get(test_id)
+                cells.append(
+                    "-" if case is None else "pass" if case["passed"] else "FAIL"
+                )
+            lines.append(f"| {test_id} | {round_no} | " + " | ".join(cells) + " |")
+
+    lines += ["", f"Case executions: {result.cases_run}"]
+    if result.winner == BASELINE_LABEL:
+        lines.append("No variant beat the current text.")
+    elif result.winner:
+        lines.append(f"Winner: {result.winner}")
+    elif result.tied:
+        lines.append(
+            f"Tied: {', '.join(result.tied)} (run more cases to separate them)"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Pick the best of several skill description variants",
+    )
+    parser.add_argument(
+        "--skill", required=True, help="Skill to tune (e.g., agile or jira-agile)"
+    )
+    parser.add_argument(
+        "--variant",
+        action="append",
+        type=Path,
+        required=True,
+        help="File containing one candidate text (repeatable; label = file stem)",
+    )
+    parser.add_argument(
+        "--section",
+        default="frontmatter",
+        help="'frontmatter' for the description, or a section header",
+    )
+    parser.add_argument(
+        "--action",
+        default="replace",
+        choices=["replace", "append", "prepend"],
+        help="How section variants are applied (default: replace)",
+    )
+    parser.add_argument(
+        "--id",
+        help="Comma-separated test IDs (default: cases that involve the skill)",
+    )
+    parser.add_argument(
+        "--model", default="haiku", help="Claude model to use (default: haiku)"
+    )
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=1,
+        help="Parallel test workers per variant (default: 1)",
+    )
+    parser.add_argument(
+        "--no-baseline",
+        action="store_true",
+        help="Do not include the current text as a variant",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Write the result as JSON to this file",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Enable verbose logging",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+    variants = [
+        SkillVariant(path.stem, path.read_text().strip()) for path in args.variant
+    ]
+    test_ids = [t.strip() for t in args.id.split(",")] if args.id else None
+
+    tournament = SkillTournament(
+        skill=args.skill,
+        variants=variants,
+        section=args.section,
+        action=args.action,
+        model=args.model,
+        parallel=args.parallel,
+        include_baseline=not args.no_baseline,
+    )
+    result = tournament.run(test_ids)
+
+    print(format_result(result))
+    if args.output:
+        args.output.write_text(json.dumps(result.to_dict(), indent=2))
+        print(f"\nResult written to {args.output}")
+
+    sys.exit(0 if result.winner and result.winner != BASELINE_LABEL else 1)
+
+
+if __name__ == "__main__":
+    main()
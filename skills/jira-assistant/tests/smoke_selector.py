@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""Cheapest set of golden cases that still touches everything.
+
+Each golden case covers a set of features:
+
+- ``skill:<name>`` for every skill it refers to (expected, not-expected,
+  disambiguation options, alternates, workflow steps)
+- ``category:<name>``
+- ``trigger:<skill>:<phrase>`` for each quoted trigger phrase (of two or
+  more words) from a skill description that appears in the input
+- ``command:<group>`` for each expected command group (``jira agile ...``)
+
+Each case is weighted by its expected cost from the results store, with
+flaky cases (pass rate near 50%) penalized, since a smoke run should be
+cheap and trustworthy. A greedy weighted set cover (best features per unit
+of weight first, then dropping picks that became redundant) selects the
+subset.
+
+The selection is saved to ``smoke_cases.json``; conftest marks those cases
+``smoke``, so ``pytest -m smoke`` (and ``fast_test.sh --smoke``) runs them.
+
+Usage:
+    python smoke_selector.py                     # Show the selection
+    python smoke_selector.py --write             # Save it for -m smoke
+    python smoke_selector.py --features skill,category --format k
+"""
+
+import argparse
+import json
+import re
+import statistics
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+# Add tests directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from golden_set import case_skills, load_golden_cases
+from results_store import ResultsStore
+from skill_editor import SkillEditor
+from skill_footprint import trigger_phrases
+
+SMOKE_FILE = Path(__file__).parent / "smoke_cases.json"
+
+FEATURE_KINDS = ("skill", "category", "trigger", "command")
+
+# Extra weight for a case that passes half of the time (scaled down for
+# cases closer to always passing or always failing)
+FLAKINESS_PENALTY = 2.0
+
+# Historical results considered per case
+HISTORY_PER_CASE = 20
+
+_COMMAND_GROUP = re.compile(r"^jira(?:-as)?\s+([a-z][a-z-]*)")
+
+
+@dataclass
+class CaseWeight:
+    """Cost of including a case in the smoke set."""
+
+    test_id: str
+    cost: float  # Expected cost (USD, or 1.0 per case without any history)
+    flakiness: float  # 0 = always same outcome, 1 = passes half the time
+    runs: int  # Historical results behind the numbers
+
+    @property
+    def weight(self) -> float:
+        """Cost with the flakiness penalty applied."""
+        return self.cost * (1 + FLAKINESS_PENALTY * self.flakiness)
+
+
+@dataclass
+class SmokeSelection:
+    """A covering subset of golden cases."""
+
+    test_ids: list[str]
+    features: dict[str, list[str]]  # test_id -> features it covers
+    total_weight: float
+    universe: int  # Features that had to be covered
+    feature_kinds: list[str] = field(default_factory=lambda: list(FEATURE_KINDS))
+
+    def k_expression(self) -> str:
+        """The selection as a pytest -k expression."""
+        return " or ".join(self.test_ids)
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return asdict(self)
+
+
+def skill_triggers(editor: SkillEditor | None = None) -> dict[str, list[str]]:
+    """Lowercased trigger phrases per skill (single words are too generic)."""
+    editor = editor or SkillEditor()
+    return {
+        skill: [
+            phrase.lower()
+            for phrase in trigger_phrases(editor.parse_skill(skill).description)
+            if len(phrase.split()) > 1
+        ]
+        for skill in editor.get_all_skill_names()
+    }
+
+
+def case_features(
+    case: dict,
+    triggers: dict[str, list[str]],
+    kinds: tuple[str, ...] = FEATURE_KINDS,
+) -> set[str]:
+    """Features a golden case covers."""
+    features = set()
+    if "skill" in kinds:
+        features.update(f"skill:{skill}" for skill in case_skills(case))
+    if "category" in kinds and case.get("category"):
+        features.add(f"category:{case['category']}")
+    if "trigger" in kinds:
+        text = str(case.get("input") or "").lower()
+        features.update(
+            f"trigger:{skill}:{phrase}"
+            for skill, phrases in triggers.items()
+            for phrase in phrases
+            if phrase in text
+        )
+    if "command" in kinds:
+        for command in case.get("expected_commands") or []:
+            match = _COMMAND_GROUP.match(command.get("pattern") or "")
+            if match:
+                features.add(f"command:{match.group(1)}")
+    return features
+
+
+def case_weights(
+    test_ids: list[str],
+    store: ResultsStore | None = None,
+    model: str | None = None,
+) -> dict[str, CaseWeight]:
+    """
+    Weigh cases by expected cost and flakiness from their history.
+
+    Args:
+        test_ids: Cases to weigh
+        store: Results store with case history. If None, uses the default.
+        model: Only use history for this model. If None, all models.
+
+    Returns:
+        Test ID -> weight. Cases without history get the median cost of
+        the cases that have it (1.0 when none do) and no flakiness.
+    """
+    store = store or ResultsStore()
+    history = store.case_history(model=model, limit_per_case=HISTORY_PER_CASE)
+
+    # Coalesced runs cost nothing themselves; they say nothing about cost
+    costs = {}
+    for test_id, records in history.items():
+        paid = [r.cost_usd for r in records if not r.coalesced]
+        if any(paid):
+            costs[test_id] = statistics.mean(paid)
+    default_cost = statistics.median(costs.values()) if costs else 1.0
+
+    weights = {}
+    for test_id in test_ids:
+        records = history.get(test_id) or []
+        pass_rate = sum(r.passed for r in records) / len(records) if records else 1.0
+        weights[test_id] = CaseWeight(
+            test_id=test_id,
+            cost=costs.get(test_id, default_cost),
+            flakiness=1 - abs(2 * pass_rate - 1),
+            runs=len(records),
+        )
+    return weights
+
+
+def weighted_set_cover(
+    features: dict[str, set[str]],
+    weights: dict[str, float],
+) -> list[str]:
+    """
+    Greedy weighted set cover.
+
+    Repeatedly picks the case covering the most uncovered features per unit
+    of weight, then drops picks (heaviest first) whose features are all
+    covered by the others.
+
+    Args:
+        features: Case ID -> features it covers
+        weights: Case ID -> weight (must be positive)
+
+    Returns:
+        Chosen case IDs, in golden order
+    """
+    uncovered = set().union(*features.values()) if features else set()
+    chosen: list[str] = []
+    while uncovered:
+        best = max(
+            (c for c in features if c not in chosen),
+            key=lambda c: (len(features[c] & uncovered) / weights[c], -weights[c]),
+        )
+        chosen.append(best)
+        uncovered -= features[best]
+
+    for case_id in sorted(chosen, key=lambda c: -weights[c]):
+        others = set().union(*(features[c] for c in chosen if c != case_id))
+        if features[case_id] <= others:
+            chosen.remove(case_id)
+
+    order = list(features)
+    return sorted(chosen, key=order.index)
+
+
+def select_smoke_cases(
+    kinds: tuple[str, ...] = FEATURE_KINDS,
+    store: ResultsStore | None = None,
+    model: str | None = None,
+) -> SmokeSelection:
+    """
+    Select the cheapest golden subset covering every feature.
+
+    Args:
+        kinds: Feature kinds to cover (see FEATURE_KINDS)
+        store: Results store with case history. If None, uses the default.
+        model: Only use history for this model. If None, all models.
+
+    Returns:
+        SmokeSelection with the chosen cases and what each covers
+    """
+    cases = load_golden_cases()
+    triggers = skill_triggers() if "trigger" in kinds else {}
+    features = {
+        test_id: case_features(case, triggers, kinds) for test_id, case in cases.items()
+    }
+    features = {test_id: f for test_id, f in features.items() if f}
+    weights = case_weights(list(features), store, model)
+
+    chosen = weighted_set_cover(
+        features, {test_id: w.weight for test_id, w in weights.items()}
+    )
+    return SmokeSelection(
+        test_ids=chosen,
+        features={test_id: sorted(features[test_id]) for test_id in chosen},
+        total_weight=sum(weights[test_id].weight for test_id in chosen),
+        universe=len(set().union(*features.values())) if features else 0,
+        feature_kinds=list(kinds),
+    )
+
+
+def load_smoke_ids(smoke_file: Path = SMOKE_FILE) -> set[str]:
+    """Saved smoke case IDs (empty when no selection has been saved)."""
+    if not smoke_file.exists():
+        return set()
+    return set(json.loads(smoke_file.read_text()).get("test_ids", []))
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Select the cheapest golden subset covering every skill and category",
+    )
+    parser.add_argument(
+        "--features",
+        default=",".join(FEATURE_KINDS),
+        help=f"Feature kinds to cover (default: {','.join(FEATURE_KINDS)})",
+    )
+    parser.add_argument(
+        "--model",
+        help="Only weigh cases by history with this model (default: all models)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["table", "ids", "k", "json"],
+        default="table",
+        help="Output format (default: table)",
+    )
+    parser.add_argument(
+        "--write",
+        action="store_true",
+        help=f"Save the selection to {SMOKE_FILE.name} for pytest -m smoke",
+    )
+    args = parser.parse_args()
+
+    kinds = tuple(k.strip() for k in args.features.split(",") if k.strip())
+    unknown = set(kinds) - set(FEATURE_KINDS)
+    if unknown:
+        parser.error(f"Unknown feature kinds: {', '.join(sorted(unknown))}")
+
+    selection = select_smoke_cases(kinds, model=args.model)
+
+    if args.format == "ids":
+        print(",".join(selection.test_ids))
+    elif args.format == "k":
+        print(selection.k_expression())
+    elif args.format == "json":
+        print(json.dumps(selection.to_dict(), indent=2))
+    else:
+        for test_id in selection.test_ids:
+            print(f"{test_id}: {', '.join(selection.features[test_id])}")
+        print(
+            f"\n{len(selection.test_ids)} cases cover {selection.universe} "
+            f"features (weight {selection.total_weight:.3f})"
+        )
+
+    if args.write:
+        SMOKE_FILE.write_text(json.dumps(selection.to_dict(), indent=2) + "\n")
+        print(f"Saved to {SMOKE_FILE}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
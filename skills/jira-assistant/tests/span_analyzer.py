@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+"""Worker utilization and critical-path analysis of a routing run.
+
+A run's timeline comes from either of two sources:
+
+- OTLP-JSON trace files (``--otlp-file`` spool or any ``traces-*.jsonl``).
+  The suite span gives the run window and the requested
+  ``suite.parallel_workers``. ``worker_<id>`` spans group test spans by
+  xdist worker. Test spans cover the Claude session (they are backdated
+  by its duration), so harness overhead between sessions shows up as gaps.
+- The results store (``--run-id``, default: the latest run). Each case
+  has its worker and harness wall-clock start and finish.
+
+For every worker the analyzer reports busy time (the union of its cases),
+idle time before its first case, between cases (queueing gaps) and after
+its last case. It also reports achieved parallelism (total busy time over
+the run's wall time) against the workers requested. The critical path is
+the case chain of the worker that finished last, because the run ends when
+it does.
+
+The worker count recommendation schedules the current golden set's cases
+with their durations from this run, plus the mean per-case gap as harness
+overhead, and places them longest first on n workers, as the cost
+estimator does. Cases the run did not include get the run's median
+duration. The recommended count is the smallest n whose makespan is within
+the tolerance of the best makespan. Adaptive concurrency limits and rate
+limiting are not modeled, so treat it as an upper bound.
+
+Usage:
+    python span_analyzer.py --otlp-dir /tmp/otlp       # Latest suite
+    python span_analyzer.py --otlp-dir /tmp/otlp --trace 4bf92f35...
+    python span_analyzer.py                            # Latest stored run
+    python span_analyzer.py --run-id 3f2a9c0d1e4b --json
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from cost_estimator import lpt_makespan
+from golden_set import load_golden_cases
+from progress_reporter import format_duration
+from results_store import ResultsStore
+
+logger = logging.getLogger(__name__)
+
+SUITE_SPAN_NAME = "routing_test_suite"
+WORKER_SPAN_PREFIX = "worker_"
+
+# Recommend the fewest workers whose makespan is within this of the best
+DEFAULT_TOLERANCE = 0.10
+DEFAULT_MAX_WORKERS = 16
+
+# Gaps shorter than this are scheduling noise, not queueing
+MIN_GAP_S = 0.001
+
+
+@dataclass
+class CaseInterval:
+    """When one case ran, and on which worker (epoch seconds)."""
+
+    test_id: str
+    worker_id: str
+    start_s: float
+    end_s: float
+
+    @property
+    def duration_s(self) -> float:
+        return max(0.0, self.end_s - self.start_s)
+
+
+@dataclass
+class RunTimeline:
+    """A run's window and case intervals."""
+
+    run_id: str
+    source: str  # "spans" or "store"
+    start_s: float
+    end_s: float
+    cases: list[CaseInterval]
+    requested_workers: int | None = None
+
+    @property
+    def wall_s(self) -> float:
+        return max(0.0, self.end_s - self.start_s)
+
+
+@dataclass
+class WorkerUtilization:
+    """Busy and idle time of one worker."""
+
+    worker_id: str
+    cases: int
+    busy_s: float
+    lead_in_s: float  # Run start to first case
+    gap_s: float  # Between cases
+    gap_count: int
+    max_gap_s: float
+    tail_s: float  # Last case to run end
+    utilization: float  # busy_s / run wall time
+
+    @property
+    def idle_s(self) -> float:
+        return self.lead_in_s + self.gap_s + self.tail_s
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {**asdict(self), "idle_s": self.idle_s}
+
+
+@dataclass
+class WorkerRecommendation:
+    """Worker count for the golden set, from simulated makespans."""
+
+    workers: int
+    makespan_s: float
+    cases: int
+    cases_measured: int  # Golden cases with a duration from this run
+    overhead_s: float  # Per-case harness overhead added to each duration
+    makespans: dict[int, float] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return asdict(self)
+
+
+@dataclass
+class SpanAnalysis:
+    """Utilization, critical path and worker recommendation for a run."""
+
+    run_id: str
+    source: str
+    wall_s: float
+    busy_s: float
+    requested_workers: int | None
+    observed_workers: int
+    achieved_parallelism: float
+    workers: list[WorkerUtilization]
+    critical_worker: str
+    critical_path: list[str]  # Test IDs in order
+    critical_busy_s: float
+    critical_gap_s: float
+    longest_case: str
+    longest_case_s: float
+    recommendation: WorkerRecommendation | None = None
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        data = asdict(self)
+        data["workers"] = [w.to_dict() for w in self.workers]
+        data["recommendation"] = (
+            self.recommendation.to_dict() if self.recommendation else None
+        )
+        return data
+
+
+# =============================================================================
+# LOADING
+# =============================================================================
+
+
+def _attribute_value(value: dict):
+    """Python value of an OTLP-JSON AnyValue."""
+    for key in ("stringValue", "boolValue", "doubleValue"):
+        if key in value:
+            return value[key]
+    if "intValue" in value:
+        return int(value["intValue"])
+    return None
+
+
+def read_otlp_spans(paths: list[Path]) -> list[dict]:
+    """
+    Spans from OTLP-JSON trace files (one export request per line).
+
+    Returns:
+        Dicts with name, trace_id, span_id, parent_id, start_s, end_s and
+        attributes
+    """
+    spans = []
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    continue  # Torn write from a killed process
+                for resource in request.get("resourceSpans", []):
+                    for scope in resource.get("scopeSpans", []):
+                        for span in scope.get("spans", []):
+                            spans.append(
+                                {
+                                    "name": span.get("name", ""),
+                                    "trace_id": span.get("traceId", ""),
+                                    "span_id": span.get("spanId", ""),
+                                    "parent_id": span.get("parentSpanId", ""),
+                                    "start_s": int(span["startTimeUnixNano"]) / 1e9,
+                                    "end_s": int(span["endTimeUnixNano"]) / 1e9,
+                                    "attributes": {
+                                        a["key"]: _attribute_value(a.get("value", {}))
+                                        for a in span.get("attributes", [])
+                                    },
+                                }
+                            )
+    return spans
+
+
+def trace_files(directory: Path) -> list[Path]:
+    """Trace files in an OTLP spool directory (completed and open)."""
+    return sorted(
+        p for p in directory.glob("traces-*") if p.name.endswith((".jsonl", ".open"))
+    )
+
+
+def timelines_from_spans(spans: list[dict]) -> list[RunTimeline]:
+    """
+    One timeline per suite span, oldest first.
+
+    A suite's cases are the spans with a ``test.id`` attribute whose parent
+    is one of the suite's ``worker_<id>`` spans. Other spans in the trace
+    (the session summary span, remediation spans, other suites of the same
+    remediation trace) are not cases.
+    """
+    by_key = {(s["trace_id"], s["span_id"]): s for s in spans}
+    children: dict[tuple[str, str], list[dict]] = {}
+    for span in spans:
+        if span["parent_id"]:
+            children.setdefault((span["trace_id"], span["parent_id"]), []).append(span)
+
+    timelines = []
+    for key, suite in by_key.items():
+        if suite["name"] != SUITE_SPAN_NAME:
+            continue
+        cases = []
+        for worker in children.get(key, []):
+            if not worker["name"].startswith(WORKER_SPAN_PREFIX):
+                continue
+            worker_id = (
+                worker["attributes"].get("worker.id")
+                or worker["name"][len(WORKER_SPAN_PREFIX) :]
+            )
+            cases.extend(
+                CaseInterval(
+                    test_id=str(test["attributes"]["test.id"]),
+                    worker_id=worker_id,
+                    start_s=test["start_s"],
+                    end_s=test["end_s"],
+                )
+                for test in children.get((suite["trace_id"], worker["span_id"]), [])
+                if "test.id" in test["attributes"]
+            )
+        if not cases:
+            continue
+        requested = suite["attributes"].get("suite.parallel_workers")
+        timelines.append(
+            RunTimeline(
+                run_id=f"{suite['trace_id']}/{suite['span_id']}",
+                source="spans",
+                start_s=min(suite["start_s"], *(c.start_s for c in cases)),
+                end_s=max(suite["end_s"], *(c.end_s for c in cases)),
+                cases=cases,
+                requested_workers=int(requested) if requested else None,
+            )
+        )
+    return sorted(timelines, key=lambda t: t.end_s)
+
+
+def timeline_from_store(store: ResultsStore, run_id: str) -> RunTimeline | None:
+    """A stored run's timeline (harness wall-clock times per case)."""
+    records = [r for r in store.run_results(run_id) if r.started_at and r.finished_at]
+    if not records:
+        return None
+    return RunTimeline(
+        run_id=run_id,
+        source="store",
+        start_s=min(r.started_at for r in records),
+        end_s=max(r.finished_at for r in records),
+        cases=[
+            CaseInterval(r.test_id, r.worker_id, r.started_at, r.finished_at)
+            for r in records
+        ],
+    )
+
+
+# =============================================================================
+# ANALYSIS
+# =============================================================================
+
+
+def _worker_utilization(
+    worker_id: str, cases: list[CaseInterval], timeline: RunTimeline
+) -> WorkerUtilization:
+    """Busy time (union of intervals) and idle time for one worker."""
+    busy = gap = max_gap = 0.0
+    gap_count = 0
+    cursor = None
+    for case in sorted(cases, key=lambda c: c.start_s):
+        if cursor is None:
+            busy += case.duration_s
+            cursor = case.end_s
+            continue
+        if case.start_s - cursor >= MIN_GAP_S:
+            gap += case.start_s - cursor
+            max_gap = max(max_gap, case.start_s - cursor)
+            gap_count += 1
+        busy += max(0.0, case.end_s - max(case.start_s, cursor))
+        cursor = max(cursor, case.end_s)
+
+    first = min(c.start_s for c in cases)
+    return WorkerUtilization(
+        worker_id=worker_id,
+        cases=len(cases),
+        busy_s=busy,
+        lead_in_s=max(0.0, first - timeline.start_s),
+        gap_s=gap,
+        gap_count=gap_count,
+        max_gap_s=max_gap,
+        tail_s=max(0.0, timeline.end_s - cursor),
+        utilization=busy / timeline.wall_s if timeline.wall_s else 0.0,
+    )
+
+
+def recommend_workers(
+    durations: dict[str, float],
+    overhead_s: float = 0.0,
+    test_ids: list[str] | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> WorkerRecommendation | None:
+    """
+    Fewest workers that run the golden set within tolerance of the best.
+
+    Args:
+        durations: Measured case durations in seconds, by test ID
+        overhead_s: Harness overhead added to every case
+        test_ids: Cases to schedule (default: the runnable golden set)
+        max_workers: Largest worker count considered
+        tolerance: Accepted makespan above the best (0.1 = 10%)
+
+    Returns:
+        The recommendation, or None without any measured durations
+    """
+    if not durations:
+        return None
+    if test_ids is None:
+        test_ids = sorted(load_golden_cases())
+    fallback = statistics.median(durations.values())
+    schedule = [durations.get(t, fallback) + overhead_s for t in test_ids]
+
+    makespans = {
+        n: lpt_makespan(schedule, n)
+        for n in range(1, max(1, min(max_workers, len(schedule))) + 1)
+    }
+    best = min(makespans.values())
+    workers = min(n for n, m in makespans.items() if m <= best * (1 + tolerance))
+    return WorkerRecommendation(
+        workers=workers,
+        makespan_s=makespans[workers],
+        cases=len(schedule),
+        cases_measured=sum(1 for t in test_ids if t in durations),
+        overhead_s=overhead_s,
+        makespans=makespans,
+    )
+
+
+def analyze(
+    timeline: RunTimeline,
+    test_ids: list[str] | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> SpanAnalysis:
+    """
+    Analyze a run's timeline.
+
+    Args:
+        timeline: The run
+        test_ids: Cases for the recommendation (default: the golden set)
+        max_workers: Largest worker count considered for the recommendation
+        tolerance: Accepted makespan above the best (see recommend_workers)
+
+    Returns:
+        Utilization per worker, critical path and recommended workers
+    """
+    by_worker: dict[str, list[CaseInterval]] = {}
+    for case in timeline.cases:
+        by_worker.setdefault(case.worker_id, []).append(case)
+
+    workers = sorted(
+        (_worker_utilization(w, cases, timeline) for w, cases in by_worker.items()),
+        key=lambda w: w.worker_id,
+    )
+    busy = sum(w.busy_s for w in workers)
+
+    # The run ends when its last worker does: that worker's chain is critical
+    critical = min(workers, key=lambda w: w.tail_s)
+    critical_cases = sorted(by_worker[critical.worker_id], key=lambda c: c.start_s)
+    longest = max(timeline.cases, key=lambda c: c.duration_s)
+
+    durations: dict[str, float] = {}
+    for case in timeline.cases:
+        durations[case.test_id] = max(durations.get(case.test_id, 0.0), case.duration_s)
+    overhead = sum(w.gap_s for w in workers) / len(timeline.cases)
+
+    return SpanAnalysis(
+        run_id=timeline.run_id,
+        source=timeline.source,
+        wall_s=timeline.wall_s,
+        busy_s=busy,
+        requested_workers=timeline.requested_workers,
+        observed_workers=len(workers),
+        achieved_parallelism=busy / timeline.wall_s if timeline.wall_s else 0.0,
+        workers=workers,
+        critical_worker=critical.worker_id,
+        critical_path=[c.test_id for c in critical_cases],
+        critical_busy_s=critical.busy_s,
+        critical_gap_s=critical.lead_in_s + critical.gap_s,
+        longest_case=longest.test_id,
+        longest_case_s=longest.duration_s,
+        recommendation=recommend_workers(
+            durations, overhead, test_ids, max_workers, tolerance
+        ),
+    )
+
+
+def format_analysis(analysis: SpanAnalysis) -> str:
+    """Render an analysis as a short report."""
+    requested = analysis.requested_workers or "?"
+    lines = [
+        f"Run {analysis.run_id} ({analysis.source}): "
+        f"{format_duration(analysis.wall_s)} wall, "
+        f"{format_duration(analysis.busy_s)} busy",
+        f"  Parallelism: {analysis.achieved_parallelism:.2f} achieved of "
+        f"{requested} requested ({analysis.observed_workers} workers seen)",
+        "",
+        f"  {'worker':<8} {'cases':>5} {'busy':>7} {'util':>5} "
+        f"{'lead-in':>7} {'gaps':>7} {'max gap':>7} {'tail':>7}",
+    ]
+    for w in analysis.workers:
+        lines.append(
+            f"  {w.worker_id:<8} {w.cases:>5} {format_duration(w.busy_s):>7} "
+            f"{w.utilization:>5.0%} {format_duration(w.lead_in_s):>7} "
+            f"{format_duration(w.gap_s):>7} {format_duration(w.max_gap_s):>7} "
+            f"{format_duration(w.tail_s):>7}"
+        )
+    lines += [
+        "",
+        f"  Critical path: {analysis.critical_worker}, "
+        f"{len(analysis.critical_path)} cases, "
+        f"{format_duration(analysis.critical_busy_s)} busy + "
+        f"{format_duration(analysis.critical_gap_s)} waiting",
+        f"  Longest case: {analysis.longest_case} "
+        f"({format_duration(analysis.longest_case_s)})",
+    ]
+    rec = analysis.recommendation
+    if rec:
+        lines += [
+            "",
+            f"  Recommended workers: {rec.workers} "
+            f"(golden set of {rec.cases}, {rec.cases_measured} measured; "
+            f"makespan ~{format_duration(rec.makespan_s)}, "
+            f"best ~{format_duration(min(rec.makespans.values()))})",
+        ]
+    return "\n".join(lines)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Analyze worker utilization and the critical path of a routing run",
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
+        "--otlp-dir",
+        type=Path,
+        help="Directory of OTLP-JSON trace files (e.g. the --otlp-file spool)",
+    )
+    source.add_argument(
+        "--run-id",
+        help="Run in the results store (default: the latest)",
+    )
+    parser.add_argument(
+        "--trace",
+        help="Trace ID prefix; analyzes the latest suite in that trace "
+        "(default: the latest suite)",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help=f"Largest worker count to consider (default: {DEFAULT_MAX_WORKERS})",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Accepted makespan above the best when recommending "
+        f"(default: {DEFAULT_TOLERANCE})",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the analysis as JSON",
+    )
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="Enable verbose logging",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+    )
+
+    if args.otlp_dir:
+        files = trace_files(args.otlp_dir)
+        logger.debug(f"Reading {len(files)} trace files from {args.otlp_dir}")
+        timelines = timelines_from_spans(read_otlp_spans(files))
+        if args.trace:
+            timelines = [t for t in timelines if t.run_id.startswith(args.trace)]
+        timeline = timelines[-1] if timelines else None
+    else:
+        store = ResultsStore()
+        run_id = args.run_id or store.latest_run_id()
+        timeline = timeline_from_store(store, run_id) if run_id else None
+
+    if timeline is None:
+        logger.error("No routing run with case timings found")
+        sys.exit(1)
+
+    analysis = analyze(timeline, max_workers=args.max_workers, tolerance=args.tolerance)
+    if args.json:
+        print(json.dumps(analysis.to_dict(), indent=2))
+    else:
+        print(format_analysis(analysis))
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""Process-wide OpenTelemetry pipeline for the routing tests and remediation.
+
+Each process gets one TracerProvider and one MeterProvider, exporting over
+OTLP/HTTP (``$OTLP_HTTP_ENDPOINT``, else ``$OTEL_EXPORTER_OTLP_ENDPOINT``)
+or to the local spool (``$OTLP_FILE_DIR``, see otlp_spool.py).
+``otel_metrics.init_telemetry`` (routing test processes) and
+``remediate_tests.setup_otel`` both start it. Whoever calls ``start`` first
+sets the resource and views; later calls reuse the running pipeline.
+
+Trace context crosses process boundaries through ``$TRACEPARENT`` (the W3C
+trace context environment carrier). ``subprocess_env`` adds the current span
+to a child's environment, and ``context_from_env`` is the parent a process
+starts its first span under. A remediation run, its fix attempts and the
+pytest sessions they launch therefore form one trace.
+
+The SDK is imported only when ``start`` is called, so runs without telemetry
+don't load it.
+"""
+
+import os
+from contextlib import contextmanager
+
+from otlp_spool import OTLP_FILE_DIR_ENV_VAR
+
+TRACEPARENT_ENV_VAR = "TRACEPARENT"
+
+DEFAULT_OTLP_HTTP_ENDPOINT = "http://localhost:4318"
+DEFAULT_EXPORT_INTERVAL_MS = 5000
+
+TRACER_NAME = "jira_assistant.routing"
+
+# Running pipeline (set by start)
+_tracer_provider = None
+_meter_provider = None
+_destination: str | None = None
+
+
+def otlp_endpoint() -> str:
+    """OTLP/HTTP collector endpoint for this process and its children."""
+    return (
+        os.getenv("OTLP_HTTP_ENDPOINT")
+        or os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
+        or DEFAULT_OTLP_HTTP_ENDPOINT
+    )
+
+
+def is_started() -> bool:
+    """Whether this process's pipeline is running."""
+    return _tracer_provider is not None
+
+
+def start(
+    resource_attributes: dict,
+    views: list | None = None,
+    export_interval_ms: int = DEFAULT_EXPORT_INTERVAL_MS,
+) -> str:
+    """
+    Start this process's tracer and meter providers (once).
+
+    Args:
+        resource_attributes: Resource for every span and metric
+        views: Metric views (e.g. histogram buckets)
+        export_interval_ms: Periodic metric export interval
+
+    Returns:
+        Where telemetry is exported (endpoint URL or spool directory)
+
+    Raises:
+        ImportError: If the OpenTelemetry SDK or exporters are not installed
+    """
+    global _tracer_provider, _meter_provider, _destination
+
+    if _tracer_provider is not None:
+        return _destination
+
+    from opentelemetry import metrics, trace
+    from opentelemetry.sdk.metrics import MeterProvider
+    from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    # Exporters: OTLP/HTTP, or a local spool uploaded later by otlp_spool.py
+    spool_dir = os.getenv(OTLP_FILE_DIR_ENV_VAR)
+    if spool_dir:
+        from otlp_file_exporter import OTLPFileMetricExporter, OTLPFileSpanExporter
+
+        destination = spool_dir
+        metric_exporter = OTLPFileMetricExporter(spool_dir)
+        span_exporter = OTLPFileSpanExporter(spool_dir)
+    else:
+        from opentelemetry.exporter.otlp.proto.http.metric_exporter import (
+            OTLPMetricExporter,
+        )
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+
+        destination = otlp_endpoint()
+        metric_exporter = OTLPMetricExporter(endpoint=f"{destination}/v1/metrics")
+        span_exporter = OTLPSpanExporter(endpoint=f"{destination}/v1/traces")
+
+    resource = Resource.create(resource_attributes)
+
+    meter_provider = MeterProvider(
+        resource=resource,
+        metric_readers=[
+            PeriodicExportingMetricReader(
+                metric_exporter, export_interval_millis=export_interval_ms
+            )
+        ],
+        views=views or (),
+    )
+    metrics.set_meter_provider(meter_provider)
+
+    tracer_provider = TracerProvider(resource=resource)
+    tracer_provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    trace.set_tracer_provider(tracer_provider)
+
+    _tracer_provider, _meter_provider, _destination = (
+        tracer_provider,
+        meter_provider,
+        destination,
+    )
+    return destination
+
+
+def get_tracer(name: str = TRACER_NAME, version: str | None = None):
+    """Tracer from this process's provider."""
+    return _tracer_provider.get_tracer(name, version)
+
+
+def get_meter(name: str = TRACER_NAME, version: str | None = None):
+    """Meter from this process's provider."""
+    return _meter_provider.get_meter(name, version)
+
+
+def context_from_env():
+    """
+    Parent context propagated by the launching process.
+
+    Returns:
+        Context extracted from $TRACEPARENT, or None (a new trace)
+    """
+    traceparent = os.environ.get(TRACEPARENT_ENV_VAR)
+    if not traceparent or not is_started():
+        return None
+
+    from opentelemetry.trace.propagation.tracecontext import (
+        TraceContextTextMapPropagator,
+    )
+
+    return TraceContextTextMapPropagator().extract({"traceparent": traceparent})
+
+
+def subprocess_env(env: dict | None = None) -> dict:
+    """
+    Environment for a child process that continues the current trace.
+
+    Args:
+        env: Base environment (default: this process's)
+
+    Returns:
+        A copy of ``env`` with $TRACEPARENT set to the current span (left
+        unchanged when telemetry is off or no span is active)
+    """
+    env = dict(os.environ if env is None else env)
+    if not is_started():
+        return env
+
+    from opentelemetry.trace.propagation.tracecontext import (
+        TraceContextTextMapPropagator,
+    )
+
+    carrier = {}
+    TraceContextTextMapPropagator().inject(carrier)
+    if carrier.get("traceparent"):
+        env[TRACEPARENT_ENV_VAR] = carrier["traceparent"]
+    return env
+
+
+@contextmanager
+def span(name: str, attributes: dict | None = None):
+    """
+    Run a block in a span (a no-op when telemetry is off).
+
+    The first span of a process is a child of the $TRACEPARENT context.
+
+    Yields:
+        The span, or None when telemetry is off
+    """
+    if not is_started():
+        yield None
+        return
+
+    from opentelemetry import trace
+
+    has_parent = trace.get_current_span().get_span_context().is_valid
+    with get_tracer().start_as_current_span(
+        name,
+        context=None if has_parent else context_from_env(),
+        attributes=attributes,
+    ) as current:
+        yield current
+
+
+def shutdown():
+    """Flush and shut down this process's providers."""
+    global _tracer_provider, _meter_provider, _destination
+
+    if _tracer_provider is None:
+        return
+    _meter_provider.force_flush()
+    _meter_provider.shutdown()
+    _tracer_provider.force_flush()
+    _tracer_provider.shutdown()
+    _tracer_provider = _meter_provider = _destination = None
@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the routing harness's pure-Python hot paths.
+
+These functions run once per routing case (or once per suite over the whole
+pytest log), so their cost scales with response size and golden-set size.
+Inputs are synthetic but sized like a long run: ~100 KB responses, a
+10k-line pytest log, a 500-case golden set built from the real one and
+2000 paraphrased golden cases for near-duplicate detection. Collection
+import time of the routing and e2e suites is measured in a fresh
+interpreter (``python -X importtime``). Telemetry overhead is measured
+by recording a suite's worth of cases with ``--otel`` off, on, and on
+against a slow, failing collector (a local ``OTLPReceiver`` stand-in).
+
+Usage:
+    # Record a baseline, then compare later runs against it
+    ./run_benchmarks.sh --save
+    ./run_benchmarks.sh
+
+    # Or directly (deselected by default, see pytest.ini)
+    pytest test_harness_benchmarks.py -m benchmark --benchmark-only
+
+Requirements:
+    - pytest-benchmark: pip install pytest-benchmark
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+
+pytest.importorskip("pytest_benchmark")
+
+# Add tests directory to path for harness imports
+TESTS_DIR = Path(__file__).parent
+if str(TESTS_DIR) not in sys.path:
+    sys.path.insert(0, str(TESTS_DIR))
+
+import test_routing  # noqa: E402
+import test_runner  # noqa: E402 - module import keeps TestRunner out of collection
+from claude_analyzer import ClaudeAnalyzer  # noqa: E402
+from golden_dedupe import find_duplicate_clusters  # noqa: E402
+from otel_metrics import _extract_code_blocks  # noqa: E402
+from otlp_receiver import OTLPReceiver  # noqa: E402
+from otlp_spool import OTLP_FILE_DIR_ENV_VAR  # noqa: E402
+from skill_editor import SkillEditor  # noqa: E402
+
+pytestmark = pytest.mark.benchmark
+
+RESPONSE_TARGET_BYTES = 100_000
+PYTEST_LOG_LINES = 10_000
+GOLDEN_SET_SIZE = 500
+PARAPHRASED_SET_SIZE = 2000
+
+REPO_ROOT = TESTS_DIR.parents[2]
+
+# Modules pytest imports to collect each suite: (working directory, modules).
+# pytest itself is imported first, since collection has it loaded anyway.
+SUITE_COLLECTION_MODULES = {
+    "routing": (TESTS_DIR, ["conftest", "test_routing"]),
+    "e2e": (REPO_ROOT, ["tests.e2e.conftest", "tests.e2e.test_plugin_e2e"]),
+}
+
+# Cases recorded per telemetry overhead run, and the collector each mode
+# exports to: None (telemetry off) or OTLPReceiver arguments
+TELEMETRY_CASES = 200
+TELEMETRY_MODES = {
+    "off": None,
+    "on": {},
+    "degraded": {"latency_ms": 200, "fail_rate": 0.5, "seed": 0},
+}
+
+# Records cases the way the record_otel fixture does, in a fresh interpreter
+# (tracer and meter providers are process-wide), and prints phase timings
+# as the last line
+_TELEMETRY_DRIVER = """
+import json, sys, time
+import otel_metrics
+
+cases, enabled, response = int(sys.argv[1]), sys.argv[2] == "on", sys.argv[3]
+start = time.perf_counter()
+if enabled:
+    otel_metrics.init_telemetry()
+    otel_metrics.start_suite_span(model="benchmark")
+initialized = time.perf_counter()
+for i in range(cases):
+    passed = i % 10 != 0
+    otel_metrics.record_test_result(
+        test_id=f"TC{i:03d}",
+        category="direct",
+        input_text=f"create a bug in TES-{i}",
+        expected_skill="jira-issue",
+        actual_skill="jira-issue" if passed else "jira-search",
+        passed=passed,
+        duration_ms=12000,
+        cost_usd=0.01,
+        model="benchmark",
+        response_text=response,
+    )
+recorded = time.perf_counter()
+if enabled:
+    otel_metrics.end_suite_span(passed=cases, failed=0, skipped=0)
+    otel_metrics.shutdown()
+done = time.perf_counter()
+print(json.dumps({
+    "init_ms": (initialized - start) * 1000,
+    "record_ms": (recorded - initialized) * 1000,
+    "flush_ms": (done - recorded) * 1000,
+}))
+"""
+
+# Telemetry packages that only --otel runs should import
+TELEMETRY_MODULE_PREFIXES = (
+    "opentelemetry.sdk",
+    "opentelemetry.exporter.otlp.proto.http.",
+    "opentelemetry.semconv",
+    "google.protobuf",
+)
+
+_RESPONSE_PARAGRAPH = (
+    "I'll look into that for you. The sprint board shows several issues in "
+    "progress, and the backlog has a few items that could be moved into the "
+    "current iteration once the team agrees on priorities.\n\n"
+)
+_RESPONSE_CODE_BLOCK = (
+    "```bash\n"
+    'jira-as search query "project = TES AND status = Open" --max-results 50\n'
+    "jira-as issue get TES-{n} --fields summary,status\n"
+    "```\n\n"
+)
+
+
+def build_response(target_bytes: int = RESPONSE_TARGET_BYTES) -> str:
+    """Build a long Claude-style response of prose and CLI code blocks."""
+    parts = []
+    size = 0
+    n = 0
+    while size < target_bytes:
+        chunk = _RESPONSE_PARAGRAPH + _RESPONSE_CODE_BLOCK.format(n=n)
+        parts.append(chunk)
+        size += len(chunk)
+        n += 1
+    # Clarification question at the very end (worst case for phrase scans)
+    parts.append("Which project would you like me to use for the new sprint?")
+    return "".join(parts)
+
+
+def build_pytest_log(lines: int = PYTEST_LOG_LINES) -> tuple[str, str]:
+    """
+    Build a verbose xdist pytest log with per-case results and failures.
+
+    Returns:
+        (log text, ID of the last failed test)
+    """
+    out = [
+        "============================= test session starts =============================="
+    ]
+    out.append("4 workers [500 items]")
+    last_failed = ""
+    case = 0
+    while len(out) < lines - 2:
+        test_id = f"TC{case % 1000:03d}"
+        status = "FAILED" if case % 7 == 0 else "PASSED"
+        out.append(
+            f"[gw{case % 4}] [{case % 100:3d}%] {status} "
+            f"test_routing.py::test_direct_routing[{test_id}]"
+        )
+        # Captured output noise between results, as with -s / verbose runs
+        out.extend(f"INPUT: line {i} of captured output" for i in range(15))
+        if status == "FAILED":
+            last_failed = test_id
+        case += 1
+    for i in range(0, case, 7):
+        out.append(
+            f"FAILED test_routing.py::test_direct_routing[TC{i % 1000:03d}] - "
+            "AssertionError: Expected jira-issue, got jira-search"
+        )
+    out.append("=========== 430 passed, 70 failed, 0 skipped in 2345.67s ===========")
+    return "\n".join(out), last_failed
+
+
+def build_golden_yaml(size: int = GOLDEN_SET_SIZE) -> str:
+    """Scale the real golden set up to ``size`` cases with unique IDs."""
+    tests = test_routing.load_golden_tests()
+    scaled = []
+    for i in range(size):
+        case = dict(tests[i % len(tests)])
+        case["id"] = f"TC{i:04d}"
+        scaled.append(case)
+    return yaml.safe_dump({"tests": scaled}, sort_keys=False)
+
+
+def build_paraphrased_cases(size: int = PARAPHRASED_SET_SIZE) -> list[dict]:
+    """Paraphrase the real golden cases (case, keys, filler) up to ``size``."""
+    tests = [t for t in test_routing.load_golden_tests() if not t.get("skip")]
+    fillers = ["", " please", " for me", " thanks"]
+    cases = []
+    for i in range(size):
+        case = dict(tests[i % len(tests)])
+        variant = i // len(tests)
+        text = case["input"].replace("TES-", f"PROJ{variant}-")
+        if variant % 2:
+            text = text.upper()
+        case["id"] = f"TC{i:04d}"
+        case["input"] = text + fillers[variant % len(fillers)]
+        cases.append(case)
+    return cases
+
+
+def build_skill_md(sections: int = 300) -> str:
+    """Build a large SKILL.md with frontmatter and many sections."""
+    body = "".join(
+        f"## Section {i}\n\nUse `jira-as issue get` for details.\n\n"
+        f"- Trigger phrase {i}\n- Another trigger {i}\n\n"
+        for i in range(sections)
+    )
+    return (
+        "---\n"
+        "name: jira-issue\n"
+        'description: "Create, read, update and delete JIRA issues."\n'
+        "version: 1.0.0\n"
+        "---\n\n"
+        f"# JIRA Issue\n\n{body}"
+    )
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """Cumulative import time (microseconds) per module from -X importtime."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, module = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            times[module.strip()] = int(cumulative)
+    return times
+
+
+def import_suite_modules(suite: str) -> dict[str, int]:
+    """Import a suite's collection modules in a fresh interpreter."""
+    cwd, modules = SUITE_COLLECTION_MODULES[suite]
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import pytest, {', '.join(modules)}",
+        ],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def run_telemetry_cases(endpoint: str | None, cases: int = TELEMETRY_CASES) -> dict:
+    """
+    Record ``cases`` routing results in a fresh interpreter.
+
+    Args:
+        endpoint: Collector to export to, or None for telemetry off
+        cases: Number of cases to record
+
+    Returns:
+        Phase timings in milliseconds (init, record, flush)
+    """
+    env = {k: v for k, v in os.environ.items() if k != OTLP_FILE_DIR_ENV_VAR}
+    if endpoint:
+        env["OTLP_HTTP_ENDPOINT"] = endpoint
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            _TELEMETRY_DRIVER,
+            str(cases),
+            "on" if endpoint else "off",
+            build_response(10_000),
+        ],
+        cwd=TESTS_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.fixture
+def otlp_receiver(request):
+    """A local OTLP/HTTP receiver; parametrize indirectly with its arguments."""
+    with OTLPReceiver(**getattr(request, "param", {})) as receiver:
+        yield receiver
+
+
+@pytest.fixture(scope="module")
+def large_response():
+    return build_response()
+
+
+@pytest.fixture(scope="module")
+def pytest_log():
+    return build_pytest_log()
+
+
+# =============================================================================
+# RESPONSE ANALYSIS (per routing case)
+# =============================================================================
+
+
+def test_infer_skill_from_response(benchmark, large_response):
+    denials = [
+        {"tool_input": {"command": f"jira-as issue get TES-{i}"}} for i in range(50)
+    ]
+    skill = benchmark(test_routing.infer_skill_from_response, large_response, denials)
+    assert skill
+
+
+def test_validate_tool_use(benchmark, large_response):
+    expected = [{"pattern": f"jira-as issue get TES-{i}"} for i in range(10)]
+    expected += [
+        {"pattern_regex": rf"jira-as\s+search\s+query.*--max-results\s+{i}"}
+        for i in range(10)
+    ]
+    result = benchmark(test_routing.validate_tool_use, large_response, expected)
+    assert result.total_patterns == 20
+
+
+def test_detect_clarification(benchmark, large_response):
+    assert benchmark(test_routing.detect_clarification, large_response)
+
+
+def test_extract_code_blocks(benchmark, large_response):
+    blocks = benchmark(_extract_code_blocks, large_response)
+    assert blocks
+
+
+def test_extract_json(benchmark, large_response):
+    analyzer = ClaudeAnalyzer()
+    proposal = json.dumps({"analysis": "x", "skill": "jira-issue", "changes": []})
+    response = f"{large_response}\n\n```json\n{proposal}\n```\n"
+    data = benchmark(analyzer._extract_json, response)
+    assert data["skill"] == "jira-issue"
+
+
+# =============================================================================
+# SUITE OUTPUT PARSING (per suite run)
+# =============================================================================
+
+
+def test_parse_suite_output(benchmark, pytest_log):
+    log, _ = pytest_log
+    runner = test_runner.TestRunner(otel=False, progress_file=None)
+    result = benchmark(runner._parse_suite_output, log)
+    assert result.failed
+
+
+def test_extract_test_error(benchmark, pytest_log):
+    log, last_failed = pytest_log
+    runner = test_runner.TestRunner(otel=False, progress_file=None)
+    error = benchmark(runner._extract_test_error, log, last_failed)
+    assert "Expected" in error
+
+
+# =============================================================================
+# GOLDEN SET AND SKILL FILES
+# =============================================================================
+
+
+def test_load_golden_tests(benchmark, tmp_path, monkeypatch):
+    golden_file = tmp_path / "routing_golden.yaml"
+    golden_file.write_text(build_golden_yaml())
+    monkeypatch.setattr(test_routing, "GOLDEN_FILE", golden_file)
+
+    tests = benchmark(test_routing.load_golden_tests)
+    assert len(tests) == GOLDEN_SET_SIZE
+
+
+def test_find_duplicate_clusters(benchmark):
+    cases = build_paraphrased_cases()
+
+    clusters = benchmark(find_duplicate_clusters, cases)
+    redundant = sum(len(c.redundant) for c in clusters)
+    # Nearly every paraphrase folds into its original's cluster
+    assert redundant >= PARAPHRASED_SET_SIZE * 0.9
+
+
+def test_parse_skill(benchmark, tmp_path):
+    skill_dir = tmp_path / "jira-issue"
+    skill_dir.mkdir()
+    (skill_dir / "SKILL.md").write_text(build_skill_md())
+    editor = SkillEditor(skills_base_path=tmp_path)
+
+    skill = benchmark(editor.parse_skill, "jira-issue")
+    assert skill.frontmatter["name"] == "jira-issue"
+
+
+# =============================================================================
+# COLLECTION STARTUP
+# =============================================================================
+
+
+@pytest.mark.parametrize("suite", sorted(SUITE_COLLECTION_MODULES))
+def test_collection_import_time(benchmark, suite):
+    times = benchmark.pedantic(
+        import_suite_modules, args=(suite,), rounds=5, iterations=1
+    )
+    _, modules = SUITE_COLLECTION_MODULES[suite]
+    benchmark.extra_info["import_ms"] = {m: times[m] / 1000 for m in modules}
+
+    # The OTel SDK and exporters load only when --otel initializes them
+    telemetry = sorted(
+        {p for p in TELEMETRY_MODULE_PREFIXES for m in times if m.startswith(p)}
+    )
+    assert not telemetry, f"Imported without --otel: {', '.join(telemetry)}"
+
+
+# =============================================================================
+# TELEMETRY OVERHEAD
+# =============================================================================
+
+
+@pytest.mark.parametrize(
+    "mode, otlp_receiver",
+    [(mode, args or {}) for mode, args in TELEMETRY_MODES.items()],
+    ids=list(TELEMETRY_MODES),
+    indirect=["otlp_receiver"],
+)
+def test_telemetry_overhead(benchmark, mode, otlp_receiver):
+    enabled = TELEMETRY_MODES[mode] is not None
+    if enabled:
+        pytest.importorskip("opentelemetry.sdk")
+
+    timings = benchmark.pedantic(
+        run_telemetry_cases,
+        args=(otlp_receiver.endpoint if enabled else None,),
+        rounds=3,
+        iterations=1,
+    )
+    benchmark.extra_info.update(timings)
+    benchmark.extra_info["cases_per_s"] = TELEMETRY_CASES / (
+        (timings["record_ms"] + timings["flush_ms"]) / 1000
+    )
+    benchmark.extra_info["receiver"] = otlp_receiver.stats.to_dict()
+
+    traces = otlp_receiver.stats.traces
+    if not enabled:
+        assert traces.requests == 0
+    elif mode == "on":
+        # Every case span reached the collector
+        assert traces.items > TELEMETRY_CASES
+        assert otlp_receiver.stats.metrics.items
+    else:
+        assert traces.failed
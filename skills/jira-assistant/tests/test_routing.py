@@ -28,8 +28,8 @@ Requirements:
 import json
 import os
 import re
-import subprocess
 import sys
+import time
 from pathlib import Path
 from typing import NamedTuple
 
@@ -60,6 +60,8 @@ except ImportError:
     record_test_session_summary = None
     otel_shutdown = None
 
+from session_cache import run_session  # noqa: E402
+
 # Import model config from conftest (after sys.path modification)
 from conftest import get_test_model  # noqa: E402
 
@@ -85,6 +87,34 @@ class ToolUseResult(NamedTuple):
     matches: list[CommandMatch]
 
 
+class LatencyBreakdown(NamedTuple):
+    """Where a case's time went, from the CLI's JSON output and harness timers."""
+
+    # Reported by the Claude CLI
+    duration_ms: int = 0  # Whole CLI session
+    duration_api_ms: int = 0  # Time spent waiting on the API
+    num_turns: int = 0
+    input_tokens: int = 0  # Uncached input
+    output_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    # Measured by the harness
+    queue_ms: float = 0.0  # Concurrency slot, rate-limit backoff, coalescing lock
+    spawn_ms: float = 0.0  # Starting the CLI process
+    wait_ms: float = 0.0  # CLI process running until exit
+    parse_ms: float = 0.0  # Decoding the JSON output
+    inference_ms: float = 0.0  # Skill detection (debug log scan) and checks
+
+    @property
+    def cli_overhead_ms(self) -> int:
+        """CLI time not spent on the API (startup, local tools, turns)."""
+        return max(0, self.duration_ms - self.duration_api_ms)
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary, including derived parts."""
+        return {**self._asdict(), "cli_overhead_ms": self.cli_overhead_ms}
+
+
 class RoutingResult(NamedTuple):
     """Result of a routing test."""
 
@@ -98,6 +128,11 @@ class RoutingResult(NamedTuple):
     input_tokens: int = 0
     output_tokens: int = 0
     tool_use: ToolUseResult | None = None
+    # Served from an identical earlier request in this run (no new spend)
+    coalesced: bool = False
+    # Rate-limited attempts retried before this result
+    retry_count: int = 0
+    latency: LatencyBreakdown | None = None
 
 
 def load_golden_tests() -> list[dict]:
@@ -171,6 +206,60 @@ def validate_tool_use(
     )
 
 
+def detect_clarification(response_text: str) -> bool:
+    """
+    Check whether a response asks the user to disambiguate.
+
+    "Would you like me to run this" is NOT disambiguation - it's confirmation.
+    """
+    response_lower = response_text.lower()
+    return (
+        "?" in response_text
+        and any(
+            phrase in response_lower
+            for phrase in [
+                # Existing phrases
+                "which skill",
+                "which would you",
+                "did you mean",
+                "do you want sprint details or",
+                "do you want to delete them or close",
+                "update fields on one issue or multiple",
+                # NEW: Natural clarification patterns
+                "would you like to",
+                "do you want to",
+                "should i",
+                "which one",
+                "which issue",
+                "which project",
+                "could you clarify",
+                "could you specify",
+                "what would you like",
+                "are you looking for",
+                "do you mean",
+                "one issue or",
+                "single issue or",
+                "sprint details or",
+                "details or issues",
+                "fields or",
+                "status or",
+            ]
+        )
+        and not any(
+            phrase in response_lower
+            for phrase in [
+                "would you like me to run",
+                "shall i run",
+                "shall i execute",
+                "want me to run",
+                "want me to execute",
+                "i need permission",  # NEW: exclude permission requests
+                "grant permission",  # NEW
+            ]
+        )
+    )
+
+
 def run_claude_routing(
     input_text: str, expected_commands: list[dict] | None = None, timeout: int = 60
 ) -> RoutingResult:
@@ -225,75 +314,29 @@ def run_claude_routing(
     if model:
         cmd.extend(["--model", model])
 
-    # Run Claude non-interactively
-    result = subprocess.run(
-        cmd,
-        input=input_text,
-        capture_output=True,
-        text=True,
-        timeout=timeout,
-    )
+    # Run Claude non-interactively (identical requests in a run share a session)
+    result = run_session(cmd, input_text, timeout)
 
     # Parse JSON output
+    parse_start = time.perf_counter()
     try:
         output = json.loads(result.stdout)
     except json.JSONDecodeError:
         pytest.fail(f"Failed to parse Claude output: {result.stdout[:500]}")
+    parse_ms = (time.perf_counter() - parse_start) * 1000
+    inference_start = time.perf_counter()
 
     session_id = output.get("session_id", "")
-    duration_ms = output.get("duration_ms", 0)
-    cost_usd = output.get("total_cost_usd", 0.0)
+    # A coalesced result was already paid for and timed by the request that
+    # ran it, so its session's duration, cost and tokens count only there
+    shared = {} if result.coalesced else output
+    duration_ms = shared.get("duration_ms", 0)
+    cost_usd = shared.get("total_cost_usd", 0.0)
     response_text = output.get("result", "")
     permission_denials = output.get("permission_denials", [])
 
     # Check if DISAMBIGUATION was asked (not just any question)
-    # "Would you like me to run this" is NOT disambiguation - it's confirmation
-    response_lower = response_text.lower()
-    asked_clarification = (
-        "?" in response_text
-        and any(
-            phrase in response_lower
-            for phrase in [
-                # Existing phrases
-                "which skill",
-                "which would you",
-                "did you mean",
-                "do you want sprint details or",
-                "do you want to delete them or close",
-                "update fields on one issue or multiple",
-                # NEW: Natural clarification patterns
-                "would you like to",
-                "do you want to",
-                "should i",
-                "which one",
-                "which issue",
-                "which project",
-                "could you clarify",
-                "could you specify",
-                "what would you like",
-                "are you looking for",
-                "do you mean",
-                "one issue or",
-                "single issue or",
-                "sprint details or",
-                "details or issues",
-                "fields or",
-                "status or",
-            ]
-        )
-        and not any(
-            phrase in response_lower
-            for phrase in [
-                "would you like me to run",
-                "shall i run",
-                "shall i execute",
-                "want me to run",
-                "want me to execute",
-                "i need permission",  # NEW: exclude permission requests
-                "grant permission",  # NEW
-            ]
-        )
-    )
+    asked_clarification = detect_clarification(response_text)
 
     # Detect skill from multiple sources
     skill_loaded = None
@@ -314,15 +357,29 @@ def run_claude_routing(
     if not skill_loaded:
         skill_loaded = infer_skill_from_response(response_text, permission_denials)
 
-    # Extract token counts
-    input_tokens = output.get("num_turns", 0)  # Fallback if not available
-    output_tokens = 0
-    if "usage" in output:
-        input_tokens = output["usage"].get("input_tokens", 0)
-        output_tokens = output["usage"].get("output_tokens", 0)
-
     # Validate tool use accuracy if expected commands provided
     tool_use_result = validate_tool_use(response_text, expected_commands)
+    inference_ms = (time.perf_counter() - inference_start) * 1000
+
+    # Token counts (0 when the CLI reports no usage)
+    usage = shared.get("usage") or {}
+    input_tokens = usage.get("input_tokens", 0)
+    output_tokens = usage.get("output_tokens", 0)
+
+    latency = LatencyBreakdown(
+        duration_ms=duration_ms,
+        duration_api_ms=shared.get("duration_api_ms", 0),
+        num_turns=shared.get("num_turns", 0),
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cache_read_input_tokens=usage.get("cache_read_input_tokens", 0),
+        cache_creation_input_tokens=usage.get("cache_creation_input_tokens", 0),
+        queue_ms=result.queue_ms,
+        spawn_ms=result.spawn_ms,
+        wait_ms=result.wait_ms,
+        parse_ms=parse_ms,
+        inference_ms=inference_ms,
+    )
 
     # Verbose output for debugging (disable with ROUTING_TEST_QUIET=1)
     if not os.environ.get("ROUTING_TEST_QUIET"):
@@ -346,6 +403,9 @@ def run_claude_routing(
         input_tokens=input_tokens,
         output_tokens=output_tokens,
         tool_use=tool_use_result,
+        coalesced=result.coalesced,
+        retry_count=result.retries,
+        latency=latency,
     )
 
 
@@ -594,6 +654,9 @@ def test_direct_routing(test_case, record_otel):
         cost_usd=result.cost_usd,
         asked_clarification=result.asked_clarification,
         session_id=result.session_id,
+        retry_count=result.retry_count,
+        coalesced=result.coalesced,
+        latency=result.latency,
         tokens_input=result.input_tokens,
         tokens_output=result.output_tokens,
         response_text=result.response_text,
@@ -669,6 +732,9 @@ def test_disambiguation(test_case, record_otel):
         cost_usd=result.cost_usd,
         asked_clarification=result.asked_clarification,
         session_id=result.session_id,
+        retry_count=result.retry_count,
+        coalesced=result.coalesced,
+        latency=result.latency,
     )
 
     # Should ask for clarification
@@ -716,6 +782,9 @@ def test_negative_triggers(test_case, record_otel):
         cost_usd=result.cost_usd,
         asked_clarification=result.asked_clarification,
         session_id=result.session_id,
+        retry_count=result.retry_count,
+        coalesced=result.coalesced,
+        latency=result.latency,
     )
 
     if alternate_skills:
@@ -779,6 +848,9 @@ def test_edge_cases(test_case, record_otel):
         cost_usd=result.cost_usd,
         asked_clarification=result.asked_clarification,
         session_id=result.session_id,
+        retry_count=result.retry_count,
+        coalesced=result.coalesced,
+        latency=result.latency,
     )
 
     if expected_skill:
@@ -789,7 +861,9 @@ def test_edge_cases(test_case, record_otel):
             )
         elif expected_action == "show_quick_reference":
             # Capability queries are flexible - asking clarification is acceptable
-            assert result.skill_loaded == expected_skill or result.asked_clarification, (
+            assert (
+                result.skill_loaded == expected_skill or result.asked_clarification
+            ), (
                 f"Expected {expected_skill} or clarification, got {result.skill_loaded}\n"
                 f"Input: '{input_text}'"
             )
@@ -850,6 +924,9 @@ def test_workflows(test_case, record_otel):
         cost_usd=result.cost_usd,
         asked_clarification=result.asked_clarification,
         session_id=result.session_id,
+        retry_count=result.retry_count,
+        coalesced=result.coalesced,
+        latency=result.latency,
     )
 
     # Workflow tests accept any skill from the workflow list
@@ -2,11 +2,17 @@
 """Test runner wrapper for routing tests."""
 
 import logging
+import os
 import re
 import subprocess
+import threading
 from dataclasses import dataclass, field
 from pathlib import Path
 
+from progress_reporter import ProgressReporter
+from results_store import RESULTS_DB_ENV_VAR, ResultsStore
+from telemetry_runtime import subprocess_env
+
 logger = logging.getLogger(__name__)
 
 
@@ -53,16 +59,41 @@ class TestRunner:
 
     TESTS_DIR = Path(__file__).parent
     TEST_FILE = TESTS_DIR / "test_routing.py"
-
-    def __init__(self, tests_dir: Path | None = None, otel: bool = True):
+    DEFAULT_PROGRESS_FILE = TESTS_DIR / ".routing_progress.json"
+
+    # Per-case result lines in pytest verbose output
+    # Sequential: test_routing.py::test_direct_routing[TC001] PASSED
+    # Parallel (xdist): [gw0] [ 1%] PASSED test_routing.py::test_direct_routing[TC001]
+    RESULT_PATTERNS = [
+        re.compile(r"test_routing\.py::test_\w+\[(\w+)\]\s+(PASSED|FAILED|SKIPPED)"),
+        re.compile(
+            r"\[gw\d+\]\s+\[\s*\d+%\]\s+(PASSED|FAILED|SKIPPED)\s+test_routing\.py::test_\w+\[(\w+)\]"
+        ),
+    ]
+
+    # Collection summary: "collected 79 items / 74 deselected / 5 selected"
+    # or xdist's "4 workers [79 items]"
+    COLLECTED_PATTERN = re.compile(
+        r"collected (\d+) items?(?: / \d+ deselected)?(?: / (\d+) selected)?"
+        r"|workers? \[(\d+) items?\]"
+    )
+
+    def __init__(
+        self,
+        tests_dir: Path | None = None,
+        otel: bool = True,
+        progress_file: Path | None = DEFAULT_PROGRESS_FILE,
+    ):
         """Initialize test runner.
 
         Args:
             tests_dir: Directory containing test files. If None, uses default.
             otel: Whether to enable OpenTelemetry export (default: True)
+            progress_file: JSON file updated as suite cases complete (None to disable)
         """
         self.tests_dir = tests_dir or self.TESTS_DIR
         self.otel = otel
+        self.progress_file = progress_file
 
     def run_single_test(
         self,
@@ -105,6 +136,7 @@ class TestRunner:
                 text=True,
                 timeout=timeout,
                 cwd=self.tests_dir,
+                env=subprocess_env(),  # Continues the caller's trace
             )
         except subprocess.TimeoutExpired:
             logger.warning(f"Test {test_id} timed out after {timeout}s")
@@ -138,6 +170,7 @@ class TestRunner:
         model: str = "haiku",
         parallel: int = 1,
         timeout: int = 600,
+        env: dict[str, str] | None = None,
     ) -> TestSuiteResult:
         """Run multiple tests.
 
@@ -146,6 +179,7 @@ class TestRunner:
             model: Claude model to use
             parallel: Number of parallel workers (requires pytest-xdist)
             timeout: Timeout in seconds for the entire suite
+            env: Extra environment variables for the pytest run
 
         Returns:
             Suite result with passed/failed tests
@@ -175,19 +209,102 @@ class TestRunner:
         )
         logger.debug(f"Command: {' '.join(cmd)}")
 
+        progress = self._create_progress_reporter(test_ids, model, parallel, env)
+
+        # Stream output so completions are reported live instead of at exit
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            cwd=self.tests_dir,
+            env={**subprocess_env(), **(env or {}), "PYTHONUNBUFFERED": "1"},
+        )
+        progress.pid = proc.pid
+
+        output_lines: list[str] = []
+        reader = threading.Thread(
+            target=self._pump_output,
+            args=(proc.stdout, output_lines, progress),
+            daemon=True,
+        )
+        reader.start()
+
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                cwd=self.tests_dir,
-            )
+            proc.wait(timeout=timeout)
         except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            reader.join(timeout=5)
+            progress.finish()
             logger.error(f"Test suite timed out after {timeout}s")
             return TestSuiteResult(error=f"Test suite timed out after {timeout}s")
 
-        return self._parse_suite_output(result.stdout + result.stderr)
+        reader.join()
+        progress.finish()
+
+        return self._parse_suite_output("".join(output_lines))
+
+    def _create_progress_reporter(
+        self,
+        test_ids: list[str] | None,
+        model: str,
+        parallel: int,
+        env: dict[str, str] | None = None,
+    ) -> ProgressReporter:
+        """Build a progress reporter seeded with historical case durations."""
+        expected_ids = test_ids or self.get_all_test_ids()
+
+        # Read the same store the pytest run records to
+        db_path = {**os.environ, **(env or {})}.get(RESULTS_DB_ENV_VAR)
+        try:
+            if db_path == "":
+                raise ValueError(f"Results store disabled via {RESULTS_DB_ENV_VAR}")
+            history = ResultsStore(db_path=db_path).median_wall_ms(model=model)
+        except Exception as e:
+            logger.debug(f"No duration history available: {e}")
+            history = {}
+
+        return ProgressReporter(
+            test_ids=expected_ids,
+            parallel=parallel,
+            expected_durations_ms=history,
+            progress_file=self.progress_file,
+        )
+
+    def _match_result_line(self, line: str) -> tuple[str, str] | None:
+        """Match a per-case result line, returning (test_id, status)."""
+        for pattern in self.RESULT_PATTERNS:
+            match = pattern.search(line)
+            if match:
+                groups = match.groups()
+                # Handle different group orders
+                if groups[0] in ("PASSED", "FAILED", "SKIPPED"):
+                    return groups[1], groups[0]
+                return groups[0], groups[1]
+        return None
+
+    def _pump_output(
+        self,
+        stream,
+        output_lines: list[str],
+        progress: ProgressReporter,
+    ) -> None:
+        """Read pytest output line by line, feeding completions to progress."""
+        seen: set[str] = set()
+        for line in stream:
+            output_lines.append(line)
+
+            collected = self.COLLECTED_PATTERN.search(line)
+            if collected:
+                count = next(g for g in reversed(collected.groups()) if g)
+                progress.set_total(int(count))
+                continue
+
+            result = self._match_result_line(line)
+            if result and result[0] not in seen:
+                seen.add(result[0])
+                progress.case_finished(*result)
 
     def run_full_suite(
         self,
@@ -252,22 +369,8 @@ class TestRunner:
         """Parse pytest output to extract all test results."""
         suite_result = TestSuiteResult()
 
-        # Parse individual test results - multiple formats to handle
-        # Sequential: test_routing.py::test_routing[TC001-...] PASSED
-        # Parallel (xdist): [gw0] PASSED test_routing.py::test_routing[TC001-...]
-        # Parallel (xdist): test_routing.py::test_routing[TC001-...]
-        # followed by PASSED/FAILED on same or next line
-
-        test_patterns = [
-            # Standard pytest verbose format: test_routing.py::test_direct_routing[TC001] PASSED
-            re.compile(
-                r"test_routing\.py::test_\w+\[(\w+)\]\s+(PASSED|FAILED|SKIPPED)"
-            ),
-            # pytest-xdist format: [gwN] [NN%] STATUS test_routing.py::test_direct_routing[TC001]
-            re.compile(
-                r"\[gw\d+\]\s+\[\s*\d+%\]\s+(PASSED|FAILED|SKIPPED)\s+test_routing\.py::test_\w+\[(\w+)\]"
-            ),
-        ]
+        # Parse individual test results - see RESULT_PATTERNS for formats
+        test_patterns = self.RESULT_PATTERNS
 
         found_tests = set()
 
@@ -31,6 +31,8 @@ import pytest
 # Mark all tests in this module as 'live' - they require the Claude CLI
 pytestmark = pytest.mark.live
 
+from session_cache import run_session  # noqa: E402
+
 # Import shared fixtures from conftest (after sys.path modification)
 from conftest import get_test_model  # noqa: E402
 
@@ -72,13 +74,7 @@ def run_claude_with_prompt(prompt: str, timeout: int = 60) -> dict:
         cmd.extend(["--model", model])
 
     try:
-        result = subprocess.run(
-            cmd,
-            input=prompt,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-        )
+        result = run_session(cmd, prompt, timeout)
 
         # Parse JSON output
         try: